@@ -0,0 +1,237 @@
+"""
+Canonical address normalization for deduplicating Address rows.
+
+Addresses are reduced to a USPS Publication 28 style canonical form (upper
+case, no punctuation, standard suffix / directional / unit abbreviations,
+5-digit ZIP) and hashed. Two addresses with the same hash are treated as the
+same place and share one row in the addresses table.
+
+The stored address keeps the spelling it was first entered with; only the
+hash is derived from the canonical form.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, Tuple
+
+import usaddress
+
+# USPS street suffix abbreviations (Publication 28, Appendix C1) for the common suffixes
+STREET_SUFFIXES = {
+    "ALLEY": "ALY",
+    "AVENUE": "AVE",
+    "AV": "AVE",
+    "AVEN": "AVE",
+    "BOULEVARD": "BLVD",
+    "BOUL": "BLVD",
+    "CIRCLE": "CIR",
+    "CIRC": "CIR",
+    "COURT": "CT",
+    "COVE": "CV",
+    "CROSSING": "XING",
+    "DRIVE": "DR",
+    "DRV": "DR",
+    "EXPRESSWAY": "EXPY",
+    "FREEWAY": "FWY",
+    "HIGHWAY": "HWY",
+    "HWAY": "HWY",
+    "LANE": "LN",
+    "PARKWAY": "PKWY",
+    "PKY": "PKWY",
+    "PIKE": "PIKE",
+    "PLACE": "PL",
+    "PLAZA": "PLZ",
+    "ROAD": "RD",
+    "ROUTE": "RTE",
+    "SQUARE": "SQ",
+    "STREET": "ST",
+    "STR": "ST",
+    "TERRACE": "TER",
+    "TRAIL": "TRL",
+    "TURNPIKE": "TPKE",
+    "WAY": "WAY",
+}
+
+DIRECTIONALS = {
+    "NORTH": "N",
+    "SOUTH": "S",
+    "EAST": "E",
+    "WEST": "W",
+    "NORTHEAST": "NE",
+    "NORTHWEST": "NW",
+    "SOUTHEAST": "SE",
+    "SOUTHWEST": "SW",
+}
+
+# Secondary unit designators (Publication 28, Appendix C2)
+UNIT_DESIGNATORS = {
+    "APARTMENT": "APT",
+    "BUILDING": "BLDG",
+    "DEPARTMENT": "DEPT",
+    "FLOOR": "FL",
+    "OFFICE": "OFC",
+    "ROOM": "RM",
+    "SUITE": "STE",
+    "UNIT": "UNIT",
+}
+
+STATE_NAMES = {
+    "ALABAMA": "AL",
+    "ALASKA": "AK",
+    "ARIZONA": "AZ",
+    "ARKANSAS": "AR",
+    "CALIFORNIA": "CA",
+    "COLORADO": "CO",
+    "CONNECTICUT": "CT",
+    "DELAWARE": "DE",
+    "DISTRICT OF COLUMBIA": "DC",
+    "FLORIDA": "FL",
+    "GEORGIA": "GA",
+    "HAWAII": "HI",
+    "IDAHO": "ID",
+    "ILLINOIS": "IL",
+    "INDIANA": "IN",
+    "IOWA": "IA",
+    "KANSAS": "KS",
+    "KENTUCKY": "KY",
+    "LOUISIANA": "LA",
+    "MAINE": "ME",
+    "MARYLAND": "MD",
+    "MASSACHUSETTS": "MA",
+    "MICHIGAN": "MI",
+    "MINNESOTA": "MN",
+    "MISSISSIPPI": "MS",
+    "MISSOURI": "MO",
+    "MONTANA": "MT",
+    "NEBRASKA": "NE",
+    "NEVADA": "NV",
+    "NEW HAMPSHIRE": "NH",
+    "NEW JERSEY": "NJ",
+    "NEW MEXICO": "NM",
+    "NEW YORK": "NY",
+    "NORTH CAROLINA": "NC",
+    "NORTH DAKOTA": "ND",
+    "OHIO": "OH",
+    "OKLAHOMA": "OK",
+    "OREGON": "OR",
+    "PENNSYLVANIA": "PA",
+    "RHODE ISLAND": "RI",
+    "SOUTH CAROLINA": "SC",
+    "SOUTH DAKOTA": "SD",
+    "TENNESSEE": "TN",
+    "TEXAS": "TX",
+    "UTAH": "UT",
+    "VERMONT": "VT",
+    "VIRGINIA": "VA",
+    "WASHINGTON": "WA",
+    "WEST VIRGINIA": "WV",
+    "WISCONSIN": "WI",
+    "WYOMING": "WY",
+}
+
+US_COUNTRY_NAMES = {"US", "USA", "U S", "U S A", "UNITED STATES", "UNITED STATES OF AMERICA"}
+
+# Which abbreviation table applies to each usaddress label
+LABEL_ABBREVIATIONS = {
+    "StreetNamePostType": STREET_SUFFIXES,
+    "StreetNamePreType": STREET_SUFFIXES,
+    "StreetNamePreDirectional": DIRECTIONALS,
+    "StreetNamePostDirectional": DIRECTIONALS,
+    "OccupancyType": UNIT_DESIGNATORS,
+    "SubaddressType": UNIT_DESIGNATORS,
+}
+
+# Used when usaddress can't label the street line
+ALL_ABBREVIATIONS = {**STREET_SUFFIXES, **DIRECTIONALS, **UNIT_DESIGNATORS}
+
+PUNCTUATION_PATTERN = re.compile(r"[.,;:'\"()]")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# "#1700" and "# 1700" normalize to the same tokens
+HASH_UNIT_PATTERN = re.compile(r"#\s*")
+
+
+def clean_text(value: Optional[str]) -> str:
+    """Upper-case, drop punctuation and collapse whitespace."""
+    if not value:
+        return ""
+    value = PUNCTUATION_PATTERN.sub(" ", value.upper())
+    return WHITESPACE_PATTERN.sub(" ", value).strip()
+
+
+def canonical_street_tokens(labeled_tokens: Iterable[Tuple[str, str]]) -> str:
+    """
+    Canonical form of a street line from its usaddress (token, label) pairs.
+
+    Abbreviations are applied according to the label of each token, so only
+    suffixes, directionals and unit designators are shortened. Callers that
+    already ran usaddress.parse on the street line pass its output here
+    instead of parsing it again through canonical_street.
+    """
+    words = []
+    for token, label in labeled_tokens:
+        abbreviations = LABEL_ABBREVIATIONS.get(label, {})
+        words.extend(abbreviations.get(word, word) for word in clean_text(HASH_UNIT_PATTERN.sub("# ", token)).split())
+    return " ".join(words)
+
+
+@lru_cache(maxsize=65536)
+def canonical_street(street: str) -> str:
+    """Canonical form of a (cleaned) street line, including any unit."""
+    street = HASH_UNIT_PATTERN.sub("# ", street)
+    try:
+        return canonical_street_tokens(usaddress.parse(street))
+    except usaddress.RepeatedLabelError:
+        return " ".join(ALL_ABBREVIATIONS.get(token, token) for token in street.split())
+
+
+def canonical_state(state: Optional[str]) -> str:
+    state = clean_text(state)
+    return STATE_NAMES.get(state, state)
+
+
+def canonical_zip(zip_code: Optional[str]) -> str:
+    """First five digits of the ZIP (ZIP+4 extensions don't distinguish places)."""
+    digits = "".join(char for char in zip_code or "" if char.isdigit())
+    return digits[:5]
+
+
+def canonical_country(country: Optional[str]) -> str:
+    country = clean_text(country)
+    return "USA" if not country or country in US_COUNTRY_NAMES else country
+
+
+def canonical_address(
+    address: Mapping[str, Optional[str]], street_tokens: Optional[Iterable[Tuple[str, str]]] = None
+) -> str:
+    """
+    Canonical single-line form of an address.
+
+    Args:
+        address: Mapping with street_address_1, street_address_2, city, state,
+            zip_code and country (same keys as the Address model)
+        street_tokens: usaddress (token, label) pairs of street_address_1
+            followed by street_address_2, when the caller has parsed them
+    """
+    if street_tokens is not None:
+        street = canonical_street_tokens(street_tokens)
+    else:
+        street = canonical_street(
+            clean_text(f"{address.get('street_address_1') or ''} {address.get('street_address_2') or ''}")
+        )
+    return "|".join(
+        [
+            street,
+            clean_text(address.get("city")),
+            canonical_state(address.get("state")),
+            canonical_zip(address.get("zip_code")),
+            canonical_country(address.get("country")),
+        ]
+    )
+
+
+def normalized_address_hash(
+    address: Mapping[str, Optional[str]], street_tokens: Optional[Iterable[Tuple[str, str]]] = None
+) -> str:
+    """sha256 hex digest of the canonical address, stored in addresses.normalized_hash."""
+    return hashlib.sha256(canonical_address(address, street_tokens).encode("utf-8")).hexdigest()
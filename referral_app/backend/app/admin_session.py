@@ -0,0 +1,71 @@
+"""
+Signed admin claim for SQLAdmin sessions.
+
+The admin login stores a claim in the session cookie: the user id, when the
+claim expires, and when the user was last confirmed to be an active admin in
+the database. The claim is signed on its own (on top of the session cookie
+signature), so nothing else that writes to the session can grant admin access.
+
+Admin pages, and the assets each page loads, verify the signature and expiry
+without touching the database. Only once ADMIN_SESSION_REVALIDATE_SECONDS have
+passed since the last check is the user re-read; an admin who is demoted or
+deactivated loses access within that window. ADMIN_SESSION_LIFETIME_SECONDS
+after login the claim expires and the admin has to log in again.
+"""
+
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Optional
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+DEFAULT_LIFETIME_SECONDS = 8 * 60 * 60
+DEFAULT_REVALIDATE_SECONDS = 5 * 60
+
+ADMIN_SESSION_LIFETIME_SECONDS = int(os.getenv("ADMIN_SESSION_LIFETIME_SECONDS", DEFAULT_LIFETIME_SECONDS))
+ADMIN_SESSION_REVALIDATE_SECONDS = int(os.getenv("ADMIN_SESSION_REVALIDATE_SECONDS", DEFAULT_REVALIDATE_SECONDS))
+
+SESSION_KEY = "admin_claim"
+
+
+@dataclass(frozen=True)
+class AdminClaim:
+    user_id: uuid.UUID
+    expires_at: float
+    checked_at: float
+
+    def expired(self, now: float) -> bool:
+        return now >= self.expires_at
+
+    def needs_revalidation(self, now: float, revalidate_seconds: int = ADMIN_SESSION_REVALIDATE_SECONDS) -> bool:
+        return now - self.checked_at >= revalidate_seconds
+
+
+class AdminClaimSigner:
+    def __init__(self, secret_key: str, lifetime_seconds: int = ADMIN_SESSION_LIFETIME_SECONDS):
+        self.serializer = URLSafeSerializer(secret_key, salt="sqladmin-claim")
+        self.lifetime_seconds = lifetime_seconds
+
+    def issue(self, user_id: uuid.UUID) -> str:
+        """Claim for a user who just logged in (and was therefore just checked)."""
+        now = time.time()
+        return self.dumps(AdminClaim(user_id=user_id, expires_at=now + self.lifetime_seconds, checked_at=now))
+
+    def revalidated(self, claim: AdminClaim) -> str:
+        """The same claim, marked as checked now; the expiry is unchanged."""
+        return self.dumps(AdminClaim(user_id=claim.user_id, expires_at=claim.expires_at, checked_at=time.time()))
+
+    def dumps(self, claim: AdminClaim) -> str:
+        return self.serializer.dumps({"sub": str(claim.user_id), "exp": claim.expires_at, "chk": claim.checked_at})
+
+    def loads(self, token: Optional[str]) -> Optional[AdminClaim]:
+        """The claim if the token carries a valid signature, else None (expiry is checked by the caller)."""
+        if not token:
+            return None
+        try:
+            data = self.serializer.loads(token)
+            return AdminClaim(user_id=uuid.UUID(data["sub"]), expires_at=data["exp"], checked_at=data["chk"])
+        except (BadSignature, KeyError, TypeError, ValueError):
+            return None
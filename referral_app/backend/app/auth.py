@@ -4,21 +4,30 @@ Authentication configuration using FastAPI Users.
 
 import os
 import uuid
-from typing import Optional
+from typing import Any, Dict, Optional
 
-from fastapi import Depends, Request
-from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin
+import jwt
+
+from fastapi import Depends, Request, Response
+from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.responses import ORJSONResponse
+from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin, exceptions
 from fastapi_users.authentication import (
     AuthenticationBackend,
     BearerTransport,
     JWTStrategy,
 )
+from fastapi_users.jwt import decode_jwt, generate_jwt
 from fastapi_users_db_sqlalchemy import SQLAlchemyUserDatabase
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.user import User
 from app.database import get_db
+from app.refresh_tokens import RefreshTokenClaims, issue_refresh_token
+from app.schemas import TokenPairRead
 from app.gmail_service import send_password_reset_email, send_verification_email
+from app.passwords import password_helper
+from app.user_cache import user_cache
 
 
 # Secret key for JWT - In production, use environment variable
@@ -40,6 +49,10 @@ def get_jwt_secret():
 
 SECRET = get_jwt_secret()
 
+# Clients renew access tokens with their refresh token (POST /api/auth/jwt/refresh),
+# so this can be short; lower it once every client refreshes instead of re-logging in
+ACCESS_TOKEN_LIFETIME_SECONDS = int(os.getenv("ACCESS_TOKEN_LIFETIME_SECONDS", 3600))
+
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
     """User manager for handling user operations."""
@@ -61,6 +74,49 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
         print(f"Verification requested for user {user.id}. Verification token: {token}")
         await send_verification_email(user.email, token)
 
+    # Drop cached copies of users whose record changed (profile, is_active, password, ...)
+
+    async def on_after_update(self, user: User, update_dict: Dict[str, Any], request: Optional[Request] = None):
+        user_cache.invalidate(user.id)
+
+    async def on_after_reset_password(self, user: User, request: Optional[Request] = None):
+        user_cache.invalidate(user.id)
+
+    async def on_after_verify(self, user: User, request: Optional[Request] = None):
+        user_cache.invalidate(user.id)
+
+    async def on_after_delete(self, user: User, request: Optional[Request] = None):
+        user_cache.invalidate(user.id)
+
+    # Hash and verify on the password pool (app/passwords.py) instead of the event loop
+
+    async def authenticate(self, credentials: OAuth2PasswordRequestForm) -> Optional[User]:
+        """Authenticate by email and password, upgrading the stored hash if its parameters changed."""
+        try:
+            user = await self.get_by_email(credentials.username)
+        except exceptions.UserNotExists:
+            # Hash anyway so unknown emails take as long as wrong passwords
+            await password_helper.hash_async(credentials.password)
+            return None
+
+        verified, updated_password_hash = await password_helper.verify_and_update_async(
+            credentials.password, user.hashed_password
+        )
+        if not verified:
+            return None
+        if updated_password_hash is not None:
+            await self.user_db.update(user, {"hashed_password": updated_password_hash})
+        return user
+
+    async def _update(self, user: User, update_dict: Dict[str, Any]) -> User:
+        """Hash a new password (profile update or reset) on the pool, then apply the rest as usual."""
+        password = update_dict.get("password")
+        if password is not None:
+            await self.validate_password(password, user)
+            update_dict = {key: value for key, value in update_dict.items() if key != "password"}
+            update_dict["hashed_password"] = await password_helper.hash_async(password)
+        return await super()._update(user, update_dict)
+
 
 async def get_user_db(session: AsyncSession = Depends(get_db)):
     """Dependency to get user database."""
@@ -69,20 +125,79 @@ async def get_user_db(session: AsyncSession = Depends(get_db)):
 
 async def get_user_manager(user_db=Depends(get_user_db)):
     """Dependency to get user manager."""
-    yield UserManager(user_db)
+    yield UserManager(user_db, password_helper)
 
 
 # Bearer token transport
 bearer_transport = BearerTransport(tokenUrl="auth/jwt/login")
 
 
+class CachingJWTStrategy(JWTStrategy):
+    """
+    JWT strategy that resolves users through the short-TTL user cache.
+
+    Tokens carry the authorization claims (is_active, is_admin) alongside the
+    user id. A token issued to an inactive user is rejected from its claims
+    alone; otherwise the user comes from app/user_cache.py and is only loaded
+    from the database on a cache miss.
+    """
+
+    async def read_token(self, token: Optional[str], user_manager: BaseUserManager) -> Optional[User]:
+        if token is None:
+            return None
+
+        try:
+            data = decode_jwt(token, self.decode_key, self.token_audience, algorithms=[self.algorithm])
+            user_id = user_manager.parse_id(data["sub"])
+        except (jwt.PyJWTError, KeyError, exceptions.InvalidID):
+            return None
+        if data.get("is_active") is False:
+            return None
+
+        user = user_cache.get(user_id)
+        if user is None:
+            try:
+                user = await user_manager.get(user_id)
+            except exceptions.UserNotExists:
+                return None
+            user_cache.set(user)
+        return user
+
+    async def write_token(self, user: User) -> str:
+        data = {
+            "sub": str(user.id),
+            "aud": self.token_audience,
+            "is_active": user.is_active,
+            "is_admin": user.is_admin,
+        }
+        return generate_jwt(data, self.encode_key, self.lifetime_seconds, algorithm=self.algorithm)
+
+
 def get_jwt_strategy() -> JWTStrategy:
     """Get JWT authentication strategy."""
-    return JWTStrategy(secret=SECRET, lifetime_seconds=3600)
+    return CachingJWTStrategy(secret=SECRET, lifetime_seconds=ACCESS_TOKEN_LIFETIME_SECONDS)
+
+
+async def issue_token_pair(
+    strategy: JWTStrategy, user: User, rotating: Optional[RefreshTokenClaims] = None
+) -> TokenPairRead:
+    """Access token plus refresh token; pass the claims of the refresh token being rotated, if any."""
+    return TokenPairRead(
+        access_token=await strategy.write_token(user),
+        refresh_token=issue_refresh_token(user, SECRET, rotating=rotating),
+    )
+
+
+class RefreshTokenAuthenticationBackend(AuthenticationBackend):
+    """Bearer authentication whose login response also carries a refresh token (see app/refresh_tokens.py)."""
+
+    async def login(self, strategy: JWTStrategy, user: User) -> Response:
+        token_pair = await issue_token_pair(strategy, user)
+        return ORJSONResponse(token_pair.model_dump())
 
 
 # Authentication backend
-auth_backend = AuthenticationBackend(
+auth_backend = RefreshTokenAuthenticationBackend(
     name="jwt",
     transport=bearer_transport,
     get_strategy=get_jwt_strategy,
@@ -0,0 +1,165 @@
+"""
+Response compression negotiated from Accept-Encoding (brotli, then gzip).
+
+Browse and network listings are large and repetitive (every row carries a
+nested address), so they compress very well. Small responses are sent as-is:
+below minimum_size the compression overhead outweighs the saving.
+
+Complete responses are compressed in one go and get an exact Content-Length.
+Streamed responses (more_body) are compressed chunk by chunk and flushed after
+each chunk, so a client still receives every line of a stream as it is sent.
+"""
+
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    # Compiled extension; without it only gzip is offered
+    import brotli
+except ImportError:
+    brotli = None
+
+DEFAULT_MINIMUM_SIZE = 1024
+DEFAULT_GZIP_LEVEL = 6
+# Quality 4-5 gets most of brotli's gain over gzip at similar CPU cost; 11 is for static assets
+DEFAULT_BROTLI_QUALITY = 4
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Map of coding -> q value from an Accept-Encoding header."""
+    codings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[coding.strip().lower()] = q
+    return codings
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Preferred supported coding ("br" or "gzip"), or None for identity."""
+    codings = parse_accept_encoding(accept_encoding)
+    wildcard = codings.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best = max(candidates, key=lambda coding: codings.get(coding, wildcard))
+    return best if codings.get(best, wildcard) > 0 else None
+
+
+class Compressor:
+    """Incremental compressor with a flush after every chunk."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+            self._gzip = None
+        else:
+            self._brotli = None
+            # wbits=31: gzip container
+            self._gzip = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self._brotli is not None:
+            chunk = self._brotli.process(data)
+            return chunk + (self._brotli.finish() if final else self._brotli.flush())
+        chunk = self._gzip.compress(data)
+        return chunk + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = DEFAULT_MINIMUM_SIZE,
+        gzip_level: int = DEFAULT_GZIP_LEVEL,
+        brotli_quality: int = DEFAULT_BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        responder = CompressionResponder(send, encoding, self)
+        await self.app(scope, receive, responder.send)
+
+
+class CompressionResponder:
+    """Per-request send wrapper: decides on the first body message whether to compress."""
+
+    def __init__(self, send: Send, encoding: Optional[str], middleware: CompressionMiddleware):
+        self._send = send
+        self.encoding = encoding
+        self.middleware = middleware
+        self.start_message: Optional[Message] = None
+        self.compressor: Optional[Compressor] = None
+        self.started = False
+
+    def compressible(self, headers: MutableHeaders) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "")
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def send(self, message: Message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            # Hold the headers until the first body chunk shows how big the response is
+            self.start_message = message
+            return
+
+        if not self.started:
+            self.started = True
+            if message_type == "http.response.body":
+                await self.send_first_body(message)
+                return
+            # Some other extension message (e.g. pathsend): pass the response through untouched
+            await self._send(self.start_message)
+        elif self.compressor is not None and message_type == "http.response.body":
+            more_body = message.get("more_body", False)
+            message = {**message, "body": self.compressor.compress(message.get("body", b""), final=not more_body)}
+        await self._send(message)
+
+    async def send_first_body(self, message: Message):
+        headers = MutableHeaders(raw=self.start_message["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.compressible(headers):
+            headers.add_vary_header("Accept-Encoding")
+            if self.encoding is not None and (more_body or len(body) >= self.middleware.minimum_size):
+                self.compressor = Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_quality)
+                body = self.compressor.compress(body, final=not more_body)
+                headers["Content-Encoding"] = self.encoding
+                if more_body:
+                    # Length unknown until the stream ends; fall back to chunked transfer
+                    del headers["Content-Length"]
+                else:
+                    headers["Content-Length"] = str(len(body))
+                message = {**message, "body": body}
+            self.start_message = {**self.start_message, "headers": headers.raw}
+
+        await self._send(self.start_message)
+        await self._send(message)
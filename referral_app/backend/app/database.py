@@ -1,7 +1,10 @@
 import os
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Iterator, List
+
+# Bind parameters PostgreSQL accepts in one statement (asyncpg refuses more)
+MAX_BIND_PARAMETERS = 32767
 
 
 def get_database_engine():
@@ -55,3 +58,12 @@ Base = declarative_base()
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+
+
+def values_chunks(rows: List[dict]) -> Iterator[List[dict]]:
+    """Split rows for multi-row INSERT ... VALUES so each statement stays within MAX_BIND_PARAMETERS."""
+    if not rows:
+        return
+    size = max(1, MAX_BIND_PARAMETERS // len(rows[0]))
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
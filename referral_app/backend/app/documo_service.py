@@ -8,6 +8,8 @@ from pathlib import Path
 from typing import Optional
 import httpx
 
+from app.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,10 +63,11 @@ async def download_fax_pdf(message_id: str, api_key: str, base_url: str) -> byte
     url = f"{base_url}/fax/{message_id}/download?format=pdf"
     headers = {"Authorization": f"Bearer {api_key}"}
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers, timeout=30.0)
-        response.raise_for_status()
-        return response.content
+    with external_call("documo", "download_fax"):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(url, headers=headers, timeout=30.0)
+            response.raise_for_status()
+            return response.content
 
 
 async def store_fax_pdf(message_id: str, pdf_data: bytes, storage_dir: str = "faxes") -> str:
@@ -0,0 +1,84 @@
+"""
+Conditional GET support for the network and directory listings.
+
+Their responses depend only on the user's network (users.network_version,
+also bumped when a custom provider in it changes) and on the global provider
+directory (directory_version). Both counters are read with one
+primary-key query, and the ETag is built from them, so a matching
+If-None-Match is answered with 304 before any listing query runs or anything
+is serialized.
+
+The ETags are weak: they identify the data a response was rendered from, not
+its bytes. Bump REPRESENTATION_VERSION when the shape of these responses
+changes so clients don't keep serving an old body from cache.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth import current_active_user
+from app.database import get_db
+from app.models.directory_version import DirectoryVersion
+from app.models.user import User
+
+REPRESENTATION_VERSION = 1
+
+# Clients may store the response but must revalidate it every time
+CACHE_CONTROL = "private, no-cache"
+# The listings are JSON or, with Accept: application/x-ndjson, NDJSON under the same ETag
+VARY = "Accept"
+
+
+@dataclass(frozen=True)
+class UserVersions:
+    network_version: int
+    directory_version: int
+
+
+async def current_user_versions(
+    user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)
+) -> UserVersions:
+    """
+    Current network and directory versions for the user.
+
+    Always read from the database: the authenticated user may come from the
+    user cache, whose network_version can be behind.
+    """
+    directory_version = select(DirectoryVersion.version).where(DirectoryVersion.id == 1).scalar_subquery()
+    result = await db.execute(
+        select(User.network_version, func.coalesce(directory_version, 0)).filter(User.id == user.id)
+    )
+    network_version, directory_version = result.one()
+    return UserVersions(network_version=network_version, directory_version=directory_version)
+
+
+def network_etag(versions: UserVersions) -> str:
+    return f'W/"{REPRESENTATION_VERSION}-{versions.network_version}-{versions.directory_version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an ETag against an If-None-Match header (RFC 9110, 13.1.2)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque_tag for candidate in if_none_match.split(","))
+
+
+async def conditional_network_response(
+    request: Request, response: Response, versions: UserVersions = Depends(current_user_versions)
+):
+    """
+    Route dependency: 304 if the client's copy is current, otherwise set ETag,
+    Cache-Control and Vary on the response the endpoint goes on to build.
+    """
+    etag = network_etag(versions)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL, "Vary": VARY}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
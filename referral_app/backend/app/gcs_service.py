@@ -7,6 +7,8 @@ from typing import Optional
 from google.cloud import storage
 from google.cloud.exceptions import NotFound, GoogleCloudError
 
+from app.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,7 +59,8 @@ def upload_blob(
             blob.metadata = metadata
 
         # Upload the data
-        blob.upload_from_string(source_data, content_type=content_type)
+        with external_call("gcs", "upload"):
+            blob.upload_from_string(source_data, content_type=content_type)
 
         logger.info(f"Uploaded blob to gs://{bucket_name}/{destination_blob_name}")
 
@@ -93,7 +96,8 @@ def download_blob(bucket_name: str, source_blob_name: str) -> bytes:
         blob = bucket.blob(source_blob_name)
 
         # Download the blob
-        data = blob.download_as_bytes()
+        with external_call("gcs", "download"):
+            data = blob.download_as_bytes()
 
         logger.info(f"Downloaded blob from gs://{bucket_name}/{source_blob_name}")
         return data
@@ -125,7 +129,8 @@ def delete_blob(bucket_name: str, blob_name: str) -> None:
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(blob_name)
 
-        blob.delete()
+        with external_call("gcs", "delete"):
+            blob.delete()
 
         logger.info(f"Deleted blob gs://{bucket_name}/{blob_name}")
     except NotFound:
@@ -158,9 +163,9 @@ def list_blobs(bucket_name: str, prefix: Optional[str] = None) -> list[str]:
         client = get_storage_client()
         bucket = client.bucket(bucket_name)
 
-        # List blobs with optional prefix
-        blobs = bucket.list_blobs(prefix=prefix)
-        blob_names = [blob.name for blob in blobs]
+        # List blobs with optional prefix (pages are fetched while iterating)
+        with external_call("gcs", "list"):
+            blob_names = [blob.name for blob in bucket.list_blobs(prefix=prefix)]
 
         logger.info(f"Listed {len(blob_names)} blobs from gs://{bucket_name}/{prefix or ''}")
         return blob_names
@@ -189,7 +194,8 @@ def blob_exists(bucket_name: str, blob_name: str) -> bool:
         bucket = client.bucket(bucket_name)
         blob = bucket.blob(blob_name)
 
-        return blob.exists()
+        with external_call("gcs", "exists"):
+            return blob.exists()
     except GoogleCloudError as e:
         logger.error(f"Failed to check blob existence: {e}")
         return False
@@ -0,0 +1,70 @@
+"""
+Proximity search helpers over ZIP-centroid coordinates.
+
+Addresses carry the latitude/longitude of their ZIP centroid. A search first
+narrows candidates with a latitude/longitude bounding box (served by the
+ix_addresses_latitude_longitude btree, no PostGIS needed), then computes the
+great-circle (haversine) distance for the remaining rows to filter and sort.
+"""
+
+import math
+from typing import Optional, Tuple
+
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.address import Address
+from app.models.zip_centroid import ZipCentroid
+
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+DEFAULT_RADIUS_MILES = 25.0
+MAX_RADIUS_MILES = 250.0
+
+
+async def get_zip_coordinates(db: AsyncSession, zip_code: str) -> Optional[Tuple[float, float]]:
+    """Return (latitude, longitude) of a ZIP centroid, or None if the ZIP is unknown."""
+    result = await db.execute(
+        select(ZipCentroid.latitude, ZipCentroid.longitude).filter(ZipCentroid.zip_code == zip_code[:5])
+    )
+    row = result.one_or_none()
+    return (row.latitude, row.longitude) if row else None
+
+
+def bounding_box(latitude: float, longitude: float, radius_miles: float) -> Tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing a circle of radius_miles."""
+    lat_delta = radius_miles / MILES_PER_DEGREE_LATITUDE
+    # Longitude degrees shrink towards the poles; clamp so the box stays finite near them
+    lon_delta = radius_miles / (MILES_PER_DEGREE_LATITUDE * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - lat_delta, latitude + lat_delta, longitude - lon_delta, longitude + lon_delta
+
+
+def within_bounding_box(latitude: float, longitude: float, radius_miles: float):
+    """SQL filter on Address coordinates for the bounding box around a point."""
+    min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_miles)
+    return and_(
+        Address.latitude.between(min_lat, max_lat),
+        Address.longitude.between(min_lon, max_lon),
+    )
+
+
+def distance_miles(latitude: float, longitude: float):
+    """SQL expression: haversine distance in miles from a point to Address coordinates."""
+    lat1 = math.radians(latitude)
+    lat2 = func.radians(Address.latitude)
+    half_dlat = (lat2 - lat1) / 2
+    half_dlon = (func.radians(Address.longitude) - math.radians(longitude)) / 2
+    a = func.power(func.sin(half_dlat), 2) + math.cos(lat1) * func.cos(lat2) * func.power(func.sin(half_dlon), 2)
+    return 2 * EARTH_RADIUS_MILES * func.asin(func.least(1.0, func.sqrt(a)))
+
+
+def haversine_miles(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Python haversine distance in miles (matches distance_miles)."""
+    half_dlat = math.radians(lat2 - lat1) / 2
+    half_dlon = math.radians(lon2 - lon1) / 2
+    a = (
+        math.sin(half_dlat) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(half_dlon) ** 2
+    )
+    return 2 * EARTH_RADIUS_MILES * math.asin(min(1.0, math.sqrt(a)))
@@ -14,6 +14,8 @@ from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+from app.metrics import external_call
+
 logger = logging.getLogger(__name__)
 
 # Gmail API scopes
@@ -97,6 +99,11 @@ def send_email_via_gmail_api(to_email: str, subject: str, html_content: str) ->
     Raises:
         Exception: If email sending fails for any reason
     """
+    # EMAIL_DELIVERY=log skips Gmail entirely (local development without a service account, load tests)
+    if os.getenv("EMAIL_DELIVERY", "gmail") == "log":
+        logger.info(f"Email delivery disabled; not sending '{subject}' to {to_email}")
+        return
+
     service = get_gmail_service()
     if not service:
         raise RuntimeError("Gmail service not available")
@@ -122,7 +129,8 @@ def send_email_via_gmail_api(to_email: str, subject: str, html_content: str) ->
     send_message = {"raw": raw_message}
 
     try:
-        result = service.users().messages().send(userId="me", body=send_message).execute()
+        with external_call("gmail", "send"):
+            result = service.users().messages().send(userId="me", body=send_message).execute()
         logger.info(f"Email sent to {to_email}. Message ID: {result['id']}")
     except HttpError as e:
         logger.error(f"Gmail API HTTP error sending to {to_email}: {e}", exc_info=True)
@@ -0,0 +1,180 @@
+"""
+Logging setup.
+
+Handlers never run on the thread that logs: the root logger has a single
+QueueHandler, and a QueueListener thread hands records to the real handlers,
+stderr and (outside local development) Cloud Logging. The Cloud Logging
+handler's background transport sends entries in batches of LOG_BATCH_SIZE,
+waiting up to LOG_BATCH_LATENCY seconds for a batch to fill.
+
+Records are structured rather than multi-line: fields passed with
+extra={...} become the jsonPayload of the Cloud Logging entry (and the line
+itself with LOG_FORMAT=json), and records logged inside a traced request
+carry its trace and span ids (app/tracing.py), so Cloud Logging lists them
+under the trace.
+
+Verbose paths log to their own logger at DEBUG, controlled with:
+
+- LOG_LEVEL: root level (default INFO)
+- LOG_LEVELS: levels per logger, e.g. "app.webhooks.documo=DEBUG,sqlalchemy.engine=INFO"
+- LOG_SAMPLE_RATES: share of a logger's records below WARNING that are kept,
+  e.g. "app.webhooks.documo=0.1"
+"""
+
+import atexit
+import logging
+import os
+import queue
+import random
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+import orjson
+from opentelemetry import trace
+
+LOCAL_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_BATCH_LATENCY = 1.0
+
+# LogRecord attributes, and the ones CloudLoggingHandler reads itself; anything else came from extra={...}
+RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "taskName",
+    "json_fields",
+    "labels",
+    "resource",
+    "http_request",
+    "source_location",
+    "trace",
+    "span_id",
+    "trace_sampled",
+}
+
+
+def record_fields(record: logging.LogRecord) -> dict:
+    """The fields a record was logged with through extra={...}."""
+    return {
+        key: value for key, value in vars(record).items() if key not in RESERVED_ATTRIBUTES and not key.startswith("_")
+    }
+
+
+def parse_setting(value: Optional[str]) -> Dict[str, str]:
+    """ "a=1,b=2" -> {"a": "1", "b": "2"}"""
+    pairs = (item.split("=", 1) for item in (value or "").split(",") if "=" in item)
+    return {name.strip(): setting.strip() for name, setting in pairs}
+
+
+class TraceContextFilter(logging.Filter):
+    """
+    Add the current span's ids to the record.
+
+    Runs on the QueueHandler, on the thread that logs: the span is gone by
+    the time the listener thread handles the record.
+    """
+
+    def __init__(self, project: Optional[str] = None):
+        super().__init__()
+        self.project = project
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = trace.get_current_span().get_span_context()
+        if context.is_valid:
+            trace_id = format(context.trace_id, "032x")
+            # Cloud Logging links entries to Cloud Trace by the full resource name
+            record.trace = f"projects/{self.project}/traces/{trace_id}" if self.project else trace_id
+            record.span_id = format(context.span_id, "016x")
+            record.trace_sampled = context.trace_flags.sampled
+        return True
+
+
+class SampleFilter(logging.Filter):
+    """Keep a share of the records below WARNING; warnings and errors always pass."""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno >= logging.WARNING or random.random() < self.rate
+
+
+class StructuredFieldsFilter(logging.Filter):
+    """Pass extra={...} fields to CloudLoggingHandler, which only sends json_fields."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = record_fields(record)
+        if fields:
+            record.json_fields = {**fields, **getattr(record, "json_fields", {})}
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: severity, logger, message, trace ids and the extra={...} fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "severity": record.levelname,
+            "logger": record.name,
+            # QueueHandler has already merged the arguments and the traceback into the message
+            "message": record.getMessage(),
+        }
+        for key in ("trace", "span_id"):
+            if hasattr(record, key):
+                entry[key] = getattr(record, key)
+        entry.update(record_fields(record))
+        return orjson.dumps(entry, default=str).decode()
+
+
+def build_cloud_handler():
+    import google.cloud.logging
+    from google.cloud.logging_v2.handlers import CloudLoggingHandler
+    from google.cloud.logging_v2.handlers.transports import BackgroundThreadTransport
+
+    client = google.cloud.logging.Client()
+    transport = partial(
+        BackgroundThreadTransport,
+        batch_size=int(os.getenv("LOG_BATCH_SIZE", DEFAULT_BATCH_SIZE)),
+        max_latency=float(os.getenv("LOG_BATCH_LATENCY", DEFAULT_BATCH_LATENCY)),
+    )
+    handler = CloudLoggingHandler(client, name="referral-app", transport=transport)
+    handler.addFilter(StructuredFieldsFilter())
+    return handler, client.project
+
+
+def configure_logging() -> QueueListener:
+    """Route the root logger through a queue to stderr and, outside local development, Cloud Logging."""
+    local = os.getenv("ENVIRONMENT", "local") == "local"
+
+    stream_handler = logging.StreamHandler()
+    if os.getenv("LOG_FORMAT", "text") == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(LOCAL_FORMAT if local else logging.BASIC_FORMAT))
+    handlers = [stream_handler]
+
+    project = None
+    if not local:
+        cloud_handler, project = build_cloud_handler()
+        handlers.append(cloud_handler)
+
+    # Unbounded, so logging never waits for the listener
+    records = queue.SimpleQueue()
+    queue_handler = QueueHandler(records)
+    queue_handler.addFilter(TraceContextFilter(project))
+
+    root_logger = logging.getLogger()
+    root_logger.handlers = [queue_handler]
+    root_logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+    for name, level in parse_setting(os.getenv("LOG_LEVELS")).items():
+        logging.getLogger(name).setLevel(level.upper())
+    for name, rate in parse_setting(os.getenv("LOG_SAMPLE_RATES")).items():
+        logging.getLogger(name).addFilter(SampleFilter(float(rate)))
+
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    # Drain the queue at exit; registered after the Cloud Logging handler started its transport, so it runs first
+    atexit.register(listener.stop)
+    return listener
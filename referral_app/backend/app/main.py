@@ -1,26 +1,66 @@
 import os
+import base64
 import logging
-from fastapi import FastAPI, Depends, HTTPException, status, Request
+import uuid
+import time
+from fastapi import FastAPI, Depends, HTTPException, Query, status, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, RedirectResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, RedirectResponse, StreamingResponse
 from starlette.middleware.sessions import SessionMiddleware
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, delete
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, or_, delete, null, tuple_
+from sqlalchemy.orm import joinedload, selectinload, undefer
 from sqlalchemy.exc import SQLAlchemyError
 from typing import List, Optional
 import json
+import orjson
+from fastapi_users import exceptions
 from sqladmin import Admin, ModelView
 from sqladmin.authentication import AuthenticationBackend
-from app.database import engine, Base, get_db
+from app.database import engine, Base, get_db, AsyncSessionLocal
+from app.compression import DEFAULT_MINIMUM_SIZE, CompressionMiddleware
+from app.metrics import WEBHOOK_EVENTS, MetricsMiddleware, metrics_authorized, render_metrics
+from opentelemetry import trace
+from app.tracing import configure_tracing
+from app.logging_config import configure_logging
+from app.query_stats import (
+    DEFAULT_WARN_DB_MS,
+    DEFAULT_WARN_QUERIES,
+    QueryStatsMiddleware,
+    env_flag,
+    install_query_stats,
+)
+from app.etags import VARY, UserVersions, conditional_network_response, current_user_versions
+from app.network_cache import network_cache
+from app.user_cache import user_cache
+from app.network_queries import network_institutions_query, network_providers_query
+from app.geo import (
+    DEFAULT_RADIUS_MILES,
+    MAX_RADIUS_MILES,
+    distance_miles,
+    get_zip_coordinates,
+    within_bounding_box,
+)
 from app.models.provider import Provider
-from app.models.provider_institution import ProviderInstitution
-from app.models.address import Address
+from app.models.provider_institution import ProviderInstitution, hide_deleted_institutions
+from app.address_normalization import normalized_address_hash
+from app.models.address import Address, address_upsert_statement
 from app.models.user import User
 from app.models.patient import Patient
 from app.models.referral import Referral, ReferralStatus
 from app.models.user_provider_network import UserProviderNetwork
-from app.auth import auth_backend, fastapi_users, current_active_user
+from app.auth import (
+    SECRET,
+    auth_backend,
+    fastapi_users,
+    current_active_user,
+    get_jwt_strategy,
+    get_user_manager,
+    issue_token_pair,
+)
+from app.admin_session import SESSION_KEY as ADMIN_SESSION_KEY, AdminClaimSigner
+from app.passwords import password_helper
+from app.refresh_tokens import decode_refresh_token, password_fingerprint, revocation_list
 from app.schemas import (
     UserCreate,
     UserRead,
@@ -37,6 +77,8 @@ from app.schemas import (
     MyInstitutionCreate,
     MyInstitutionUpdate,
     MyInstitutionRead,
+    RefreshTokenRequest,
+    TokenPairRead,
 )
 from datetime import datetime
 from app.gmail_service import send_referral_notification_email
@@ -45,27 +87,15 @@ from app.documo_schemas import DocumoFaxWebhookPayload
 from app.gcs_service import upload_blob
 from googleapiclient.errors import HttpError
 
-# Configure logging for Google Cloud
-if os.getenv("ENVIRONMENT") != "local":
-    import google.cloud.logging
-    from google.cloud.logging_v2.handlers import CloudLoggingHandler
-
-    # Initialize Google Cloud Logging
-    client = google.cloud.logging.Client()
-    handler = CloudLoggingHandler(client, name="referral-app")
-
-    # Set up root logger
-    logging.basicConfig(level=logging.INFO)
-    root_logger = logging.getLogger()
-    root_logger.addHandler(handler)
-else:
-    # Local development logging
-    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+# Logging through a queue to stderr and, outside local development, Cloud Logging
+configure_logging()
 
 logger = logging.getLogger(__name__)
+# Full Documo webhook requests, off unless enabled (LOG_LEVELS / LOG_SAMPLE_RATES)
+webhook_dump_logger = logging.getLogger("app.webhooks.documo")
 
 # Create FastAPI app
-app = FastAPI(title="Referral App API", version="1.0.0")
+app = FastAPI(title="Referral App API", version="1.0.0", default_response_class=ORJSONResponse)
 
 
 # Configure CORS
@@ -85,11 +115,32 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
 
 # Add session middleware for SQLAdmin authentication
 app.add_middleware(SessionMiddleware, secret_key=os.getenv("SECRET_KEY", "your-secret-key-here"))
 
+# Compress JSON responses (brotli or gzip, per Accept-Encoding) above a size threshold
+app.add_middleware(
+    CompressionMiddleware, minimum_size=int(os.getenv("COMPRESSION_MINIMUM_SIZE", DEFAULT_MINIMUM_SIZE))
+)
+
+# Per-request query count and database time: logged, and as response headers in development
+install_query_stats(engine)
+app.add_middleware(
+    QueryStatsMiddleware,
+    expose_headers=env_flag("QUERY_STATS_HEADERS", os.getenv("ENVIRONMENT", "local") == "local"),
+    warn_queries=int(os.getenv("QUERY_STATS_WARN_QUERIES", DEFAULT_WARN_QUERIES)),
+    warn_db_ms=float(os.getenv("QUERY_STATS_WARN_DB_MS", DEFAULT_WARN_DB_MS)),
+)
+
+# Prometheus request metrics (outermost, so the latency covers the other middleware)
+app.add_middleware(MetricsMiddleware, engine=engine)
+
+# OpenTelemetry spans for routes, queries and outbound calls, when OTEL_TRACES_EXPORTER is set
+configure_tracing(app, engine)
+
 
 # Global exception handler for Error Reporting
 @app.exception_handler(Exception)
@@ -118,6 +169,49 @@ app.include_router(
     prefix="/api/auth/jwt",
     tags=["auth"],
 )
+
+
+@app.post("/api/auth/jwt/refresh", response_model=TokenPairRead, tags=["auth"])
+async def refresh_access_token(
+    body: RefreshTokenRequest,
+    db: AsyncSession = Depends(get_db),
+    user_manager=Depends(get_user_manager),
+):
+    """
+    Exchange a refresh token for a new access token and refresh token.
+
+    The presented refresh token is revoked; presenting it again revokes every
+    token from the same login. No password hash is involved.
+    """
+    invalid = HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+    claims = decode_refresh_token(body.refresh_token, SECRET)
+    if claims is None:
+        raise invalid
+
+    # Load the user fresh (not from user_cache) so a password change or deactivation applies at once
+    try:
+        user = await user_manager.get(claims.user_id)
+    except exceptions.UserNotExists:
+        raise invalid
+    if not user.is_active or password_fingerprint(user) != claims.password_fingerprint:
+        raise invalid
+
+    if not await revocation_list.rotate(db, claims):
+        logger.warning(f"Reused refresh token for user {user.id}; revoked its token family")
+        raise invalid
+
+    return await issue_token_pair(get_jwt_strategy(), user, rotating=claims)
+
+
+@app.post("/api/auth/jwt/refresh/revoke", status_code=status.HTTP_204_NO_CONTENT, tags=["auth"])
+async def revoke_refresh_token(body: RefreshTokenRequest, db: AsyncSession = Depends(get_db)):
+    """Revoke a refresh token and every token from the same login (client-side logout)."""
+    claims = decode_refresh_token(body.refresh_token, SECRET)
+    if claims is not None:
+        await revocation_list.revoke_family(db, claims)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
 app.include_router(
     fastapi_users.get_register_router(UserRead, UserCreate),
     prefix="/api/auth",
@@ -150,6 +244,15 @@ def read_root():
     return {"status": "ok", "message": "Hello World from FastAPI!"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    """Prometheus exposition, aggregated over the gunicorn workers."""
+    if not metrics_authorized(request.headers.get("Authorization")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/api/health")
 async def health_check(db: AsyncSession = Depends(get_db)):
     try:
@@ -192,31 +295,19 @@ async def log_frontend_error(request: Request, user: User = Depends(current_acti
 
 
 # Provider endpoints (FILTERED BY USER NETWORK)
-@app.get("/api/providers")
+@app.get("/api/providers", dependencies=[Depends(conditional_network_response)])
 async def get_providers(user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)):
     """
     Get providers in user's network.
     MODIFIED: Now requires authentication and filters by user's network.
     """
-    # Get user's network provider IDs
-    network_result = await db.execute(
-        select(UserProviderNetwork.provider_id).filter(
-            UserProviderNetwork.user_id == user.id, UserProviderNetwork.provider_id.isnot(None)
-        )
-    )
-    network_provider_ids = [row[0] for row in network_result.all()]
-
-    if not network_provider_ids:
-        # Empty network returns empty list
-        return []
-
-    # Fetch providers in network with full details
+    # Fetch providers in network with full details (joined through the user's network entries)
     result = await db.execute(
-        select(Provider)
-        .options(
-            selectinload(Provider.address), selectinload(Provider.institution).selectinload(ProviderInstitution.address)
+        network_providers_query(user.id).options(
+            selectinload(Provider.address),
+            selectinload(Provider.institution).selectinload(ProviderInstitution.address),
+            hide_deleted_institutions(),
         )
-        .filter(Provider.id.in_(network_provider_ids))
     )
     providers = result.scalars().all()
 
@@ -268,7 +359,9 @@ async def get_provider(provider_id: str, db: AsyncSession = Depends(get_db)):
     result = await db.execute(
         select(Provider)
         .options(
-            selectinload(Provider.address), selectinload(Provider.institution).selectinload(ProviderInstitution.address)
+            selectinload(Provider.address),
+            selectinload(Provider.institution).selectinload(ProviderInstitution.address),
+            hide_deleted_institutions(),
         )
         .filter(Provider.id == provider_id)
     )
@@ -315,6 +408,30 @@ async def get_provider(provider_id: str, db: AsyncSession = Depends(get_db)):
     }
 
 
+async def get_or_create_address(db: AsyncSession, address_data: dict) -> uuid.UUID:
+    """
+    Return the ID of the address row matching address_data, inserting it if needed.
+    Identical addresses (after normalization) share one row, so callers point at
+    this ID rather than editing an existing address in place.
+    """
+    row = {**address_data, "id": uuid.uuid4(), "normalized_hash": normalized_address_hash(address_data)}
+    result = await db.execute(address_upsert_statement([row]))
+    return result.one().id
+
+
+async def get_listed_institution(db: AsyncSession, institution_id: uuid.UUID) -> ProviderInstitution:
+    """Return the institution, or raise 404 if it doesn't exist or the directory sync soft-deleted it."""
+    result = await db.execute(
+        select(ProviderInstitution).filter(
+            ProviderInstitution.id == institution_id, ProviderInstitution.deleted_at.is_(None)
+        )
+    )
+    institution = result.scalar_one_or_none()
+    if not institution:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Institution not found")
+    return institution
+
+
 @app.post("/api/providers", response_model=ProviderRead, status_code=status.HTTP_201_CREATED)
 async def create_custom_provider(
     provider_data: ProviderCreate, user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)
@@ -323,12 +440,13 @@ async def create_custom_provider(
     Create a new custom provider.
     Automatically adds to user's network.
     """
-    # Create address if provided
-    address = None
+    if provider_data.institution_id is not None:
+        await get_listed_institution(db, provider_data.institution_id)
+
+    # Reuse or create address if provided
+    address_id = None
     if provider_data.address:
-        address = Address(**provider_data.address.dict())
-        db.add(address)
-        await db.flush()
+        address_id = await get_or_create_address(db, provider_data.address.dict())
 
     # Create custom provider
     provider = Provider(
@@ -337,7 +455,7 @@ async def create_custom_provider(
         email=provider_data.email,
         phone=provider_data.phone,
         institution_id=provider_data.institution_id,
-        address_id=address.id if address else None,
+        address_id=address_id,
         global_provider=False,
         created_by_user_id=user.id,
     )
@@ -349,12 +467,13 @@ async def create_custom_provider(
     db.add(network_entry)
 
     await db.commit()
+    network_cache.invalidate(user.id)
     await db.refresh(provider)
 
     # Load relationships for response
     result = await db.execute(
         select(Provider)
-        .options(selectinload(Provider.address), selectinload(Provider.institution))
+        .options(selectinload(Provider.address), selectinload(Provider.institution), hide_deleted_institutions())
         .filter(Provider.id == provider.id)
     )
     provider = result.scalar_one()
@@ -384,29 +503,17 @@ async def update_provider(
     if not provider:
         raise HTTPException(status_code=404, detail="Provider not found")
 
+    if provider_data.institution_id is not None:
+        await get_listed_institution(db, provider_data.institution_id)
+
     # Authorization and copy-on-write logic
     if provider.global_provider:
         # GLOBAL PROVIDER: Create custom copy
 
-        # Copy address if exists or create new one from update data
-        new_address = None
+        # Use the updated address if given, otherwise share the global provider's address row
+        new_address_id = provider.address_id
         if provider_data.address:
-            # Use updated address data
-            new_address = Address(**provider_data.address.dict())
-            db.add(new_address)
-            await db.flush()
-        elif provider.address:
-            # Copy existing address
-            new_address = Address(
-                street_address_1=provider.address.street_address_1,
-                street_address_2=provider.address.street_address_2,
-                city=provider.address.city,
-                state=provider.address.state,
-                zip_code=provider.address.zip_code,
-                country=provider.address.country,
-            )
-            db.add(new_address)
-            await db.flush()
+            new_address_id = await get_or_create_address(db, provider_data.address.dict())
 
         # Create custom provider copy with updates
         new_provider = Provider(
@@ -417,7 +524,7 @@ async def update_provider(
             institution_id=provider_data.institution_id
             if provider_data.institution_id is not None
             else provider.institution_id,
-            address_id=new_address.id if new_address else None,
+            address_id=new_address_id,
             global_provider=False,
             created_by_user_id=user.id,
             copied_from_provider_id=provider.id,
@@ -436,11 +543,12 @@ async def update_provider(
         db.add(network_entry)
 
         await db.commit()
+        network_cache.invalidate(user.id)
 
         # Load relationships for response
         result = await db.execute(
             select(Provider)
-            .options(selectinload(Provider.address), selectinload(Provider.institution))
+            .options(selectinload(Provider.address), selectinload(Provider.institution), hide_deleted_institutions())
             .filter(Provider.id == new_provider.id)
         )
         new_provider = result.scalar_one()
@@ -452,22 +560,9 @@ async def update_provider(
         if provider.created_by_user_id != user.id:
             raise HTTPException(status_code=403, detail="You can only edit providers you created")
 
-        # Update address if provided
+        # Point at the (possibly shared) row for the new address if provided
         if provider_data.address:
-            if provider.address:
-                # Update existing address
-                provider.address.street_address_1 = provider_data.address.street_address_1
-                provider.address.street_address_2 = provider_data.address.street_address_2
-                provider.address.city = provider_data.address.city
-                provider.address.state = provider_data.address.state
-                provider.address.zip_code = provider_data.address.zip_code
-                provider.address.country = provider_data.address.country
-            else:
-                # Create new address
-                new_address = Address(**provider_data.address.dict())
-                db.add(new_address)
-                await db.flush()
-                provider.address_id = new_address.id
+            provider.address_id = await get_or_create_address(db, provider_data.address.dict())
 
         # Update provider fields
         if provider_data.first_name is not None:
@@ -483,11 +578,12 @@ async def update_provider(
 
         await db.commit()
 
-        # Load relationships for response
+        # Load relationships for response (address_id may have changed under the loaded address)
         result = await db.execute(
             select(Provider)
-            .options(selectinload(Provider.address), selectinload(Provider.institution))
+            .options(selectinload(Provider.address), selectinload(Provider.institution), hide_deleted_institutions())
             .filter(Provider.id == provider.id)
+            .execution_options(populate_existing=True)
         )
         provider = result.scalar_one()
 
@@ -514,26 +610,14 @@ async def get_patients(db: AsyncSession = Depends(get_db)):
 
 
 # Provider institution endpoints (FILTERED BY USER NETWORK)
-@app.get("/api/provider-institutions")
+@app.get("/api/provider-institutions", dependencies=[Depends(conditional_network_response)])
 async def get_provider_institutions(user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)):
     """
     Get provider institutions in user's network.
     MODIFIED: Now requires authentication and filters by user's network.
     """
-    # Get user's network institution IDs
-    network_result = await db.execute(
-        select(UserProviderNetwork.provider_institution_id).filter(
-            UserProviderNetwork.user_id == user.id, UserProviderNetwork.provider_institution_id.isnot(None)
-        )
-    )
-    network_institution_ids = [row[0] for row in network_result.all()]
-
-    if not network_institution_ids:
-        # Empty network returns empty list
-        return []
-
-    # Fetch institutions in network
-    result = await db.execute(select(ProviderInstitution).filter(ProviderInstitution.id.in_(network_institution_ids)))
+    # Fetch institutions in network (joined through the user's network entries)
+    result = await db.execute(network_institutions_query(user.id))
     institutions = result.scalars().all()
 
     return [{"id": str(inst.id), "name": inst.name} for inst in institutions]
@@ -607,13 +691,10 @@ async def create_my_institution(
             status_code=status.HTTP_409_CONFLICT, detail="You already have an institution. Use PUT to update it."
         )
 
-    # Create address if provided
+    # Reuse or create address if provided
     address_id = None
     if institution_data.address:
-        address = Address(**institution_data.address.dict())
-        db.add(address)
-        await db.flush()
-        address_id = address.id
+        address_id = await get_or_create_address(db, institution_data.address.dict())
 
     # Create institution
     institution = ProviderInstitution(
@@ -692,22 +773,9 @@ async def update_my_institution(
     if institution_data.website is not None:
         institution.website = institution_data.website
 
-    # Handle address update/create
+    # Point at the (possibly shared) row for the new address if provided
     if institution_data.address:
-        if institution.address:
-            # Update existing address
-            institution.address.street_address_1 = institution_data.address.street_address_1
-            institution.address.street_address_2 = institution_data.address.street_address_2
-            institution.address.city = institution_data.address.city
-            institution.address.state = institution_data.address.state
-            institution.address.zip_code = institution_data.address.zip_code
-            institution.address.country = institution_data.address.country
-        else:
-            # Create new address
-            address = Address(**institution_data.address.dict())
-            db.add(address)
-            await db.flush()
-            institution.address_id = address.id
+        institution.address_id = await get_or_create_address(db, institution_data.address.dict())
 
     await db.commit()
     await db.refresh(institution)
@@ -775,6 +843,11 @@ async def create_referral(
             detail="Please complete your institution profile at /my-institution before creating referrals",
         )
 
+    # Verify the target institution is still in the directory
+    target_institution = None
+    if referral_data.referral_target_type == "provider_institution":
+        target_institution = await get_listed_institution(db, referral_data.provider_institution_id)
+
     # Get or create patient
     if referral_data.patient_id:
         result = await db.execute(select(Patient).filter(Patient.id == referral_data.patient_id))
@@ -815,11 +888,7 @@ async def create_referral(
         provider = provider_result.scalar_one_or_none()
         referral_target_name = provider.full_name if provider else "Unknown Provider"
     else:
-        institution_result = await db.execute(
-            select(ProviderInstitution).filter(ProviderInstitution.id == referral_data.provider_institution_id)
-        )
-        institution = institution_result.scalar_one_or_none()
-        referral_target_name = institution.name if institution else "Unknown Institution"
+        referral_target_name = target_institution.name
 
     patient_name = f"{patient.first_name} {patient.last_name}"
 
@@ -836,6 +905,150 @@ async def create_referral(
     return referral
 
 
+REFERRAL_PAGE_SIZE_DEFAULT = 50
+REFERRAL_PAGE_SIZE_MAX = 100
+
+
+def encode_referral_cursor(referral: Referral) -> str:
+    """Encode the keyset position (referral_date, id) of the last referral on a page."""
+    raw = f"{referral.referral_date.isoformat()}|{referral.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_referral_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by encode_referral_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        referral_date, referral_id = raw.split("|", 1)
+        return datetime.fromisoformat(referral_date), uuid.UUID(referral_id)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def serialize_referral(referral: Referral) -> dict:
+    """Build the list/detail response dict for a referral with patient and target loaded."""
+    return {
+        "id": str(referral.id),
+        "status": referral.status.value if referral.status else None,
+        "referral_date": referral.referral_date.isoformat() if referral.referral_date else None,
+        "appointment_timeframe": referral.appointment_timeframe.isoformat() if referral.appointment_timeframe else None,
+        "notes": referral.notes,
+        "referral_target_type": referral.referral_target_type,
+        "patient": {
+            "id": str(referral.patient.id),
+            "first_name": referral.patient.first_name,
+            "last_name": referral.patient.last_name,
+            "date_of_birth": referral.patient.date_of_birth.isoformat(),
+        }
+        if referral.patient
+        else None,
+        "provider": {
+            "id": str(referral.provider.id),
+            "full_name": referral.provider.full_name,
+        }
+        if referral.provider
+        else None,
+        "provider_institution": {
+            "id": str(referral.provider_institution.id),
+            "name": referral.provider_institution.name,
+        }
+        if referral.provider_institution
+        else None,
+        "datetime_created": referral.datetime_created.isoformat() if referral.datetime_created else None,
+    }
+
+
+@app.get("/api/referrals")
+async def list_referrals(
+    referral_status: Optional[ReferralStatus] = Query(None, alias="status"),
+    provider_id: Optional[uuid.UUID] = None,
+    provider_institution_id: Optional[uuid.UUID] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(REFERRAL_PAGE_SIZE_DEFAULT, ge=1, le=REFERRAL_PAGE_SIZE_MAX),
+    user: User = Depends(current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List current user's referrals, newest first.
+    Keyset-paginated on (referral_date, id): pass next_cursor from the previous page as cursor.
+    Patient and target are joined in the same query, so a page costs one round trip.
+    """
+    query = (
+        select(Referral)
+        .options(
+            joinedload(Referral.patient),
+            joinedload(Referral.provider),
+            joinedload(Referral.provider_institution),
+        )
+        .filter(Referral.user_id == user.id)
+    )
+
+    if referral_status is not None:
+        query = query.filter(Referral.status == referral_status)
+    if provider_id is not None:
+        query = query.filter(Referral.provider_id == provider_id)
+    if provider_institution_id is not None:
+        query = query.filter(Referral.provider_institution_id == provider_institution_id)
+
+    if cursor:
+        cursor_date, cursor_id = decode_referral_cursor(cursor)
+        query = query.filter(tuple_(Referral.referral_date, Referral.id) < tuple_(cursor_date, cursor_id))
+
+    # Fetch one extra row to know whether another page exists
+    query = query.order_by(Referral.referral_date.desc(), Referral.id.desc()).limit(limit + 1)
+
+    result = await db.execute(query)
+    referrals = result.scalars().all()
+
+    has_more = len(referrals) > limit
+    referrals = referrals[:limit]
+
+    return {
+        "items": [serialize_referral(referral) for referral in referrals],
+        "next_cursor": encode_referral_cursor(referrals[-1]) if has_more else None,
+    }
+
+
+@app.get("/api/referrals/{referral_id}")
+async def get_referral(
+    referral_id: uuid.UUID, user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)
+):
+    """Get one of current user's referrals with clinical details."""
+    result = await db.execute(
+        select(Referral)
+        .options(
+            joinedload(Referral.patient),
+            joinedload(Referral.provider),
+            joinedload(Referral.provider_institution),
+            undefer(Referral.clinical_notes),
+        )
+        .filter(Referral.id == referral_id, Referral.user_id == user.id)
+    )
+    referral = result.scalar_one_or_none()
+
+    if not referral:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referral not found")
+
+    response_data = serialize_referral(referral)
+    response_data.update(
+        {
+            "diagnosis_codes": referral.diagnosis_codes,
+            "diagnosis_descriptions": referral.diagnosis_descriptions,
+            "reason_for_referral": referral.reason_for_referral,
+            "clinical_notes": referral.clinical_notes,
+            "specialty_requested": referral.specialty_requested,
+            "urgency": referral.urgency,
+            "signed_by": referral.signed_by,
+            "confidence_score": referral.confidence_score,
+            "document_file_path": referral.document_file_path,
+            "document_processed_at": referral.document_processed_at.isoformat()
+            if referral.document_processed_at
+            else None,
+        }
+    )
+    return response_data
+
+
 # Documo Webhook Endpoints
 
 
@@ -855,36 +1068,38 @@ async def documo_fax_webhook(request: Request):
     - 401 Unauthorized: Invalid credentials
     - 400 Bad Request: Invalid payload or wrong event type
     """
-    # Log incoming request details
-    logger.info("=" * 80)
-    logger.info("DOCUMO WEBHOOK: Incoming request")
-    logger.info("=" * 80)
-    logger.info(f"Request URL: {request.url}")
-    logger.info(f"Request method: {request.method}")
-    logger.info(f"Client host: {request.client.host if request.client else 'unknown'}")
-
-    # Log headers
-    logger.info("\nRequest Headers:")
-    for header_name, header_value in request.headers.items():
-        # Mask Authorization header value for security
-        if header_name.lower() == "authorization":
-            logger.info(f"  {header_name}: [REDACTED]")
-        else:
-            logger.info(f"  {header_name}: {header_value}")
-
-    # Get and log raw request body
     raw_body = await request.body()
-    logger.info("\nRaw Request Body:")
-    logger.info(raw_body.decode('utf-8'))
-    logger.info("=" * 80)
+    logger.info(
+        "Documo webhook: Incoming request",
+        extra={
+            "client_host": request.client.host if request.client else None,
+            "webhook_event": request.headers.get("x-webhook-event"),
+            "body_bytes": len(raw_body),
+        },
+    )
+    # The full request, for debugging integrations: enable with LOG_LEVELS=app.webhooks.documo=DEBUG
+    # (and LOG_SAMPLE_RATES=app.webhooks.documo=<share> to keep only some), see app/logging_config.py
+    if webhook_dump_logger.isEnabledFor(logging.DEBUG):
+        webhook_dump_logger.debug(
+            "Documo webhook: Request dump",
+            extra={
+                "url": str(request.url),
+                "http_method": request.method,
+                "headers": {
+                    name: "[REDACTED]" if name.lower() == "authorization" else value
+                    for name, value in request.headers.items()
+                },
+                "body": raw_body.decode("utf-8", errors="replace"),
+            },
+        )
 
     # Parse and validate the payload
     try:
         body_json = json.loads(raw_body.decode('utf-8'))
         payload = DocumoFaxWebhookPayload(**body_json)
-        logger.info("\n✓ Payload validation successful")
     except Exception as e:
         logger.error(f"Failed to parse/validate payload: {e}", exc_info=True)
+        WEBHOOK_EVENTS.labels("documo", "invalid_payload").inc()
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"Invalid payload: {str(e)}"
@@ -898,6 +1113,7 @@ async def documo_fax_webhook(request: Request):
 
     if not webhook_username or not webhook_password:
         logger.error("Documo webhook credentials not configured")
+        WEBHOOK_EVENTS.labels("documo", "misconfigured").inc()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Webhook credentials not configured"
         )
@@ -906,17 +1122,20 @@ async def documo_fax_webhook(request: Request):
     authorization = request.headers.get("Authorization")
     if not verify_webhook_auth(authorization, webhook_username, webhook_password):
         logger.warning("Documo webhook: Authentication failed")
+        WEBHOOK_EVENTS.labels("documo", "unauthorized").inc()
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
 
     # Verify event type
     event_type = request.headers.get("x-webhook-event")
     if event_type != "fax.v1.inbound.complete":
         logger.info(f"Documo webhook: Ignoring event type {event_type}")
+        WEBHOOK_EVENTS.labels("documo", "ignored").inc()
         return {"status": "ignored", "reason": f"Unexpected event type: {event_type}"}
 
     # Verify direction is inbound
     if payload.direction != "inbound":
         logger.info(f"Documo webhook: Ignoring {payload.direction} fax")
+        WEBHOOK_EVENTS.labels("documo", "ignored").inc()
         return {"status": "ignored", "reason": f"Not an inbound fax: {payload.direction}"}
 
     # Extract fax details (handle optional fields safely)
@@ -925,15 +1144,21 @@ async def documo_fax_webhook(request: Request):
     to_number = payload.faxNumber or "unknown"
     page_count = payload.pagesCount or 0
 
+    fax_fields = {"fax_message_id": message_id, "fax_pages": page_count}
     logger.info(
-        f"Documo webhook: Received fax {message_id} from {from_number} to {to_number} ({page_count} pages, status: {payload.status or 'unknown'})"
+        f"Documo webhook: Received fax {message_id} from {from_number} to {to_number} ({page_count} pages, status: {payload.status or 'unknown'})",
+        extra={**fax_fields, "fax_caller_id": from_number, "fax_number": to_number, "fax_status": payload.status},
     )
+    # Identify the fax on the route's span, next to the download and upload spans under it
+    span = trace.get_current_span()
+    span.set_attributes({"fax.message_id": message_id, "fax.pages": page_count})
 
     try:
         # Download fax PDF
-        logger.info(f"Documo webhook: Downloading PDF for message {message_id}...")
+        logger.debug(f"Documo webhook: Downloading PDF for message {message_id}", extra=fax_fields)
         pdf_data = await download_fax_pdf(message_id, api_key, base_url)
-        logger.info(f"Documo webhook: Downloaded {len(pdf_data)} bytes")
+        logger.debug(f"Documo webhook: Downloaded {len(pdf_data)} bytes", extra=fax_fields)
+        span.set_attribute("fax.bytes", len(pdf_data))
 
         # Upload PDF to GCS with metadata
         bucket_name = os.getenv("INBOUND_FAXES_BUCKET", "grove-health-inbound-faxes")
@@ -950,7 +1175,7 @@ async def documo_fax_webhook(request: Request):
             "direction": "inbound",
         }
 
-        logger.info(f"Documo webhook: Uploading PDF to GCS bucket {bucket_name}...")
+        logger.debug(f"Documo webhook: Uploading PDF to GCS bucket {bucket_name}", extra=fax_fields)
         gcs_url = upload_blob(
             bucket_name=bucket_name,
             source_data=pdf_data,
@@ -959,9 +1184,11 @@ async def documo_fax_webhook(request: Request):
             metadata=metadata,
         )
 
-        logger.info("=" * 80)
-        logger.info(f"✓ PDF UPLOADED TO: {gcs_url}")
-        logger.info("=" * 80)
+        logger.info(
+            f"Documo webhook: Stored fax {message_id} at {gcs_url}",
+            extra={**fax_fields, "pdf_bytes": len(pdf_data), "gcs_url": gcs_url},
+        )
+        WEBHOOK_EVENTS.labels("documo", "success").inc()
 
         return {
             "status": "success",
@@ -976,7 +1203,10 @@ async def documo_fax_webhook(request: Request):
 
     except Exception as e:
         # Log error but return 200 to prevent Documo from retrying
-        logger.error(f"Documo webhook: Failed to download fax {message_id}: {e}")
+        logger.error(f"Documo webhook: Failed to download fax {message_id}: {e}", extra=fax_fields)
+        WEBHOOK_EVENTS.labels("documo", "error").inc()
+        span.record_exception(e)
+        span.set_status(trace.StatusCode.ERROR, str(e))
         return {
             "status": "error",
             "message_id": message_id,
@@ -987,7 +1217,7 @@ async def documo_fax_webhook(request: Request):
 # Network Management Endpoints
 
 
-@app.get("/api/network")
+@app.get("/api/network", dependencies=[Depends(conditional_network_response)])
 async def get_user_network(user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)):
     """
     Get current user's provider network with full details.
@@ -1001,6 +1231,7 @@ async def get_user_network(user: User = Depends(current_active_user), db: AsyncS
             .selectinload(Provider.institution)
             .selectinload(ProviderInstitution.address),
             selectinload(UserProviderNetwork.provider_institution).selectinload(ProviderInstitution.address),
+            hide_deleted_institutions(),
         )
         .filter(UserProviderNetwork.user_id == user.id)
         .order_by(UserProviderNetwork.datetime_created.desc())
@@ -1045,7 +1276,8 @@ async def get_user_network(user: User = Depends(current_active_user), db: AsyncS
                     "datetime_added": entry.datetime_created.isoformat(),
                 }
             )
-        else:
+        # Entries for institutions the directory sync removed load without one and are left out
+        elif entry.provider_institution:
             network_items.append(
                 {
                     "id": str(entry.id),
@@ -1104,16 +1336,13 @@ async def add_to_network(
 
         new_entry = UserProviderNetwork(user_id=user.id, provider_id=network_entry.provider_id)
     else:
-        institution_check = await db.execute(
-            select(ProviderInstitution).filter(ProviderInstitution.id == network_entry.provider_institution_id)
-        )
-        if not institution_check.scalar_one_or_none():
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Institution not found")
+        await get_listed_institution(db, network_entry.provider_institution_id)
 
         new_entry = UserProviderNetwork(user_id=user.id, provider_institution_id=network_entry.provider_institution_id)
 
     db.add(new_entry)
     await db.commit()
+    network_cache.invalidate(user.id)
     await db.refresh(new_entry)
 
     return {"id": str(new_entry.id), "message": "Added to network successfully"}
@@ -1140,6 +1369,7 @@ async def remove_from_network(
 
     await db.delete(entry)
     await db.commit()
+    network_cache.invalidate(user.id)
 
     return None
 
@@ -1147,29 +1377,130 @@ async def remove_from_network(
 # Browse Endpoints (for adding to network)
 
 
-@app.get("/api/browse/providers")
+async def get_search_origin(db: AsyncSession, near_zip: str) -> tuple[float, float]:
+    """Coordinates of the ZIP used as the centre of a proximity search (400 if unknown)."""
+    origin = await get_zip_coordinates(db, near_zip)
+    if origin is None:
+        raise HTTPException(status_code=400, detail=f"Unknown ZIP code: {near_zip}")
+    return origin
+
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+# Rows fetched per round trip from the server-side cursor (and per streamed chunk)
+NDJSON_BATCH_SIZE = 500
+
+
+def wants_ndjson(request: Request) -> bool:
+    """Opt-in streaming mode: the client sends Accept: application/x-ndjson."""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(query, serialize, response: Response) -> StreamingResponse:
+    """
+    Stream query rows as NDJSON, one serialized row per line.
+
+    Rows come from a server-side cursor NDJSON_BATCH_SIZE at a time, so memory
+    stays constant however large the result is. The stream uses its own session:
+    the request's session is closed once the endpoint returns, before the body
+    is sent. Headers already set on response (ETag) are carried over, and
+    Vary: Accept is set, since the same URL serves JSON without it.
+    """
+
+    async def lines():
+        async with AsyncSessionLocal() as session:
+            result = await session.stream(query.execution_options(yield_per=NDJSON_BATCH_SIZE))
+            async for partition in result.partitions():
+                yield b"".join(orjson.dumps(serialize(*row)) + b"\n" for row in partition)
+
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    headers.setdefault("vary", VARY)
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
+
+
+def serialize_browse_provider(provider: Provider, in_network: bool, distance: Optional[float]) -> dict:
+    """Build the browse response dict for a global provider with address and institution loaded."""
+    return {
+        "id": str(provider.id),
+        "first_name": provider.first_name,
+        "last_name": provider.last_name,
+        "full_name": provider.full_name,
+        "email": provider.email,
+        "phone": provider.phone,
+        "in_network": in_network,
+        "distance_miles": round(distance, 1) if distance is not None else None,
+        "address": {
+            "street_address_1": provider.address.street_address_1,
+            "street_address_2": provider.address.street_address_2,
+            "city": provider.address.city,
+            "state": provider.address.state,
+            "zip_code": provider.address.zip_code,
+            "country": provider.address.country,
+        }
+        if provider.address
+        else None,
+        "institution": {
+            "id": str(provider.institution.id),
+            "name": provider.institution.name,
+            "website": provider.institution.website,
+        }
+        if provider.institution
+        else None,
+    }
+
+
+def serialize_browse_institution(inst: ProviderInstitution, in_network: bool, distance: Optional[float]) -> dict:
+    """Build the browse response dict for an institution with address loaded."""
+    return {
+        "id": str(inst.id),
+        "name": inst.name,
+        "type": inst.type,
+        "website": inst.website,
+        "phone": inst.phone,
+        "email": inst.email,
+        "in_network": in_network,
+        "distance_miles": round(distance, 1) if distance is not None else None,
+        "address": {
+            "street_address_1": inst.address.street_address_1,
+            "street_address_2": inst.address.street_address_2,
+            "city": inst.address.city,
+            "state": inst.address.state,
+            "zip_code": inst.address.zip_code,
+            "country": inst.address.country,
+        }
+        if inst.address
+        else None,
+    }
+
+
+@app.get("/api/browse/providers", dependencies=[Depends(conditional_network_response)])
 async def browse_all_providers(
-    search: Optional[str] = None, user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    search: Optional[str] = None,
+    near_zip: Optional[str] = Query(None, pattern=r"^\d{5}$"),
+    radius: float = Query(DEFAULT_RADIUS_MILES, gt=0, le=MAX_RADIUS_MILES),
+    user: User = Depends(current_active_user),
+    versions: UserVersions = Depends(current_user_versions),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Browse ALL global providers for adding to network.
     Only shows global (non-custom) providers.
     Supports optional search parameter.
+    With near_zip, only returns providers within radius miles of that ZIP, nearest first.
     Marks which providers are already in user's network.
+    With Accept: application/x-ndjson, streams one provider per line instead of a JSON list.
     """
     # Get user's network provider IDs
-    network_result = await db.execute(
-        select(UserProviderNetwork.provider_id).filter(
-            UserProviderNetwork.user_id == user.id, UserProviderNetwork.provider_id.isnot(None)
-        )
-    )
-    network_provider_ids = set([row[0] for row in network_result.all()])
+    network_provider_ids = (await network_cache.get(db, user.id, versions.network_version)).provider_ids
 
     # Build query for all global providers only
     query = (
         select(Provider)
         .options(
-            selectinload(Provider.address), selectinload(Provider.institution).selectinload(ProviderInstitution.address)
+            selectinload(Provider.address),
+            selectinload(Provider.institution).selectinload(ProviderInstitution.address),
+            hide_deleted_institutions(),
         )
         .filter(Provider.global_provider == True)
     )
@@ -1185,130 +1516,116 @@ async def browse_all_providers(
             )
         )
 
-    result = await db.execute(query)
-    providers = result.scalars().all()
+    # Apply proximity filter if provided (bounding box on the index, then exact distance)
+    if near_zip:
+        origin = await get_search_origin(db, near_zip)
+        distance = distance_miles(*origin)
+        query = (
+            query.join(Provider.address)
+            .add_columns(distance)
+            .filter(within_bounding_box(*origin, radius), distance <= radius)
+            .order_by(distance)
+        )
+    else:
+        query = query.add_columns(null())
 
-    return [
-        {
-            "id": str(provider.id),
-            "first_name": provider.first_name,
-            "last_name": provider.last_name,
-            "full_name": provider.full_name,
-            "email": provider.email,
-            "phone": provider.phone,
-            "in_network": provider.id in network_provider_ids,  # NEW FIELD
-            "address": {
-                "street_address_1": provider.address.street_address_1,
-                "street_address_2": provider.address.street_address_2,
-                "city": provider.address.city,
-                "state": provider.address.state,
-                "zip_code": provider.address.zip_code,
-                "country": provider.address.country,
-            }
-            if provider.address
-            else None,
-            "institution": {
-                "id": str(provider.institution.id),
-                "name": provider.institution.name,
-                "website": provider.institution.website,
-            }
-            if provider.institution
-            else None,
-        }
-        for provider in providers
-    ]
+    def serialize(provider, distance):
+        return serialize_browse_provider(provider, provider.id in network_provider_ids, distance)
 
+    if wants_ndjson(request):
+        return ndjson_response(query, serialize, response)
 
-@app.get("/api/browse/provider-institutions")
+    result = await db.execute(query)
+    return [serialize(provider, distance) for provider, distance in result.all()]
+
+
+@app.get("/api/browse/provider-institutions", dependencies=[Depends(conditional_network_response)])
 async def browse_all_institutions(
-    search: Optional[str] = None, user: User = Depends(current_active_user), db: AsyncSession = Depends(get_db)
+    request: Request,
+    response: Response,
+    search: Optional[str] = None,
+    near_zip: Optional[str] = Query(None, pattern=r"^\d{5}$"),
+    radius: float = Query(DEFAULT_RADIUS_MILES, gt=0, le=MAX_RADIUS_MILES),
+    user: User = Depends(current_active_user),
+    versions: UserVersions = Depends(current_user_versions),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Browse ALL provider institutions for adding to network.
     Supports optional search parameter.
+    With near_zip, only returns institutions within radius miles of that ZIP, nearest first.
     Marks which institutions are already in user's network.
+    With Accept: application/x-ndjson, streams one institution per line instead of a JSON list.
     """
     # Get user's network institution IDs
-    network_result = await db.execute(
-        select(UserProviderNetwork.provider_institution_id).filter(
-            UserProviderNetwork.user_id == user.id, UserProviderNetwork.provider_institution_id.isnot(None)
-        )
-    )
-    network_institution_ids = set([row[0] for row in network_result.all()])
+    network_institution_ids = (await network_cache.get(db, user.id, versions.network_version)).institution_ids
 
-    # Build query for all institutions
-    query = select(ProviderInstitution).options(selectinload(ProviderInstitution.address))
+    # Build query for all institutions (excluding ones removed from the source directory)
+    query = (
+        select(ProviderInstitution)
+        .options(selectinload(ProviderInstitution.address))
+        .filter(ProviderInstitution.deleted_at.is_(None))
+    )
 
     # Apply search filter if provided
     if search:
         search_term = f"%{search}%"
         query = query.filter(ProviderInstitution.name.ilike(search_term))
 
-    result = await db.execute(query)
-    institutions = result.scalars().all()
+    # Apply proximity filter if provided (bounding box on the index, then exact distance)
+    if near_zip:
+        origin = await get_search_origin(db, near_zip)
+        distance = distance_miles(*origin)
+        query = (
+            query.join(ProviderInstitution.address)
+            .add_columns(distance)
+            .filter(within_bounding_box(*origin, radius), distance <= radius)
+            .order_by(distance)
+        )
+    else:
+        query = query.add_columns(null())
 
-    return [
-        {
-            "id": str(inst.id),
-            "name": inst.name,
-            "type": inst.type,
-            "website": inst.website,
-            "phone": inst.phone,
-            "email": inst.email,
-            "in_network": inst.id in network_institution_ids,  # NEW FIELD
-            "address": {
-                "street_address_1": inst.address.street_address_1,
-                "street_address_2": inst.address.street_address_2,
-                "city": inst.address.city,
-                "state": inst.address.state,
-                "zip_code": inst.address.zip_code,
-                "country": inst.address.country,
-            }
-            if inst.address
-            else None,
-        }
-        for inst in institutions
-    ]
+    def serialize(inst, distance):
+        return serialize_browse_institution(inst, inst.id in network_institution_ids, distance)
+
+    if wants_ndjson(request):
+        return ndjson_response(query, serialize, response)
+
+    result = await db.execute(query)
+    return [serialize(inst, distance) for inst, distance in result.all()]
 
 
 # SQLAdmin Authentication Backend
 class AdminAuth(AuthenticationBackend):
+    """SQLAdmin login backed by a signed admin claim in the session (see app/admin_session.py)."""
+
+    def __init__(self, secret_key: str):
+        super().__init__(secret_key=secret_key)
+        self.claims = AdminClaimSigner(secret_key)
+
     async def login(self, request: Request) -> bool:
         """Handle admin login."""
         form = await request.form()
         email = form.get("username")  # SQLAdmin uses "username" field
         password = form.get("password")
 
-        # Verify credentials using the same password helper as fastapi-users
-        from pwdlib import PasswordHash
-
-        password_hash = PasswordHash.recommended()
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(User).filter(User.email == email))
+            user = result.scalar_one_or_none()
 
-        async for session in get_db():
-            try:
-                # Get user by email
-                result = await session.execute(select(User).filter(User.email == email))
-                user = result.scalar_one_or_none()
-
-                if not user:
-                    return False
-
-                # Verify password
-                verified, _ = password_hash.verify_and_update(password, user.hashed_password)
-                if not verified:
-                    return False
+        if not user:
+            return False
 
-                # Check if user is admin
-                if not user.is_admin:
-                    return False
+        # Verify credentials with the same password helper (and pool) as fastapi-users
+        verified, _ = await password_helper.verify_and_update_async(password, user.hashed_password)
+        if not verified:
+            return False
 
-                # Store user ID in session
-                request.session.update({"user_id": str(user.id)})
-                return True
-            finally:
-                await session.close()
+        if not user.is_admin or not user.is_active:
+            return False
 
-        return False
+        request.session.update({ADMIN_SESSION_KEY: self.claims.issue(user.id)})
+        return True
 
     async def logout(self, request: Request) -> bool:
         """Handle admin logout."""
@@ -1316,25 +1633,26 @@ class AdminAuth(AuthenticationBackend):
         return True
 
     async def authenticate(self, request: Request) -> bool:
-        """Check if user is authenticated and is admin."""
-        user_id = request.session.get("user_id")
-
-        if not user_id:
+        """Check the signed admin claim; re-read the user only when the revalidation window has passed."""
+        claim = self.claims.loads(request.session.get(ADMIN_SESSION_KEY))
+        now = time.time()
+        if claim is None or claim.expired(now):
+            request.session.pop(ADMIN_SESSION_KEY, None)
             return False
 
-        async for session in get_db():
-            try:
-                result = await session.execute(select(User).filter(User.id == user_id))
-                user = result.scalar_one_or_none()
+        if not claim.needs_revalidation(now):
+            return True
 
-                if not user or not user.is_admin:
-                    return False
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(User.is_admin, User.is_active).filter(User.id == claim.user_id))
+            row = result.one_or_none()
 
-                return True
-            finally:
-                await session.close()
+        if row is None or not row.is_admin or not row.is_active:
+            request.session.pop(ADMIN_SESSION_KEY, None)
+            return False
 
-        return False
+        request.session[ADMIN_SESSION_KEY] = self.claims.revalidated(claim)
+        return True
 
 
 # SQLAdmin Model Views
@@ -1353,10 +1671,18 @@ class UserAdmin(ModelView, model=User):
     ]
     column_searchable_list = [User.email, User.first_name, User.last_name, User.npi]
     column_sortable_list = [User.email, User.first_name, User.last_name, User.is_admin, User.is_active]
+    # Maintained by the user_provider_networks trigger; saving a stale form value would let old network ETags match
+    form_excluded_columns = [User.network_version]
     can_create = True
     can_edit = True
     can_delete = True
 
+    async def after_model_change(self, data, model, is_created, request):
+        user_cache.invalidate(model.id)
+
+    async def after_model_delete(self, model, request):
+        user_cache.invalidate(model.id)
+
 
 class ProviderAdmin(ModelView, model=Provider):
     column_list = [
@@ -1395,6 +1721,13 @@ class ProviderInstitutionAdmin(ModelView, model=ProviderInstitution):
     can_edit = True
     can_delete = True
 
+    # Institutions the directory sync soft-deleted are not listed (the next sync restores them if they reappear)
+    def list_query(self, request: Request):
+        return super().list_query(request).filter(ProviderInstitution.deleted_at.is_(None))
+
+    def count_query(self, request: Request):
+        return super().count_query(request).filter(ProviderInstitution.deleted_at.is_(None))
+
 
 class PatientAdmin(ModelView, model=Patient):
     column_list = [
@@ -1439,6 +1772,13 @@ class ReferralAdmin(ModelView, model=Referral):
     can_edit = True
     can_delete = True
 
+    # clinical_notes is deferred; load it with the row, the form and details page are rendered after the session closes
+    def form_edit_query(self, request: Request):
+        return super().form_edit_query(request).options(undefer(Referral.clinical_notes))
+
+    def details_query(self, request: Request):
+        return super().details_query(request).options(undefer(Referral.clinical_notes))
+
 
 class AddressAdmin(ModelView, model=Address):
     column_list = [
@@ -1454,9 +1794,12 @@ class AddressAdmin(ModelView, model=Address):
     ]
     column_searchable_list = [Address.city, Address.state, Address.zip_code, Address.street_address_1]
     column_sortable_list = [Address.city, Address.state, Address.zip_code, Address.datetime_created]
-    can_create = True
-    can_edit = True
-    can_delete = True
+    # Read-only: rows are shared by every provider, institution and patient at the same address, so an
+    # edit would move all of them (or collide with an existing normalized_hash). Change an owner's address
+    # through the API, which points it at another row (get_or_create_address).
+    can_create = False
+    can_edit = False
+    can_delete = False
 
 
 class UserProviderNetworkAdmin(ModelView, model=UserProviderNetwork):
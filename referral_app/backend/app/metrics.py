@@ -0,0 +1,198 @@
+"""
+Prometheus metrics, served at /metrics.
+
+- http_request_duration_seconds / http_requests_total: latency and count per
+  route template (so /api/referrals/{referral_id} is one series) and status
+- http_requests_in_flight
+- db_pool_*: size, checked out and overflow connections of the engine's pool
+- executor_queued / executor_active: work waiting for and running on the
+  password hashing pool and the threadpool sync endpoints run on
+- external_call_duration_seconds: Documo, Cloud Storage, Gmail and Document
+  AI calls, by operation and outcome (the histogram count is the call count)
+- webhook_events_total: Documo fax webhooks by outcome
+
+App Engine runs gunicorn with 4 worker processes (app.yaml), and a scrape
+reaches only one of them. gunicorn.conf.py therefore sets
+PROMETHEUS_MULTIPROC_DIR: every worker writes its samples to memory-mapped
+files there, and /metrics aggregates the files of all workers. Gauges are
+summed over live workers. The pool and threadpool gauges are sampled after
+each request, so they describe each worker as of its last request. Without
+PROMETHEUS_MULTIPROC_DIR (uvicorn locally), the process registry is served.
+
+Set METRICS_TOKEN to require "Authorization: Bearer <token>" on /metrics.
+In staging and production, where /metrics is publicly routed (app.yaml), it is
+required: without it every request to /metrics is refused.
+"""
+
+import asyncio
+import contextvars
+import hmac
+import os
+import time
+from concurrent.futures import Executor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional, Tuple, TypeVar
+
+import anyio.to_thread
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.tracing import tracer
+
+T = TypeVar("T")
+
+HTTP_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+# Requests that matched no route share one series instead of one per probed URL
+UNMATCHED_ROUTE = "unmatched"
+EXTERNAL_CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, to the end of the response body", ["method", "route"]
+)
+REQUESTS = Counter("http_requests", "HTTP requests", ["method", "route", "status"])
+REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled", multiprocess_mode="livesum")
+
+DB_POOL_SIZE = Gauge("db_pool_size", "Connections the pool keeps", multiprocess_mode="livesum")
+DB_POOL_CHECKED_OUT = Gauge("db_pool_checked_out", "Pool connections in use", multiprocess_mode="livesum")
+DB_POOL_OVERFLOW = Gauge("db_pool_overflow", "Connections open beyond the pool size", multiprocess_mode="livesum")
+
+EXECUTOR_QUEUED = Gauge(
+    "executor_queued", "Tasks waiting for an executor thread", ["executor"], multiprocess_mode="livesum"
+)
+EXECUTOR_ACTIVE = Gauge("executor_active", "Tasks running on an executor", ["executor"], multiprocess_mode="livesum")
+
+EXTERNAL_CALL_DURATION = Histogram(
+    "external_call_duration_seconds",
+    "Latency of calls to external services",
+    ["service", "operation", "outcome"],
+    buckets=EXTERNAL_CALL_BUCKETS,
+)
+
+WEBHOOK_EVENTS = Counter("webhook_events", "Webhook deliveries received", ["source", "outcome"])
+
+
+def multiprocess_dir() -> Optional[str]:
+    return os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """(body, content type) of the exposition for all workers."""
+    if multiprocess_dir():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def metrics_authorized(authorization: Optional[str]) -> bool:
+    token = os.getenv("METRICS_TOKEN")
+    if not token:
+        # Open only for local scrapes; deployed instances must configure a token
+        return os.getenv("ENVIRONMENT", "local") not in ["staging", "production"]
+    return hmac.compare_digest(authorization or "", f"Bearer {token}")
+
+
+@contextmanager
+def external_call(service: str, operation: str) -> Iterator[None]:
+    """Time a call to an external service, in a span of its own; raising marks it as an error."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with tracer.start_as_current_span(
+            f"{service} {operation}", attributes={"peer.service": service, "operation": operation}
+        ):
+            yield
+        outcome = "success"
+    finally:
+        EXTERNAL_CALL_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+async def run_in_executor(executor: Executor, name: str, fn: Callable[..., T], *args) -> T:
+    """
+    loop.run_in_executor, counting the call as queued until a thread picks it up and active while it runs.
+
+    Unlike loop.run_in_executor, fn runs in a copy of the caller's context, so
+    it stays in the request's trace: the span covers the time on the thread
+    and records how long the call waited for one.
+    """
+    queued, active = EXECUTOR_QUEUED.labels(name), EXECUTOR_ACTIVE.labels(name)
+    started = False
+    submitted = time.perf_counter()
+
+    def run() -> T:
+        nonlocal started
+        started = True
+        queued.dec()
+        active.inc()
+        try:
+            with tracer.start_as_current_span(
+                name, attributes={"executor.queued_ms": round((time.perf_counter() - submitted) * 1000, 2)}
+            ):
+                return fn(*args)
+        finally:
+            active.dec()
+
+    queued.inc()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, contextvars.copy_context().run, run)
+    finally:
+        # Cancelled while still queued: run() never will
+        if not started:
+            queued.dec()
+
+
+def sample_runtime(engine: AsyncEngine):
+    """Set the pool and threadpool gauges from this worker's current state."""
+    pool = engine.sync_engine.pool
+    if isinstance(pool, QueuePool):
+        DB_POOL_SIZE.set(pool.size())
+        DB_POOL_CHECKED_OUT.set(pool.checkedout())
+        DB_POOL_OVERFLOW.set(max(0, pool.overflow()))
+
+    statistics = anyio.to_thread.current_default_thread_limiter().statistics()
+    EXECUTOR_ACTIVE.labels("threadpool").set(statistics.borrowed_tokens)
+    EXECUTOR_QUEUED.labels("threadpool").set(statistics.tasks_waiting)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, engine: AsyncEngine):
+        self.app = app
+        self.engine = engine
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        # Reported if the app fails before starting a response (the exception handler answers 500)
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            method = scope["method"] if scope["method"] in HTTP_METHODS else "OTHER"
+            route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+            REQUEST_DURATION.labels(method, route).observe(time.perf_counter() - started)
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            sample_runtime(self.engine)
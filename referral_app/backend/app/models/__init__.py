@@ -13,7 +13,14 @@ from app.models.insurance import Insurance
 from app.models.patient import Patient
 from app.models.user import User
 from app.models.referral import Referral, ReferralStatus
+from app.models.referral_document import ReferralDocument
 from app.models.user_provider_network import UserProviderNetwork
+from app.models.zip_centroid import ZipCentroid
+from app.models.directory_version import DirectoryVersion
+from app.models.refresh_token_revocation import RefreshTokenRevocation
+
+# Registers the functions and triggers Base.metadata.create_all adds to new tables
+from app.models import triggers  # noqa: F401
 
 # Export all models for easy importing
 __all__ = [
@@ -26,5 +33,9 @@ __all__ = [
     "User",
     "Referral",
     "ReferralStatus",
+    "ReferralDocument",
     "UserProviderNetwork",
+    "ZipCentroid",
+    "DirectoryVersion",
+    "RefreshTokenRevocation",
 ]
@@ -1,5 +1,7 @@
-from sqlalchemy import Column, String
+from sqlalchemy import Column, Float, Index, String, event
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import relationship
+from app.address_normalization import normalized_address_hash
 from app.models.base import BaseModel
 
 
@@ -7,6 +9,10 @@ class Address(BaseModel):
     """
     Address model for storing location information.
     Can be associated with providers, patients, or other entities.
+
+    Rows are shared: identical addresses (same normalized_hash) are stored once,
+    so an address must never be edited in place on behalf of a single owner.
+    Point the owner at the row returned by address_upsert_statement instead.
     """
 
     __tablename__ = "addresses"
@@ -18,6 +24,13 @@ class Address(BaseModel):
     zip_code = Column(String(10), nullable=False)
     country = Column(String(100), nullable=False, default="USA")
 
+    # sha256 of the canonical (USPS-style) address, see app/address_normalization.py
+    normalized_hash = Column(String(64), nullable=True, unique=True, index=True)
+
+    # ZIP centroid coordinates, set by the addresses_set_coordinates trigger from zip_centroids
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+
     # Relationship to providers (back-reference)
     providers = relationship("Provider", back_populates="address")
 
@@ -27,5 +40,41 @@ class Address(BaseModel):
     # Relationship to patients (back-reference)
     patients = relationship("Patient", back_populates="address")
 
+    # Bounding-box prefilter for proximity search (see app/geo.py)
+    __table_args__ = (Index("ix_addresses_latitude_longitude", "latitude", "longitude"),)
+
     def __repr__(self):
         return f"<Address(id={self.id}, city={self.city}, state={self.state})>"
+
+    def to_dict(self):
+        """Address fields, in the shape accepted by normalized_address_hash and AddressCreate."""
+        return {
+            "street_address_1": self.street_address_1,
+            "street_address_2": self.street_address_2,
+            "city": self.city,
+            "state": self.state,
+            "zip_code": self.zip_code,
+            "country": self.country,
+        }
+
+
+@event.listens_for(Address, "before_insert")
+@event.listens_for(Address, "before_update")
+def set_normalized_hash(mapper, connection, target):
+    """Keep normalized_hash in step with ORM writes (seed data, scripts)."""
+    target.normalized_hash = normalized_address_hash(target.to_dict())
+
+
+def address_upsert_statement(rows):
+    """
+    Insert addresses, reusing existing rows with the same normalized address.
+
+    Each row needs an id and normalized_hash, and hashes must be distinct
+    within one statement. Returns (normalized_hash, id) for every row, whether
+    it was inserted or already existed.
+    """
+    statement = pg_insert(Address).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[Address.normalized_hash],
+        set_={"normalized_hash": statement.excluded.normalized_hash},
+    ).returning(Address.normalized_hash, Address.id)
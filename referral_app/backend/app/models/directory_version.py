@@ -0,0 +1,62 @@
+from contextlib import asynccontextmanager
+
+from sqlalchemy import BigInteger, CheckConstraint, Column, Integer, event, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import Base
+
+# Read by bump_directory_version() (migrations/20261019200000_scope_directory_version.sql)
+DEFER_SETTING = "app.defer_directory_version"
+
+
+class DirectoryVersion(Base):
+    """
+    Single-row counter of changes to the provider directory.
+
+    Statement-level triggers increment version in the same transaction as any
+    change visible in the directory listings: global providers, institutions,
+    edits to addresses and zip_centroids. Custom providers bump the
+    network_version of the users whose network lists them instead, so one
+    user's edits don't invalidate everyone's ETags (see app/etags.py).
+    Not an entity, so it doesn't inherit BaseModel.
+    """
+
+    __tablename__ = "directory_version"
+
+    id = Column(Integer, primary_key=True, default=1)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (CheckConstraint("id = 1", name="directory_version_singleton"),)
+
+    def __repr__(self):
+        return f"<DirectoryVersion(version={self.version})>"
+
+
+@asynccontextmanager
+async def deferred_directory_version(session: AsyncSession, bump: bool = True):
+    """
+    Turn the directory_version triggers off for the session's transactions and
+    bump the version once at the end, in a transaction of its own.
+
+    For imports: each triggered bump locks the counter row until commit, so a
+    long import transaction would otherwise hold up every other directory write.
+    Enter it before the session starts a transaction. Pass bump=False for runs
+    that write nothing (--dry-run), so cached listings stay valid.
+    """
+
+    def defer(session, transaction, connection):
+        connection.execute(text("SELECT set_config(:name, 'on', true)"), {"name": DEFER_SETTING})
+
+    event.listen(session.sync_session, "after_begin", defer)
+    try:
+        yield session
+    except BaseException:
+        await session.rollback()
+        raise
+    finally:
+        event.remove(session.sync_session, "after_begin", defer)
+        # Also after a failure: the batches committed before it are in the directory
+        if bump:
+            await session.execute(
+                update(DirectoryVersion).where(DirectoryVersion.id == 1).values(version=DirectoryVersion.version + 1)
+            )
+            await session.commit()
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, DateTime, String, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, with_loader_criteria
 from app.models.base import BaseModel
 
 
@@ -30,6 +30,10 @@ class ProviderInstitution(BaseModel):
         UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True
     )
 
+    # Directory sync bookkeeping (global institutions loaded by scripts/import_provider_institutions.py)
+    source_hash = Column(String(64), nullable=True)  # sha256 of the source record last applied
+    deleted_at = Column(DateTime(timezone=True), nullable=True)  # Set when the record leaves the source directory
+
     # Relationship to Address
     address = relationship("Address", back_populates="provider_institutions")
 
@@ -44,3 +48,12 @@ class ProviderInstitution(BaseModel):
 
     def __repr__(self):
         return f"<ProviderInstitution(id={self.id}, name={self.name})>"
+
+
+def hide_deleted_institutions():
+    """
+    Statement option that leaves out institutions the directory sync soft-deleted
+    wherever the statement loads them, including eager-loaded relationships
+    (a provider whose institution was deleted is loaded with institution None).
+    """
+    return with_loader_criteria(ProviderInstitution, ProviderInstitution.deleted_at.is_(None))
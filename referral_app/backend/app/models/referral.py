@@ -1,7 +1,7 @@
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, ForeignKey, Enum, DateTime, Text, Float
+from sqlalchemy import Column, String, ForeignKey, Enum, DateTime, Text, Float, Index
 from sqlalchemy.dialects.postgresql import UUID, JSON
-from sqlalchemy.orm import relationship, validates
+from sqlalchemy.orm import deferred, relationship, validates
 from sqlalchemy.sql import func
 from app.models.base import BaseModel
 
@@ -50,7 +50,7 @@ class Referral(BaseModel):
     diagnosis_codes = Column(JSON, nullable=True)  # List of ICD-10 codes
     diagnosis_descriptions = Column(JSON, nullable=True)  # List of diagnosis descriptions
     reason_for_referral = Column(Text, nullable=True)
-    clinical_notes = Column(Text, nullable=True)  # Clinical notes from document
+    clinical_notes = deferred(Column(Text, nullable=True))  # Clinical notes from document (loaded on access)
     specialty_requested = Column(String(255), nullable=True)
     urgency = Column(String(50), nullable=True)
     orders_count = Column(String(50), nullable=True)
@@ -59,7 +59,6 @@ class Referral(BaseModel):
     # Document metadata (from AI extraction)
     signed_by = Column(String(255), nullable=True)
     confidence_score = Column(Float, nullable=True)  # AI extraction confidence (0.0-1.0)
-    raw_text = Column(Text, nullable=True)  # Full OCR text from document
     document_file_path = Column(String(500), nullable=True)  # GCS path or local path to PDF
     document_processed_at = Column(DateTime(timezone=True), nullable=True)  # When AI extraction occurred
 
@@ -70,6 +69,17 @@ class Referral(BaseModel):
     provider = relationship("Provider", foreign_keys=[provider_id], back_populates="referrals")
     provider_institution = relationship("ProviderInstitution", back_populates="referrals")
 
+    # Full OCR text lives in referral_documents (see ReferralDocument)
+    document = relationship(
+        "ReferralDocument", back_populates="referral", uselist=False, cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Constraints
+    __table_args__ = (
+        # Serves the per-user referral history listing (keyset pagination on referral_date)
+        Index("ix_referrals_user_id_referral_date", "user_id", "referral_date"),
+    )
+
     @validates("provider_id", "provider_institution_id")
     def validate_referral_target(self, key, value):
         """Application-level validation for mutually exclusive foreign keys.
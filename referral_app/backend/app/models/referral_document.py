@@ -0,0 +1,53 @@
+import zlib
+from sqlalchemy import Column, ForeignKey, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred, relationship
+from app.models.base import BaseModel
+
+# Compression codecs understood by ReferralDocument.raw_text
+CODEC_ZLIB = "zlib"
+CODEC_NONE = "none"  # Copied over from referrals.raw_text by migration, until scripts/compress_referral_documents.py
+
+
+class ReferralDocument(BaseModel):
+    """
+    Large extracted artefacts for a referral (one row per referral).
+    Kept out of the referrals table so referral scans don't carry full OCR text.
+    """
+
+    __tablename__ = "referral_documents"
+
+    referral_id = Column(
+        UUID(as_uuid=True), ForeignKey("referrals.id", ondelete="CASCADE"), nullable=False, unique=True, index=True
+    )
+
+    # Full OCR text from document, compressed with raw_text_codec
+    raw_text_compressed = deferred(Column(LargeBinary, nullable=True))
+    raw_text_codec = Column(String(20), nullable=False, default=CODEC_ZLIB)
+    raw_text_length = Column(Integer, nullable=True)  # Uncompressed length in characters
+
+    # Relationship to Referral
+    referral = relationship("Referral", back_populates="document")
+
+    def __repr__(self):
+        return f"<ReferralDocument(id={self.id}, referral_id={self.referral_id}, length={self.raw_text_length})>"
+
+    @property
+    def raw_text(self):
+        """Decompressed OCR text (loads the deferred column on first access)."""
+        if self.raw_text_compressed is None:
+            return None
+        data = bytes(self.raw_text_compressed)
+        if self.raw_text_codec == CODEC_ZLIB:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+
+    @raw_text.setter
+    def raw_text(self, value):
+        if value is None:
+            self.raw_text_compressed = None
+            self.raw_text_length = None
+            return
+        self.raw_text_compressed = zlib.compress(value.encode("utf-8"))
+        self.raw_text_codec = CODEC_ZLIB
+        self.raw_text_length = len(value)
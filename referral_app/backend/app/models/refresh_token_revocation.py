@@ -0,0 +1,34 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.base import BaseModel
+
+
+class RefreshTokenRevocation(BaseModel):
+    """
+    Revoked refresh tokens (see app/refresh_tokens.py).
+
+    A row with a jti revokes that single token; each token is revoked as it is
+    rotated. A row without a jti revokes the whole family, i.e. every token
+    descended from one login (on logout, or when a rotated token is reused).
+    Rows can be deleted once expires_at has passed.
+    """
+
+    __tablename__ = "refresh_token_revocations"
+
+    jti = Column(UUID(as_uuid=True), nullable=True, unique=True)
+    family_id = Column(UUID(as_uuid=True), nullable=False)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    __table_args__ = (
+        # One family-wide revocation per family; also serves the family lookup on refresh
+        Index(
+            "ix_refresh_token_revocations_family",
+            "family_id",
+            unique=True,
+            postgresql_where=text("jti IS NULL"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<RefreshTokenRevocation(jti={self.jti}, family_id={self.family_id})>"
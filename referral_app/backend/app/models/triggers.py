@@ -0,0 +1,159 @@
+"""
+Database functions, triggers and seed rows that live outside the table DDL.
+
+Migrations create them (migrations/2026101916*, 17*, 18* and 20*); this module
+creates the same objects when Base.metadata.create_all creates the tables, as
+the application does at startup on an empty database. Keep the two in step:
+the statements here are the schema the migrations end up with.
+
+create_all reports which tables it created, so existing databases (migrated,
+or tables already present) are left alone. Statements carry no SQL comments:
+atlas_loader.py prints them with newlines removed.
+"""
+
+from sqlalchemy import DDL, event
+
+from app.database import Base
+
+FUNCTIONS = {
+    "addresses_set_coordinates": """
+CREATE OR REPLACE FUNCTION addresses_set_coordinates() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' OR NEW.zip_code IS DISTINCT FROM OLD.zip_code THEN
+    SELECT z.latitude, z.longitude INTO NEW.latitude, NEW.longitude
+    FROM zip_centroids z
+    WHERE z.zip_code = left(NEW.zip_code, 5);
+  END IF;
+  RETURN NEW;
+END;
+$$
+""",
+    "users_bump_network_version": """
+CREATE OR REPLACE FUNCTION users_bump_network_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    UPDATE users SET network_version = network_version + 1 WHERE id = OLD.user_id;
+  END IF;
+  IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.user_id IS DISTINCT FROM OLD.user_id) THEN
+    UPDATE users SET network_version = network_version + 1 WHERE id = NEW.user_id;
+  END IF;
+  RETURN NULL;
+END;
+$$
+""",
+    "bump_directory_version": """
+CREATE OR REPLACE FUNCTION bump_directory_version() RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+  IF current_setting('app.defer_directory_version', true) IS DISTINCT FROM 'on' THEN
+    UPDATE directory_version SET version = version + 1 WHERE id = 1;
+  END IF;
+END;
+$$
+""",
+    "directory_version_bump": """
+CREATE OR REPLACE FUNCTION directory_version_bump() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM bump_directory_version();
+  RETURN NULL;
+END;
+$$
+""",
+    "providers_bump_versions": """
+CREATE OR REPLACE FUNCTION providers_bump_versions() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    IF EXISTS (SELECT 1 FROM new_providers WHERE global_provider) THEN
+      PERFORM bump_directory_version();
+    END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    IF EXISTS (SELECT 1 FROM old_providers WHERE global_provider) THEN
+      PERFORM bump_directory_version();
+    END IF;
+  ELSE
+    IF EXISTS (
+      SELECT 1 FROM old_providers o JOIN new_providers n USING (id)
+      WHERE o.global_provider OR n.global_provider
+    ) THEN
+      PERFORM bump_directory_version();
+    END IF;
+    UPDATE users SET network_version = network_version + 1
+    WHERE id IN (
+      SELECT n.user_id FROM user_provider_networks n JOIN new_providers p ON p.id = n.provider_id
+      WHERE NOT p.global_provider
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$
+""",
+    "addresses_bump_directory_version": """
+CREATE OR REPLACE FUNCTION addresses_bump_directory_version() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM old_addresses o JOIN new_addresses n USING (id)
+    WHERE (o.street_address_1, o.street_address_2, o.city, o.state, o.zip_code, o.country, o.latitude, o.longitude)
+      IS DISTINCT FROM
+      (n.street_address_1, n.street_address_2, n.city, n.state, n.zip_code, n.country, n.latitude, n.longitude)
+  ) THEN
+    PERFORM bump_directory_version();
+  END IF;
+  RETURN NULL;
+END;
+$$
+""",
+}
+
+# Table -> statements to run once it has been created, after every table exists
+TABLE_STATEMENTS = {
+    "addresses": [
+        "CREATE TRIGGER addresses_set_coordinates BEFORE INSERT OR UPDATE OF zip_code ON addresses "
+        "FOR EACH ROW EXECUTE FUNCTION addresses_set_coordinates()",
+        "CREATE TRIGGER addresses_bump_directory_version AFTER UPDATE ON addresses "
+        "REFERENCING OLD TABLE AS old_addresses NEW TABLE AS new_addresses "
+        "FOR EACH STATEMENT EXECUTE FUNCTION addresses_bump_directory_version()",
+    ],
+    "user_provider_networks": [
+        "CREATE TRIGGER user_provider_networks_bump_version AFTER INSERT OR UPDATE OR DELETE ON user_provider_networks "
+        "FOR EACH ROW EXECUTE FUNCTION users_bump_network_version()",
+    ],
+    "directory_version": [
+        "INSERT INTO directory_version (id, version) VALUES (1, 0)",
+    ],
+    "providers": [
+        "CREATE TRIGGER providers_bump_directory_version AFTER TRUNCATE ON providers "
+        "FOR EACH STATEMENT EXECUTE FUNCTION directory_version_bump()",
+        "CREATE TRIGGER providers_insert_bump_versions AFTER INSERT ON providers "
+        "REFERENCING NEW TABLE AS new_providers FOR EACH STATEMENT EXECUTE FUNCTION providers_bump_versions()",
+        "CREATE TRIGGER providers_update_bump_versions AFTER UPDATE ON providers "
+        "REFERENCING OLD TABLE AS old_providers NEW TABLE AS new_providers "
+        "FOR EACH STATEMENT EXECUTE FUNCTION providers_bump_versions()",
+        "CREATE TRIGGER providers_delete_bump_versions AFTER DELETE ON providers "
+        "REFERENCING OLD TABLE AS old_providers FOR EACH STATEMENT EXECUTE FUNCTION providers_bump_versions()",
+    ],
+    "provider_institutions": [
+        "CREATE TRIGGER provider_institutions_bump_directory_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON provider_institutions "
+        "FOR EACH STATEMENT EXECUTE FUNCTION directory_version_bump()",
+    ],
+    "zip_centroids": [
+        "CREATE TRIGGER zip_centroids_bump_directory_version "
+        "AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON zip_centroids "
+        "FOR EACH STATEMENT EXECUTE FUNCTION directory_version_bump()",
+    ],
+}
+
+
+@event.listens_for(Base.metadata, "after_create")
+def create_triggers(metadata, connection, tables=(), **kw):
+    """Create the functions, then the triggers and seed rows of the tables create_all just created."""
+    if connection.dialect.name != "postgresql":
+        return
+    created = [table.name for table in tables if table.name in TABLE_STATEMENTS]
+    if not created:
+        return
+    # Functions are created before any trigger needs them; plpgsql resolves the tables they use when called
+    for statement in FUNCTIONS.values():
+        connection.execute(DDL(statement.strip()))
+    for table_name in created:
+        for statement in TABLE_STATEMENTS[table_name]:
+            connection.execute(DDL(statement))
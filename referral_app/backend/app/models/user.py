@@ -1,5 +1,5 @@
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID
-from sqlalchemy import Column, String, Boolean
+from sqlalchemy import Column, String, Boolean, Integer
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -16,6 +16,10 @@ class User(SQLAlchemyBaseUserTableUUID, Base):
     npi = Column(String(10), nullable=True, index=True)
     is_admin = Column(Boolean, default=False, nullable=False)
 
+    # Incremented by the user_provider_networks_bump_version trigger on every network change;
+    # versions the cached network membership (read it via app.etags.current_user_versions)
+    network_version = Column(Integer, default=0, server_default="0", nullable=False)
+
     # Relationship to referrals
     referrals = relationship("Referral", back_populates="user")
 
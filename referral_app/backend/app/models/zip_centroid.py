@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Float, String
+from app.models.base import BaseModel
+
+
+class ZipCentroid(BaseModel):
+    """
+    Geographic centre of a ZIP code (Census ZCTA internal point).
+    Loaded offline by scripts/load_zip_centroids.py; a database trigger copies
+    the coordinates onto addresses when they are inserted or their ZIP changes.
+    """
+
+    __tablename__ = "zip_centroids"
+
+    zip_code = Column(String(5), nullable=False, unique=True, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+
+    def __repr__(self):
+        return f"<ZipCentroid(zip_code={self.zip_code}, latitude={self.latitude}, longitude={self.longitude})>"
@@ -0,0 +1,195 @@
+"""
+Per-user cache of network membership (the provider and institution IDs a user
+has in their network).
+
+Entries are tagged with users.network_version, which the
+user_provider_networks_bump_version trigger increments on every insert, update
+or delete in user_provider_networks. Callers pass the version read by
+app.etags.current_user_versions (the same query the ETag check needs), so a
+change made through one worker (or the admin, or a script) is picked up by all
+of them.
+
+Lookups go through two tiers:
+- an in-process LRU, one entry per user
+- an optional shared tier (NETWORK_CACHE_URL), so a worker that has not seen
+  the user yet can skip Postgres. Anything with async get/set/delete in the
+  shape of redis.asyncio.Redis works; "memory://" selects a local stand-in.
+"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Optional, Protocol
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.user_provider_network import UserProviderNetwork
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_USERS = 10_000
+# Old versions are never read again; the TTL only bounds how long they linger in the shared tier
+DEFAULT_SHARED_TTL_SECONDS = 24 * 60 * 60
+
+
+@dataclass(frozen=True)
+class NetworkIds:
+    provider_ids: frozenset
+    institution_ids: frozenset
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "provider_ids": [str(provider_id) for provider_id in self.provider_ids],
+                "institution_ids": [str(institution_id) for institution_id in self.institution_ids],
+            }
+        )
+
+    @classmethod
+    def from_json(cls, value) -> "NetworkIds":
+        data = json.loads(value)
+        return cls(
+            provider_ids=frozenset(map(uuid.UUID, data["provider_ids"])),
+            institution_ids=frozenset(map(uuid.UUID, data["institution_ids"])),
+        )
+
+
+class SharedCache(Protocol):
+    """Subset of the redis.asyncio.Redis interface used for the shared tier."""
+
+    async def get(self, key: str) -> Optional[Any]: ...
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> Any: ...
+
+    async def delete(self, key: str) -> Any: ...
+
+
+class InMemorySharedCache:
+    """Process-local stand-in for Redis, for local development and experiments."""
+
+    def __init__(self):
+        self._values = {}
+
+    async def get(self, key: str) -> Optional[str]:
+        item = self._values.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._values[key]
+            return None
+        return value
+
+    async def set(self, key: str, value: str, ex: Optional[int] = None) -> bool:
+        self._values[key] = (value, time.monotonic() + ex if ex else None)
+        return True
+
+    async def delete(self, key: str) -> int:
+        return 1 if self._values.pop(key, None) is not None else 0
+
+
+def get_shared_cache(url: Optional[str]) -> Optional[SharedCache]:
+    """Shared tier for a NETWORK_CACHE_URL: None, memory:// or a redis:// URL (needs the redis package)."""
+    if not url:
+        return None
+    if url == "memory://":
+        return InMemorySharedCache()
+
+    import redis.asyncio as redis
+
+    return redis.from_url(url, decode_responses=True)
+
+
+async def load_network_ids(db: AsyncSession, user_id: uuid.UUID) -> NetworkIds:
+    result = await db.execute(
+        select(UserProviderNetwork.provider_id, UserProviderNetwork.provider_institution_id).filter(
+            UserProviderNetwork.user_id == user_id
+        )
+    )
+    provider_ids = set()
+    institution_ids = set()
+    for provider_id, institution_id in result.all():
+        if provider_id is not None:
+            provider_ids.add(provider_id)
+        else:
+            institution_ids.add(institution_id)
+    return NetworkIds(provider_ids=frozenset(provider_ids), institution_ids=frozenset(institution_ids))
+
+
+class NetworkCache:
+    def __init__(
+        self,
+        max_users: int = DEFAULT_MAX_USERS,
+        shared: Optional[SharedCache] = None,
+        shared_ttl: int = DEFAULT_SHARED_TTL_SECONDS,
+    ):
+        self.max_users = max_users
+        self.shared = shared
+        self.shared_ttl = shared_ttl
+        # user_id -> (network_version, NetworkIds), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def shared_key(user_id: uuid.UUID, version: int) -> str:
+        return f"network-ids:{user_id}:{version}"
+
+    async def get(self, db: AsyncSession, user_id: uuid.UUID, version: int) -> NetworkIds:
+        """Network IDs for the user at the given network_version, from the LRU, the shared tier or the database."""
+        entry = self._entries.get(user_id)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(user_id)
+            return entry[1]
+
+        network_ids = await self._get_shared(user_id, version)
+        if network_ids is None:
+            network_ids = await load_network_ids(db, user_id)
+            await self._set_shared(user_id, version, network_ids)
+
+        self._entries[user_id] = (version, network_ids)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+        return network_ids
+
+    def invalidate(self, user_id: uuid.UUID):
+        """
+        Drop the user's in-process entry after changing their network.
+
+        Not required for correctness (the trigger bumps the version), but frees
+        the stale entry right away instead of waiting for eviction. Shared-tier
+        entries are keyed by version and expire with their TTL.
+        """
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def _get_shared(self, user_id: uuid.UUID, version: int) -> Optional[NetworkIds]:
+        if self.shared is None:
+            return None
+        try:
+            value = await self.shared.get(self.shared_key(user_id, version))
+        except Exception as e:
+            # The shared tier is an optimization; fall back to the database
+            logger.warning(f"Network cache: shared tier read failed: {e}")
+            return None
+        return NetworkIds.from_json(value) if value is not None else None
+
+    async def _set_shared(self, user_id: uuid.UUID, version: int, network_ids: NetworkIds):
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(self.shared_key(user_id, version), network_ids.to_json(), ex=self.shared_ttl)
+        except Exception as e:
+            logger.warning(f"Network cache: shared tier write failed: {e}")
+
+
+network_cache = NetworkCache(
+    max_users=int(os.getenv("NETWORK_CACHE_MAX_USERS", DEFAULT_MAX_USERS)),
+    shared=get_shared_cache(os.getenv("NETWORK_CACHE_URL")),
+)
@@ -0,0 +1,35 @@
+"""
+Queries for the providers and institutions in a user's network.
+
+Each is a single JOIN through user_provider_networks. The unique constraints
+unique_user_provider (user_id, provider_id) and unique_user_institution
+(user_id, provider_institution_id) are the covering indexes for the join side,
+so Postgres can answer it with an index-only scan; scripts/check_network_query_plans.py
+checks that this stays true.
+"""
+
+import uuid
+
+from sqlalchemy import select
+
+from app.models.provider import Provider
+from app.models.provider_institution import ProviderInstitution
+from app.models.user_provider_network import UserProviderNetwork
+
+
+def network_providers_query(user_id: uuid.UUID):
+    """Providers in the user's network."""
+    return (
+        select(Provider)
+        .join(UserProviderNetwork, UserProviderNetwork.provider_id == Provider.id)
+        .filter(UserProviderNetwork.user_id == user_id)
+    )
+
+
+def network_institutions_query(user_id: uuid.UUID):
+    """Provider institutions in the user's network, without ones the directory sync soft-deleted."""
+    return (
+        select(ProviderInstitution)
+        .join(UserProviderNetwork, UserProviderNetwork.provider_institution_id == ProviderInstitution.id)
+        .filter(UserProviderNetwork.user_id == user_id, ProviderInstitution.deleted_at.is_(None))
+    )
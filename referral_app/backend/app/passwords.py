@@ -0,0 +1,72 @@
+"""
+Password hashing on a bounded worker pool.
+
+Argon2 and bcrypt are deliberately slow (tens of milliseconds per hash). Run
+on the event loop, a burst of logins stalls every other request on the
+worker, so login paths hash and verify through the async methods here, which
+run on a small thread pool. Both argon2-cffi and bcrypt release the GIL while
+hashing, so the pool hashes in parallel without pickling through a process
+pool, and its size bounds the CPU that logins can take from a worker.
+
+Hash parameters come from the environment. New hashes use argon2; existing
+hashes with other parameters (or bcrypt hashes) still verify and are
+re-hashed with the current parameters on the next login.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from argon2 import DEFAULT_MEMORY_COST, DEFAULT_PARALLELISM, DEFAULT_TIME_COST
+from fastapi_users.password import PasswordHelper
+from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+from pwdlib.hashers.bcrypt import BcryptHasher
+
+from app.metrics import run_in_executor
+
+DEFAULT_BCRYPT_ROUNDS = 12
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def build_password_hash(
+    time_cost: int = DEFAULT_TIME_COST,
+    memory_cost: int = DEFAULT_MEMORY_COST,
+    parallelism: int = DEFAULT_PARALLELISM,
+    bcrypt_rounds: int = DEFAULT_BCRYPT_ROUNDS,
+) -> PasswordHash:
+    # The first hasher is used for new hashes; the others only verify (and trigger an upgrade)
+    return PasswordHash(
+        (
+            Argon2Hasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism),
+            BcryptHasher(rounds=bcrypt_rounds),
+        )
+    )
+
+
+class PooledPasswordHelper(PasswordHelper):
+    """fastapi-users PasswordHelper with async variants that run on a bounded thread pool."""
+
+    def __init__(self, password_hash: PasswordHash, max_workers: int = DEFAULT_WORKERS):
+        super().__init__(password_hash)
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+
+    async def hash_async(self, password: str) -> str:
+        return await run_in_executor(self.executor, "password_hash", self.hash, password)
+
+    async def verify_and_update_async(self, plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await run_in_executor(
+            self.executor, "password_hash", self.verify_and_update, plain_password, hashed_password
+        )
+
+
+password_helper = PooledPasswordHelper(
+    build_password_hash(
+        time_cost=int(os.getenv("PASSWORD_ARGON2_TIME_COST", DEFAULT_TIME_COST)),
+        memory_cost=int(os.getenv("PASSWORD_ARGON2_MEMORY_COST", DEFAULT_MEMORY_COST)),
+        parallelism=int(os.getenv("PASSWORD_ARGON2_PARALLELISM", DEFAULT_PARALLELISM)),
+        bcrypt_rounds=int(os.getenv("PASSWORD_BCRYPT_ROUNDS", DEFAULT_BCRYPT_ROUNDS)),
+    ),
+    max_workers=int(os.getenv("PASSWORD_HASH_WORKERS", DEFAULT_WORKERS)),
+)
@@ -0,0 +1,243 @@
+"""
+Per-request database query statistics.
+
+SQLAlchemy cursor events on the engine count and time every statement sent to
+Postgres. QueryStatsMiddleware gives each HTTP request its own QueryStats
+through a context variable (SQLAlchemy's async greenlets run in the request's
+context, so statements are attributed to the request that issued them) and,
+when the request ends:
+
+- logs the query count, total database time and the slowest statement as
+  log record fields (a WARNING above QUERY_STATS_WARN_QUERIES queries or
+  QUERY_STATS_WARN_DB_MS of database time, which is how N+1 loops show up);
+- with QUERY_STATS_HEADERS on (the default when ENVIRONMENT=local), adds them
+  to the response as X-DB-Query-Count, X-DB-Time-Ms and X-DB-Slowest-Ms plus a
+  Server-Timing entry, which browser dev tools show next to each request.
+
+Headers are sent before a streamed body, so statements issued while streaming
+are only in the log line.
+
+For tests, query_budget() collects the statements of a block of code and
+assert_query_budget() checks a response's headers against an endpoint's budget.
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+QUERY_TIME_HEADER = "X-DB-Time-Ms"
+SLOWEST_QUERY_HEADER = "X-DB-Slowest-Ms"
+
+DEFAULT_WARN_QUERIES = 20
+DEFAULT_WARN_DB_MS = 500.0
+# Longest statement text kept for the log (the slowest statement can be a large IN list)
+MAX_STATEMENT_LENGTH = 1000
+
+_current_stats: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+
+
+@dataclass
+class QueryStats:
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+    # Every statement in order, only when asked for (query_budget)
+    statements: Optional[List[str]] = None
+
+    def record(self, statement: str, elapsed_ms: float):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+    def log_fields(self) -> dict:
+        return {
+            "db_query_count": self.count,
+            "db_time_ms": round(self.total_ms, 2),
+            "db_slowest_ms": round(self.slowest_ms, 2),
+            "db_slowest_statement": compact_statement(self.slowest_statement),
+        }
+
+    def headers(self) -> List[tuple]:
+        return [
+            (QUERY_COUNT_HEADER, str(self.count)),
+            (QUERY_TIME_HEADER, f"{self.total_ms:.2f}"),
+            (SLOWEST_QUERY_HEADER, f"{self.slowest_ms:.2f}"),
+            ("Server-Timing", f'db;dur={self.total_ms:.2f};desc="{self.count} queries"'),
+        ]
+
+
+def compact_statement(statement: Optional[str]) -> Optional[str]:
+    """Statement on one line, cut to MAX_STATEMENT_LENGTH."""
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= MAX_STATEMENT_LENGTH else statement[:MAX_STATEMENT_LENGTH] + "..."
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request (or query_budget block) being handled, if any."""
+    return _current_stats.get()
+
+
+@contextmanager
+def collect_query_stats(stats: Optional[QueryStats] = None) -> Iterator[QueryStats]:
+    """Attribute the statements issued inside the block (and tasks it starts) to one QueryStats."""
+    stats = stats if stats is not None else QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _current_stats.get() is not None:
+        context._query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, (time.perf_counter() - started) * 1000)
+
+
+def install_query_stats(engine: AsyncEngine):
+    """Time every statement the engine executes; idempotent."""
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def env_flag(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    return default if value is None else value.lower() in ("1", "true", "yes", "on")
+
+
+class QueryStatsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        expose_headers: bool = False,
+        warn_queries: int = DEFAULT_WARN_QUERIES,
+        warn_db_ms: float = DEFAULT_WARN_DB_MS,
+    ):
+        self.app = app
+        self.expose_headers = expose_headers
+        self.warn_queries = warn_queries
+        self.warn_db_ms = warn_db_ms
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = None
+
+        with collect_query_stats() as stats:
+
+            async def send_with_stats(message: Message):
+                nonlocal status_code
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    if self.expose_headers:
+                        headers = MutableHeaders(scope=message)
+                        for name, value in stats.headers():
+                            headers.append(name, value)
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_stats)
+            finally:
+                self.log(scope, status_code, stats, (time.perf_counter() - started) * 1000)
+
+    def log(self, scope: Scope, status_code: Optional[int], stats: QueryStats, duration_ms: float):
+        if stats.count > self.warn_queries or stats.total_ms > self.warn_db_ms:
+            level = logging.WARNING
+        elif stats.count:
+            level = logging.INFO
+        else:
+            level = logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+
+        route = scope.get("route")
+        fields = {
+            "http_method": scope["method"],
+            "http_path": scope["path"],
+            # The route template groups requests by endpoint (/api/referrals/{referral_id})
+            "http_route": getattr(route, "path", None),
+            "http_status": status_code,
+            "duration_ms": round(duration_ms, 2),
+            **stats.log_fields(),
+        }
+        logger.log(
+            level,
+            f"{scope['method']} {scope['path']} {status_code}: {stats.count} queries, "
+            f"{stats.total_ms:.1f}ms in the database (slowest {stats.slowest_ms:.1f}ms)",
+            extra=fields,
+        )
+
+
+# Test helpers
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int, max_db_ms: Optional[float] = None) -> Iterator[QueryStats]:
+    """
+    Fail if the block issues more than max_queries statements (or spends more than max_db_ms in them).
+
+    For code called in-process (a query helper, an endpoint function awaited
+    directly); requests through TestClient run in another thread, so check
+    those with assert_query_budget.
+    """
+    with collect_query_stats(QueryStats(statements=[])) as stats:
+        yield stats
+    if stats.count > max_queries or (max_db_ms is not None and stats.total_ms > max_db_ms):
+        listing = "\n".join(f"  {index}. {compact_statement(sql)}" for index, sql in enumerate(stats.statements, 1))
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries in {stats.total_ms:.1f}ms, budget {max_queries} queries"
+            + (f" in {max_db_ms:g}ms" if max_db_ms is not None else "")
+            + f":\n{listing}"
+        )
+
+
+def assert_query_budget(response, max_queries: int, max_db_ms: Optional[float] = None):
+    """
+    Fail if a response's stats headers exceed an endpoint's query budget.
+
+    The app has to run with QUERY_STATS_HEADERS on; a response without the
+    headers fails too, rather than passing unchecked.
+    """
+    request = f"{response.request.method} {response.request.url.path}"
+    if QUERY_COUNT_HEADER not in response.headers:
+        raise QueryBudgetExceeded(f"{request}: no {QUERY_COUNT_HEADER} header (is QUERY_STATS_HEADERS on?)")
+    count = int(response.headers[QUERY_COUNT_HEADER])
+    db_ms = float(response.headers[QUERY_TIME_HEADER])
+    if count > max_queries:
+        raise QueryBudgetExceeded(f"{request}: {count} queries, budget {max_queries}")
+    if max_db_ms is not None and db_ms > max_db_ms:
+        raise QueryBudgetExceeded(f"{request}: {db_ms:.1f}ms in the database, budget {max_db_ms:g}ms")
@@ -0,0 +1,198 @@
+"""
+Refresh tokens with rotation and a revocation list.
+
+Logins return a short-lived access token plus a long-lived refresh token.
+POST /api/auth/jwt/refresh trades a refresh token for a new pair, so clients
+stay signed in with a signature check and one insert instead of another
+password hash.
+
+Refresh tokens are JWTs carrying:
+- jti: the token's own id; each token can be used once
+- fam: the family id, shared by every token descended from one login; the
+  family expires REFRESH_TOKEN_LIFETIME_SECONDS after the login, rotation
+  does not extend it
+- pwd: a fingerprint of the password hash, so a password change ends all
+  existing sessions without touching the revocation list
+
+Each refresh revokes the presented jti (refresh_token_revocations). Presenting
+an already-rotated token means it was copied, so the whole family is revoked
+and the legitimate holder has to log in again too.
+
+Revocations live in the database (shared by all workers); each process keeps
+the ids it has seen revoked in memory so replays are rejected without a query.
+Rows can be pruned once expires_at has passed (scripts/prune_refresh_token_revocations.py).
+"""
+
+import hashlib
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+import jwt
+from fastapi_users.jwt import decode_jwt, generate_jwt
+from sqlalchemy import and_, exists, literal, select
+from sqlalchemy.dialects.postgresql import UUID, insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.refresh_token_revocation import RefreshTokenRevocation
+from app.models.user import User
+
+REFRESH_TOKEN_AUDIENCE = ["referral-app:refresh"]
+DEFAULT_REFRESH_TOKEN_LIFETIME_SECONDS = 30 * 24 * 60 * 60
+DEFAULT_MAX_REMEMBERED_REVOCATIONS = 100_000
+
+REFRESH_TOKEN_LIFETIME_SECONDS = int(
+    os.getenv("REFRESH_TOKEN_LIFETIME_SECONDS", DEFAULT_REFRESH_TOKEN_LIFETIME_SECONDS)
+)
+
+
+def password_fingerprint(user: User) -> str:
+    """Short digest of the user's password hash; changes whenever the password does."""
+    return hashlib.sha256(user.hashed_password.encode()).hexdigest()[:16]
+
+
+@dataclass(frozen=True)
+class RefreshTokenClaims:
+    user_id: uuid.UUID
+    jti: uuid.UUID
+    family_id: uuid.UUID
+    expires_at: datetime
+    password_fingerprint: str
+
+
+def issue_refresh_token(user: User, secret: str, rotating: Optional[RefreshTokenClaims] = None) -> str:
+    """
+    New refresh token for the user.
+
+    On login (rotating=None) this starts a family that expires after
+    REFRESH_TOKEN_LIFETIME_SECONDS. Rotated tokens stay in the family and keep
+    its expiry, so a family revocation never has to outlive the family itself.
+    """
+    if rotating is None:
+        family_id = uuid.uuid4()
+        lifetime_seconds = REFRESH_TOKEN_LIFETIME_SECONDS
+    else:
+        family_id = rotating.family_id
+        lifetime_seconds = max(1, int(rotating.expires_at.timestamp() - time.time()))
+    data = {
+        "sub": str(user.id),
+        "aud": REFRESH_TOKEN_AUDIENCE,
+        "jti": str(uuid.uuid4()),
+        "fam": str(family_id),
+        "pwd": password_fingerprint(user),
+    }
+    return generate_jwt(data, secret, lifetime_seconds)
+
+
+def decode_refresh_token(token: str, secret: str) -> Optional[RefreshTokenClaims]:
+    """Claims of a validly signed, unexpired refresh token, or None."""
+    try:
+        data = decode_jwt(token, secret, REFRESH_TOKEN_AUDIENCE)
+        return RefreshTokenClaims(
+            user_id=uuid.UUID(data["sub"]),
+            jti=uuid.UUID(data["jti"]),
+            family_id=uuid.UUID(data["fam"]),
+            expires_at=datetime.fromtimestamp(data["exp"], tz=timezone.utc),
+            password_fingerprint=data["pwd"],
+        )
+    except (jwt.PyJWTError, KeyError, TypeError, ValueError):
+        return None
+
+
+class RevocationList:
+    def __init__(self, max_remembered: int = DEFAULT_MAX_REMEMBERED_REVOCATIONS):
+        self.max_remembered = max_remembered
+        # Revoked jtis and family ids seen by this process -> token expiry (unix time)
+        self._revoked: dict = {}
+
+    def is_known_revoked(self, claims: RefreshTokenClaims) -> bool:
+        return claims.jti in self._revoked or claims.family_id in self._revoked
+
+    def _remember(self, token_id: uuid.UUID, expires_at: datetime):
+        if len(self._revoked) >= self.max_remembered:
+            now = time.time()
+            self._revoked = {key: expiry for key, expiry in self._revoked.items() if expiry > now}
+            if len(self._revoked) >= self.max_remembered:
+                # Still full of live entries: forget the oldest; the database remains authoritative
+                del self._revoked[next(iter(self._revoked))]
+        self._revoked[token_id] = expires_at.timestamp()
+
+    async def rotate(self, db: AsyncSession, claims: RefreshTokenClaims) -> bool:
+        """
+        Revoke the presented token so it cannot be used again.
+
+        Returns False if the token (or its family) was already revoked; in that
+        case the family is revoked as a whole. Commits the session.
+        """
+        if self.is_known_revoked(claims):
+            await self.revoke_family(db, claims)
+            return False
+
+        # Single statement: record the jti unless it is already recorded or its family is revoked
+        family_revoked = exists().where(
+            and_(
+                RefreshTokenRevocation.family_id == claims.family_id,
+                RefreshTokenRevocation.jti.is_(None),
+            )
+        )
+        row = select(
+            literal(uuid.uuid4(), UUID(as_uuid=True)),
+            literal(claims.jti, UUID(as_uuid=True)),
+            literal(claims.family_id, UUID(as_uuid=True)),
+            literal(claims.user_id, UUID(as_uuid=True)),
+            literal(claims.expires_at),
+        ).where(~family_revoked)
+        statement = (
+            pg_insert(RefreshTokenRevocation)
+            .from_select(
+                [
+                    RefreshTokenRevocation.id,
+                    RefreshTokenRevocation.jti,
+                    RefreshTokenRevocation.family_id,
+                    RefreshTokenRevocation.user_id,
+                    RefreshTokenRevocation.expires_at,
+                ],
+                row,
+            )
+            .on_conflict_do_nothing(index_elements=[RefreshTokenRevocation.jti])
+            .returning(RefreshTokenRevocation.id)
+        )
+        inserted = (await db.execute(statement)).scalar_one_or_none()
+        if inserted is None:
+            await self.revoke_family(db, claims)
+            return False
+
+        await db.commit()
+        self._remember(claims.jti, claims.expires_at)
+        return True
+
+    async def revoke_family(self, db: AsyncSession, claims: RefreshTokenClaims):
+        """Revoke every token descended from the same login. Commits the session."""
+        statement = (
+            pg_insert(RefreshTokenRevocation)
+            .values(
+                id=uuid.uuid4(),
+                jti=None,
+                family_id=claims.family_id,
+                user_id=claims.user_id,
+                expires_at=claims.expires_at,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[RefreshTokenRevocation.family_id],
+                index_where=RefreshTokenRevocation.jti.is_(None),
+            )
+        )
+        await db.execute(statement)
+        await db.commit()
+        self._remember(claims.family_id, claims.expires_at)
+
+    def clear(self):
+        self._revoked.clear()
+
+
+revocation_list = RevocationList(
+    max_remembered=int(os.getenv("REFRESH_TOKEN_MAX_REMEMBERED_REVOCATIONS", DEFAULT_MAX_REMEMBERED_REVOCATIONS)),
+)
@@ -36,6 +36,20 @@ class UserUpdate(schemas.BaseUserUpdate):
     npi: Optional[str] = None
 
 
+class TokenPairRead(BaseModel):
+    """Schema for login and refresh responses: an access token plus the refresh token to renew it."""
+
+    access_token: str
+    refresh_token: str
+    token_type: Literal["bearer"] = "bearer"
+
+
+class RefreshTokenRequest(BaseModel):
+    """Schema for exchanging or revoking a refresh token."""
+
+    refresh_token: str
+
+
 # Patient schemas
 
 
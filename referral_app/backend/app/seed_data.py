@@ -1,20 +1,32 @@
 """
 Seed script to populate the database with sample data.
+
+Run from backend/ with: python -m app.seed_data
+(For production-sized synthetic data, use python -m loadtest seed.)
 """
 
-from database import SessionLocal
-from models.provider import Provider
-from models.provider_institution import ProviderInstitution
-from models.address import Address
+import asyncio
+
+from sqlalchemy import func, select
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.database import AsyncSessionLocal
+from app.models.address import Address
+from app.models.provider import Provider
+from app.models.provider_institution import ProviderInstitution
+
 
-def seed_providers():
+async def seed_providers():
     """Seed the database with sample providers and institutions."""
-    db = SessionLocal()
+    async with AsyncSessionLocal() as db:
+        await seed_session(db)
+
+
+async def seed_session(db):
+    """Insert the sample rows through an open session, unless providers exist already."""
     try:
         # Check if data already exists
-        existing_count = db.query(Provider).count()
+        existing_count = (await db.execute(select(func.count()).select_from(Provider))).scalar_one()
         if existing_count > 0:
             print(f"Database already has {existing_count} providers. Skipping seed.")
             return
@@ -70,7 +82,7 @@ def seed_providers():
             db.add(address)
             addresses.append(address)
 
-        db.commit()
+        await db.commit()
         print(f"Created {len(addresses)} addresses")
 
         # Sample provider institutions
@@ -96,7 +108,7 @@ def seed_providers():
             db.add(institution)
             institutions.append(institution)
 
-        db.commit()
+        await db.commit()
         print(f"Created {len(institutions)} provider institutions")
 
         # Sample providers
@@ -179,17 +191,15 @@ def seed_providers():
             )
             db.add(provider)
 
-        db.commit()
+        await db.commit()
         print(f"Successfully created {len(providers_data)} providers")
 
     except (SQLAlchemyError, KeyError, ValueError, AttributeError) as e:
         print(f"Error seeding database: {e}")
-        db.rollback()
-    finally:
-        db.close()
+        await db.rollback()
 
 
 if __name__ == "__main__":
     print("Starting database seed...")
-    seed_providers()
+    asyncio.run(seed_providers())
     print("Seed complete!")
@@ -0,0 +1,83 @@
+"""
+OpenTelemetry tracing.
+
+Off unless OTEL_TRACES_EXPORTER names an exporter:
+
+- otlp: OTLP over HTTP to OTEL_EXPORTER_OTLP_ENDPOINT (default
+  http://localhost:4318, a local collector or Jaeger all-in-one)
+- console: spans printed to stdout, for a quick look without a collector
+
+With an exporter configured, configure_tracing instruments the FastAPI
+routes (one server span per request, continuing an incoming traceparent),
+every SQLAlchemy statement, and httpx clients (Documo downloads, with the
+trace context propagated). Calls through app.metrics.external_call (Cloud
+Storage, Gmail, Documo, Document AI) get a span of their own, and
+app.metrics.run_in_executor carries the request's trace context onto the
+password hashing pool. asyncio tasks and Starlette's threadpool copy the
+context themselves, so work started from a request joins its trace.
+
+The standard OTEL_SERVICE_NAME, OTEL_TRACES_SAMPLER and OTEL_TRACES_SAMPLER_ARG
+variables are honoured (the default samples every trace).
+"""
+
+import logging
+import os
+
+from fastapi import FastAPI
+from opentelemetry import trace
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SERVICE_NAME = "referral-app-api"
+# Polled constantly and never interesting
+EXCLUDED_URLS = "/metrics,/api/health"
+
+tracer = trace.get_tracer("app")
+
+
+def build_span_exporter(name: str):
+    if name == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    if name == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    raise ValueError(f"Unsupported OTEL_TRACES_EXPORTER: {name} (expected otlp, console or none)")
+
+
+def configure_tracing(app: FastAPI, engine: AsyncEngine) -> bool:
+    """Install the tracer provider and instrumentation if an exporter is configured; True if it was."""
+    exporter_name = os.getenv("OTEL_TRACES_EXPORTER", "none").lower()
+    if exporter_name == "none":
+        return False
+
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
+    from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    resource = Resource.create(
+        {
+            "service.name": os.getenv("OTEL_SERVICE_NAME", DEFAULT_SERVICE_NAME),
+            "deployment.environment": os.getenv("ENVIRONMENT", "local"),
+        }
+    )
+    provider = TracerProvider(resource=resource)
+    # Spans are exported from a background thread in batches, off the request path
+    provider.add_span_processor(BatchSpanProcessor(build_span_exporter(exporter_name)))
+    trace.set_tracer_provider(provider)
+
+    # Without the per-message ASGI receive/send spans, which only add noise under each request
+    FastAPIInstrumentor.instrument_app(
+        app, tracer_provider=provider, excluded_urls=EXCLUDED_URLS, exclude_spans=["receive", "send"]
+    )
+    SQLAlchemyInstrumentor().instrument(engine=engine.sync_engine, tracer_provider=provider)
+    HTTPXClientInstrumentor().instrument(tracer_provider=provider)
+
+    logger.info(f"Tracing enabled, exporting spans with {exporter_name}")
+    return True
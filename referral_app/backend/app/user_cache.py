@@ -0,0 +1,76 @@
+"""
+Short-lived cache of active users, so authenticated requests don't load the
+user row on every call.
+
+Entries are column snapshots keyed by user id, kept for USER_CACHE_TTL_SECONDS
+and evicted least recently used beyond USER_CACHE_MAX_USERS. Each lookup
+rebuilds a detached User from the snapshot, so requests never share an ORM
+instance and an endpoint can still add the user to its session and update it.
+
+The cache is per process. Changes made through this process (profile
+updates, password resets, verification, deletion, admin edits) invalidate
+the entry immediately; changes made elsewhere (another worker, a script)
+are picked up once the entry expires.
+
+Cached users are not a source of fresh network_version values; use
+app.etags.current_user_versions for those.
+"""
+
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.models.user import User
+
+DEFAULT_TTL_SECONDS = 60
+DEFAULT_MAX_USERS = 10_000
+
+USER_COLUMNS = [column.key for column in inspect(User).column_attrs]
+
+
+class UserCache:
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_users: int = DEFAULT_MAX_USERS):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        # user_id -> (expires_at, column values), least recently used first
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, user_id: uuid.UUID) -> Optional[User]:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        expires_at, values = entry
+        if expires_at <= time.monotonic():
+            del self._entries[user_id]
+            return None
+        self._entries.move_to_end(user_id)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def set(self, user: User):
+        if self.ttl_seconds <= 0:
+            return
+        values = {key: getattr(user, key) for key in USER_COLUMNS}
+        self._entries[user.id] = (time.monotonic() + self.ttl_seconds, values)
+        self._entries.move_to_end(user.id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: uuid.UUID):
+        self._entries.pop(user_id, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+user_cache = UserCache(
+    ttl_seconds=float(os.getenv("USER_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS)),
+    max_users=int(os.getenv("USER_CACHE_MAX_USERS", DEFAULT_MAX_USERS)),
+)
@@ -8,7 +8,20 @@ from atlas_provider_sqlalchemy.ddl import print_ddl
 from app.database import Base
 
 # Import all models to ensure they're registered with Base
-from app.models import Address, Provider, ProviderInstitution, User, Patient, Referral, Insurance, UserProviderNetwork
+from app.models import (
+    Address,
+    Provider,
+    ProviderInstitution,
+    User,
+    Patient,
+    Referral,
+    ReferralDocument,
+    Insurance,
+    UserProviderNetwork,
+    ZipCentroid,
+    DirectoryVersion,
+    RefreshTokenRevocation,
+)
 
 # Get all model classes from Base
 models = [mapper.class_ for mapper in Base.registry.mappers]
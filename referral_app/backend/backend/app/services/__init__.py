@@ -11,12 +11,14 @@ from .document_ai_schemas import (
     ReferralTargetInfo,
 )
 from .document_ai_service import (
+    build_docai_document,
     get_document_ai_client,
     process_referral_document,
     validate_pdf,
 )
 
 __all__ = [
+    "build_docai_document",
     "get_document_ai_client",
     "process_referral_document",
     "validate_pdf",
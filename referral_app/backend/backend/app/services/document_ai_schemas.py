@@ -4,6 +4,8 @@ from datetime import date
 
 from pydantic import BaseModel, ConfigDict, Field
 
+from .normalization import extract_icd10_codes, parse_date, parse_name
+
 # ============================================================================
 # Document AI Raw Structure Models (match the API response exactly)
 # ============================================================================
@@ -188,41 +190,6 @@ class ExtractedReferralData(BaseModel):
         Returns:
             Clean ExtractedReferralData model
         """
-        import re
-        from datetime import datetime
-
-        def parse_date(date_str: str | None) -> date | None:
-            """Parse date string in various formats."""
-            if not date_str:
-                return None
-            for fmt in ["%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y", "%m-%d-%Y", "%Y/%m/%d"]:
-                try:
-                    return datetime.strptime(date_str, fmt).date()
-                except ValueError:
-                    continue
-            return None
-
-        def parse_name(full_name: str | None) -> tuple[str | None, str | None]:
-            """Parse full name into first and last name."""
-            if not full_name:
-                return None, None
-            if "," in full_name:
-                parts = full_name.split(",", 1)
-                last_name = parts[0].strip()
-                first_name = parts[1].strip() if len(parts) > 1 else None
-                return first_name, last_name
-            parts = full_name.strip().split()
-            if len(parts) >= 2:
-                return parts[0], " ".join(parts[1:])
-            return None, full_name
-
-        def extract_icd10_codes(text: str | None) -> list[str]:
-            """Extract ICD-10 codes from text."""
-            if not text:
-                return []
-            pattern = r"\b[A-Z]\d{2}(?:\.\d{1,2})?\b"
-            return list(set(re.findall(pattern, text)))
-
         # Parse patient
         first_name, last_name = parse_name(doc.patient.name if doc.patient else None)
         patient_dob = parse_date(doc.patient.date_of_birth if doc.patient else None)
@@ -4,17 +4,40 @@ import asyncio
 import json
 import logging
 import os
-import re
-from datetime import date, datetime
 
 from google.api_core.client_options import ClientOptions
 from google.cloud import documentai
 from google.oauth2 import service_account
 
-from .document_ai_schemas import DocAIReferralDocument, ExtractedReferralData
+from .document_ai_schemas import (
+    DocAIInsurance,
+    DocAIPatient,
+    DocAIProvider,
+    DocAIReferralDocument,
+    ExtractedReferralData,
+)
 
 logger = logging.getLogger(__name__)
 
+# Top-level entity types that carry nested properties, with the fields each model accepts
+_NESTED_ENTITY_MODELS = {
+    entity_type: (model, frozenset(model.model_fields))
+    for entity_type, model in {
+        "patient": DocAIPatient,
+        "originating_provider": DocAIProvider,
+        "referred_provider": DocAIProvider,
+        "primary_insurance": DocAIInsurance,
+        "secondary_insurance": DocAIInsurance,
+    }.items()
+}
+
+# Top-level entity types that map to a flat text field
+_SCALAR_ENTITY_FIELDS = frozenset(DocAIReferralDocument.model_fields) - {
+    *_NESTED_ENTITY_MODELS,
+    "raw_text",
+    "confidence_score",
+}
+
 
 def get_document_ai_credentials() -> service_account.Credentials | None:
     """Load credentials from service account file for Document AI API.
@@ -103,36 +126,6 @@ def validate_pdf(file_content: bytes) -> tuple[bool, str]:
     return False, "File format not supported. Use PDF, JPEG, or PNG."
 
 
-def parse_date(date_str: str | None) -> date | None:
-    """Parse date string in various formats.
-
-    Args:
-        date_str: Date string to parse
-
-    Returns:
-        Parsed date object or None if parsing fails
-    """
-    if not date_str:
-        return None
-
-    # Try common date formats
-    date_formats = [
-        "%m/%d/%Y",
-        "%Y-%m-%d",
-        "%d/%m/%Y",
-        "%m-%d-%Y",
-        "%Y/%m/%d",
-    ]
-
-    for fmt in date_formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except ValueError:
-            continue
-
-    return None
-
-
 def extract_entities_as_json(document: documentai.Document) -> dict:
     """Convert Document AI entities to nested JSON structure.
 
@@ -191,49 +184,62 @@ def extract_entities_as_json(document: documentai.Document) -> dict:
     return result
 
 
-def parse_name(full_name: str | None) -> tuple[str | None, str | None]:
-    """Parse full name into first and last name.
+def _entity_text(entity) -> str:
+    """Return the normalized text of a raw protobuf entity, falling back to its mention text."""
+    return entity.normalized_value.text or entity.mention_text
+
+
+def build_docai_document(document: documentai.Document) -> DocAIReferralDocument:
+    """Build the raw Document AI model directly from the entity tree.
+
+    Walks the underlying protobuf entities once (skipping the proto-plus
+    wrappers, whose attribute access dominates the cost of post-processing),
+    filling the nested Pydantic models with ``model_construct`` instead of
+    building an intermediate dict and re-validating it. Only fields declared
+    on the models are read; the first occurrence of a repeated entity or
+    property wins.
 
     Args:
-        full_name: Full name string (e.g., "OLAGBEGI, ADEDOYIN" or "John Doe")
+        document: Document AI processed document
 
     Returns:
-        Tuple of (first_name, last_name)
+        Document AI raw structure model
     """
-    if not full_name:
-        return None, None
+    document_pb = documentai.Document.pb(document)
+    values: dict = {}
+    confidence_total = 0.0
+    confidence_count = 0
 
-    # Handle "LAST, FIRST" format
-    if "," in full_name:
-        parts = full_name.split(",", 1)
-        last_name = parts[0].strip()
-        first_name = parts[1].strip() if len(parts) > 1 else None
-        return first_name, last_name
+    for entity in document_pb.entities:
+        confidence = entity.confidence
+        if confidence > 0:
+            confidence_total += confidence
+            confidence_count += 1
 
-    # Handle "FIRST LAST" format
-    parts = full_name.strip().split()
-    if len(parts) >= 2:
-        first_name = parts[0]
-        last_name = " ".join(parts[1:])
-        return first_name, last_name
+        key = entity.type_
+        if key in values:
+            continue
 
-    # Single name
-    return None, full_name
+        nested = _NESTED_ENTITY_MODELS.get(key)
+        if nested is not None:
+            model, fields = nested
+            properties = entity.properties
+            if not properties:
+                continue
+            nested_values = {}
+            for prop in properties:
+                prop_key = prop.type_
+                if prop_key in fields and prop_key not in nested_values:
+                    nested_values[prop_key] = _entity_text(prop)
+            values[key] = model.model_construct(**nested_values)
+        elif key in _SCALAR_ENTITY_FIELDS:
+            values[key] = _entity_text(entity)
 
+    values["raw_text"] = document_pb.text
+    if confidence_count:
+        values["confidence_score"] = confidence_total / confidence_count
 
-def extract_icd10_codes(text: str) -> list[str]:
-    """Extract ICD-10 codes from text using regex.
-
-    Args:
-        text: Text to search for ICD-10 codes
-
-    Returns:
-        List of unique ICD-10 codes found
-    """
-    # ICD-10 pattern: Letter followed by 2-5 digits with optional decimal
-    pattern = r"\b[A-Z]\d{2}(?:\.\d{1,2})?\b"
-    matches = re.findall(pattern, text)
-    return list(set(matches))  # Return unique codes
+    return DocAIReferralDocument.model_construct(**values)
 
 
 def parse_document_ai_response(
@@ -241,8 +247,8 @@ def parse_document_ai_response(
 ) -> ExtractedReferralData:
     """Parse Document AI response into structured Pydantic model.
 
-    Uses automatic Pydantic validation to convert the nested entity
-    structure from Document AI into our clean data model.
+    Builds the nested entity models in a single pass over the document and
+    converts them into our clean data model.
 
     Args:
         document: Document AI processed document
@@ -250,21 +256,7 @@ def parse_document_ai_response(
     Returns:
         Extracted referral data as Pydantic model
     """
-    # Convert entities to JSON structure
-    entities_json = extract_entities_as_json(document)
-
-    # Add raw text and confidence score
-    entities_json["raw_text"] = document.text
-    if document.entities:
-        confidences = [e.confidence for e in document.entities if e.confidence > 0]
-        if confidences:
-            entities_json["confidence_score"] = sum(confidences) / len(confidences)
-
-    # Use Pydantic to validate and parse the JSON structure
-    doc_ai_model = DocAIReferralDocument.model_validate(entities_json)
-
-    # Convert to clean output format
-    return ExtractedReferralData.from_docai_document(doc_ai_model)
+    return ExtractedReferralData.from_docai_document(build_docai_document(document))
 
 
 async def process_referral_document(file_content: bytes, mime_type: str = "application/pdf") -> ExtractedReferralData:
@@ -0,0 +1,96 @@
+"""Shared normalization helpers for Document AI extracted values.
+
+Patterns are compiled once at import time so the per-document post-processing
+only pays for matching, not for regex compilation.
+"""
+
+import re
+from datetime import date
+
+# Numeric dates with a single consistent separator: "01/31/2024", "2024-01-31", "1-31-2024"
+DATE_PATTERN = re.compile(r"^(\d{1,4})([/-])(\d{1,2})\2(\d{1,4})$")
+
+# ICD-10 pattern: Letter followed by 2 digits with optional 1-2 digit decimal
+ICD10_PATTERN = re.compile(r"\b[A-Z]\d{2}(?:\.\d{1,2})?\b")
+
+
+def parse_date(date_str: str | None) -> date | None:
+    """Parse date string in various formats.
+
+    Accepts the same formats as the previous sequential ``strptime`` attempts
+    (``%m/%d/%Y``, ``%Y-%m-%d``, ``%d/%m/%Y``, ``%m-%d-%Y``, ``%Y/%m/%d``), in the
+    same order of preference, with a single regex match.
+
+    Args:
+        date_str: Date string to parse
+
+    Returns:
+        Parsed date object or None if parsing fails
+    """
+    if not date_str:
+        return None
+
+    match = DATE_PATTERN.match(date_str)
+    if not match:
+        return None
+
+    first, separator, middle, last = match.groups()
+
+    if len(first) == 4 and len(last) <= 2:
+        # %Y-%m-%d or %Y/%m/%d
+        candidates = [(first, middle, last)]
+    elif len(last) == 4 and len(first) <= 2:
+        # %m/%d/%Y, falling back to %d/%m/%Y; dashes only support %m-%d-%Y
+        candidates = [(last, first, middle)]
+        if separator == "/":
+            candidates.append((last, middle, first))
+    else:
+        return None
+
+    for year, month, day in candidates:
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            continue
+
+    return None
+
+
+def parse_name(full_name: str | None) -> tuple[str | None, str | None]:
+    """Parse full name into first and last name.
+
+    Args:
+        full_name: Full name string (e.g., "OLAGBEGI, ADEDOYIN" or "John Doe")
+
+    Returns:
+        Tuple of (first_name, last_name)
+    """
+    if not full_name:
+        return None, None
+
+    # Handle "LAST, FIRST" format
+    if "," in full_name:
+        last_name, first_name = full_name.split(",", 1)
+        return first_name.strip(), last_name.strip()
+
+    # Handle "FIRST LAST" format
+    parts = full_name.split()
+    if len(parts) >= 2:
+        return parts[0], " ".join(parts[1:])
+
+    # Single name
+    return None, full_name
+
+
+def extract_icd10_codes(text: str | None) -> list[str]:
+    """Extract ICD-10 codes from text.
+
+    Args:
+        text: Text to search for ICD-10 codes
+
+    Returns:
+        List of unique ICD-10 codes found, in order of first appearance
+    """
+    if not text:
+        return []
+    return list(dict.fromkeys(ICD10_PATTERN.findall(text)))
@@ -0,0 +1,158 @@
+"""Benchmark Document AI post-processing over a corpus of synthetic documents.
+
+Compares the previous dict-then-validate path against the single-pass
+entity builder, and sequential strptime date parsing against the shared
+precompiled parser.
+
+Usage: python benchmark_document_ai.py [document_count]
+"""
+
+import random
+import sys
+import time
+from datetime import datetime
+
+from google.cloud import documentai
+
+from app.services.document_ai_schemas import DocAIReferralDocument, ExtractedReferralData
+from app.services.document_ai_service import build_docai_document, extract_entities_as_json
+from app.services.normalization import parse_date
+
+Entity = documentai.Document.Entity
+
+LEGACY_DATE_FORMATS = ["%m/%d/%Y", "%Y-%m-%d", "%d/%m/%Y", "%m-%d-%Y", "%Y/%m/%d"]
+
+
+def legacy_parse_date(date_str):
+    """Previous implementation: try each strptime format in sequence."""
+    if not date_str:
+        return None
+    for fmt in LEGACY_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_str, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def legacy_build(document):
+    """Previous implementation: build a dict, then let Pydantic re-validate it."""
+    entities_json = extract_entities_as_json(document)
+    entities_json["raw_text"] = document.text
+    confidences = [e.confidence for e in document.entities if e.confidence > 0]
+    if confidences:
+        entities_json["confidence_score"] = sum(confidences) / len(confidences)
+    return DocAIReferralDocument.model_validate(entities_json)
+
+
+def random_date(rng: random.Random) -> str:
+    """Return a date string in one of the formats seen on faxed referrals."""
+    year, month, day = rng.randint(1930, 2020), rng.randint(1, 12), rng.randint(1, 28)
+    return rng.choice(
+        [
+            f"{month:02d}/{day:02d}/{year}",
+            f"{year}-{month:02d}-{day:02d}",
+            f"{day:02d}/{month:02d}/{year}",
+            f"{month:02d}-{day:02d}-{year}",
+            f"{year}/{month:02d}/{day:02d}",
+        ]
+    )
+
+
+def nested(entity_type: str, rng: random.Random, **properties: str) -> Entity:
+    return Entity(
+        type_=entity_type,
+        confidence=rng.uniform(0.5, 1.0),
+        properties=[
+            Entity(type_=key, mention_text=value, confidence=rng.uniform(0.5, 1.0)) for key, value in properties.items()
+        ],
+    )
+
+
+def make_document(rng: random.Random) -> documentai.Document:
+    """Build a synthetic referral order shaped like the custom extractor output."""
+    codes = ", ".join(
+        f"{rng.choice('MSGR')}{rng.randint(10, 99)}.{rng.randint(0, 9)}" for _ in range(rng.randint(1, 4))
+    )
+    entities = [
+        nested(
+            "patient",
+            rng,
+            name=f"PATIENT{rng.randint(1, 9999)}, JANE",
+            id=f"MRN{rng.randint(100000, 999999)}",
+            date_of_birth=random_date(rng),
+            age=str(rng.randint(1, 99)),
+            sex=rng.choice(["F", "M"]),
+            address="123 Main St, Bethesda, MD 20817",
+            phone="301-555-0100",
+        ),
+        nested(
+            "originating_provider",
+            rng,
+            name="MANCUSO, JOHN",
+            facility_name="Grove Orthopedics",
+            address="5454 Wisconsin Ave #1700, Chevy Chase, MD 20815",
+            phone="301-555-0101",
+            fax="301-555-0102",
+            electronically_signed_by="JOHN MANCUSO MD",
+        ),
+        nested("referred_provider", rng, name="PHYSICAL THERAPY", facility_name="Pivot PT", phone="301-555-0103"),
+        nested("primary_insurance", rng, plan_name="BCBS", id="XYZ123456", group_number="G100", policy_holder="SELF"),
+        Entity(type_="diagnosis", mention_text=f"Low back pain ICD {codes}", confidence=rng.uniform(0.5, 1.0)),
+        Entity(
+            type_="order_details",
+            mention_text="PHYSICAL THERAPIST REFERRAL Schedule Within: 2 weeks",
+            confidence=rng.uniform(0.5, 1.0),
+        ),
+        Entity(type_="order_name", mention_text="1", confidence=rng.uniform(0.5, 1.0)),
+        Entity(type_="notes", mention_text="Evaluate and treat", confidence=rng.uniform(0.5, 1.0)),
+        Entity(type_="referral_date", mention_text=random_date(rng), confidence=rng.uniform(0.5, 1.0)),
+    ]
+    return documentai.Document(text="REFERRAL ORDER " * 200, entities=entities)
+
+
+def timed(label: str, func, items) -> float:
+    start = time.perf_counter()
+    for item in items:
+        func(item)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {elapsed * 1000:9.1f} ms  ({len(items) / elapsed:,.0f}/s)")
+    return elapsed
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+
+    print(f"Building {count} synthetic documents...")
+    documents = [make_document(rng) for _ in range(count)]
+    dates = [random_date(rng) for _ in range(count * 10)]
+
+    # Sanity check: both paths must produce identical output
+    for document in documents[:100]:
+        legacy = ExtractedReferralData.from_docai_document(legacy_build(document))
+        current = ExtractedReferralData.from_docai_document(build_docai_document(document))
+        assert legacy.model_dump() == current.model_dump()
+    for date_str in dates[:1000]:
+        assert legacy_parse_date(date_str) == parse_date(date_str)
+
+    print("\nEntity conversion:")
+    before = timed("dict + model_validate", legacy_build, documents)
+    after = timed("build_docai_document", build_docai_document, documents)
+    print(f"  speedup: {before / after:.2f}x")
+
+    print("\nDate parsing:")
+    before = timed("sequential strptime", legacy_parse_date, dates)
+    after = timed("precompiled parse_date", parse_date, dates)
+    print(f"  speedup: {before / after:.2f}x")
+
+    print("\nEnd to end:")
+    before = timed("legacy", lambda d: ExtractedReferralData.from_docai_document(legacy_build(d)), documents)
+    after = timed(
+        "single pass", lambda d: ExtractedReferralData.from_docai_document(build_docai_document(d)), documents
+    )
+    print(f"  speedup: {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
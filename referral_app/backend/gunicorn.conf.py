@@ -0,0 +1,25 @@
+"""
+Gunicorn settings, read from the working directory (app.yaml starts gunicorn in backend/).
+
+Prometheus metrics are kept per worker process in PROMETHEUS_MULTIPROC_DIR and
+aggregated by /metrics (app/metrics.py). The variable is set here, in the
+master, so every worker inherits it before it imports prometheus_client.
+"""
+
+import os
+import shutil
+
+PROMETHEUS_MULTIPROC_DIR = os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/prometheus-multiproc")
+
+
+def on_starting(server):
+    # Files left by a previous master would be added to the new counters
+    shutil.rmtree(PROMETHEUS_MULTIPROC_DIR, ignore_errors=True)
+    os.makedirs(PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    # Drop the exited worker's live gauges (in-flight requests, pool, executors) from the sums
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,24 @@
+"""
+Load test harness for the API.
+
+With docker-compose, from referral_app/: make loadtest-seed, make loadtest-stubs,
+then make loadtest (the backend's .env needs the API settings below). By hand,
+against the docker-compose Postgres (run from backend/):
+
+    docker-compose up -d postgres                       # from referral_app/
+    atlas migrate apply --env local                      # or: make migrate-apply
+    python -m loadtest seed --scale 1
+    python -m loadtest stubs &                           # Documo and Cloud Storage stand-ins
+    EMAIL_DELIVERY=log DOCUMO_API_BASE_URL=http://localhost:8089/v1 \\
+        STORAGE_EMULATOR_HOST=http://localhost:8089 \\
+        DOCUMO_WEBHOOK_USERNAME=loadtest DOCUMO_WEBHOOK_PASSWORD=loadtest \\
+        uvicorn app.main:app --port 8000
+    python -m loadtest run --users 20 --duration 60 --output reports/$(git rev-parse --short HEAD).json
+    python -m loadtest compare reports/<before>.json reports/<after>.json
+
+For production-sized data, scale up and build addresses in parallel:
+--scale 200 --workers 8 gives 1M providers, 400k patients and 1M referrals.
+
+See dataset.py for the generated data, scenarios.py for the request mix and
+runner.py for the report format.
+"""
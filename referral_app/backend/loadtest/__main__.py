@@ -0,0 +1,132 @@
+"""
+Command line entry point: python -m loadtest {seed,run,stubs,compare}.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+from loadtest.dataset import BATCH_SIZE, DEFAULT_PASSWORD, Scale
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger("loadtest")
+
+
+async def seed(args):
+    from app.database import AsyncSessionLocal
+    from app.models.directory_version import deferred_directory_version
+    from loadtest.dataset import DatasetGenerator, already_seeded, summarize, write_dataset
+
+    async with AsyncSessionLocal() as session, deferred_directory_version(session):
+        if await already_seeded(session):
+            sys.exit("The database already holds load test data; reset it first (make db-reset)")
+
+        generator = DatasetGenerator(
+            Scale.scaled(args.scale), seed=args.seed, password=args.password, batch_size=args.batch_size
+        )
+        started = time.perf_counter()
+        counts = await write_dataset(session, generator, workers=args.workers)
+        logger.info(f"Seeded {summarize(counts)} in {time.perf_counter() - started:.1f}s")
+
+
+async def run(args):
+    from loadtest.runner import RunOptions, format_report, run_load_test
+    from loadtest.scenarios import ScenarioConfig, select_scenarios
+
+    weights = {}
+    for item in args.weight or []:
+        name, _, weight = item.partition("=")
+        weights[name] = int(weight)
+
+    options = RunOptions(
+        base_url=args.base_url,
+        users=args.users,
+        seeded_users=Scale.scaled(args.scale).users,
+        password=args.password,
+        duration=args.duration,
+        warmup=args.warmup,
+        seed=args.seed,
+        scenarios=select_scenarios(args.scenario, weights),
+        config=ScenarioConfig(webhook_username=args.webhook_username, webhook_password=args.webhook_password),
+        label=args.label,
+    )
+    report = await run_load_test(options)
+    print(format_report(report))
+    if args.output:
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(report, indent=2) + "\n")
+        logger.info(f"Report written to {output}")
+
+
+def compare(args):
+    from loadtest.runner import compare_reports
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    print(compare_reports(baseline, candidate))
+
+
+def parse_args():
+    from loadtest.scenarios import SCENARIOS
+
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="API load test harness.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = commands.add_parser("seed", help="Generate synthetic data into the database")
+    seed_parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for the row counts in dataset.Scale")
+    seed_parser.add_argument("--seed", type=int, default=0, help="Random seed (same seed and scale, same data)")
+    seed_parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password of the generated users")
+    seed_parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Rows per COPY")
+    seed_parser.add_argument(
+        "--workers", type=int, default=1, help="Processes building address rows (hashing them dominates)"
+    )
+
+    run_parser = commands.add_parser("run", help="Run the scenarios against a running API")
+    run_parser.add_argument("--base-url", default="http://localhost:8000")
+    run_parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users")
+    run_parser.add_argument("--duration", type=float, default=60, help="Measured seconds")
+    run_parser.add_argument("--warmup", type=float, default=10, help="Unmeasured seconds before measuring")
+    run_parser.add_argument("--scale", type=float, default=1.0, help="Scale the database was seeded with")
+    run_parser.add_argument("--seed", type=int, default=0, help="Random seed for the request mix")
+    run_parser.add_argument("--password", default=DEFAULT_PASSWORD)
+    run_parser.add_argument(
+        "--scenario", action="append", choices=sorted(SCENARIOS), help="Only run these (repeatable)"
+    )
+    run_parser.add_argument("--weight", action="append", metavar="NAME=WEIGHT", help="Override a scenario weight")
+    run_parser.add_argument("--webhook-username", default="loadtest", help="DOCUMO_WEBHOOK_USERNAME of the API")
+    run_parser.add_argument("--webhook-password", default="loadtest", help="DOCUMO_WEBHOOK_PASSWORD of the API")
+    run_parser.add_argument("--label", help="Name of the run in the report (default: the git commit)")
+    run_parser.add_argument("--output", help="Write the JSON report here")
+
+    stubs_parser = commands.add_parser("stubs", help="Serve the Documo and Cloud Storage stand-ins")
+    stubs_parser.add_argument("--port", type=int, default=8089)
+    stubs_parser.add_argument("--latency-ms", type=float, default=50, help="Delay added to every stub response")
+
+    compare_parser = commands.add_parser("compare", help="Compare two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == "seed":
+        asyncio.run(seed(args))
+    elif args.command == "run":
+        asyncio.run(run(args))
+    elif args.command == "stubs":
+        from loadtest.stubs import serve_stubs
+
+        serve_stubs(port=args.port, latency_ms=args.latency_ms)
+    else:
+        compare(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,538 @@
+"""
+Synthetic dataset for load tests, at up to production scale.
+
+Generates users (each with their own institution and a network), global
+providers and institutions with addresses, patients with insurance, and
+referrals. Everything is a function of --seed, --scale and the row index: ids
+are hashed from (seed, table, index), each table draws from its own seeded
+generator, and addresses, NPIs and MRNs are unique by construction rather than
+by remembering what was generated. The same --seed and --scale therefore always
+produce the same data, and no table is ever held in memory.
+
+Rows are streamed in batches and written with COPY (asyncpg
+copy_records_to_table), one table at a time, parents before children.
+Hashing addresses (normalized_hash goes through usaddress) dominates
+generation, so address batches can be built in worker processes (--workers)
+while the previous batch is being copied.
+
+Every generated row is recognisable: users and patients have @loadtest.example.com
+emails, providers and institutions too. Seeding refuses to run twice on the
+same database; reset it first (make db-reset).
+"""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import random
+import uuid
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from functools import cached_property
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.address_normalization import normalized_address_hash
+from app.models.referral import ReferralStatus
+from app.models.user import User
+from app.passwords import password_helper
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DOMAIN = "loadtest.example.com"
+DEFAULT_PASSWORD = "loadtest-password"
+BATCH_SIZE = 10_000
+
+FIRST_NAMES = [
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Maria",
+    "Wei", "Mei", "Aarav", "Priya", "Ahmed", "Fatima", "Kwame", "Ama", "Hiroshi", "Yuki",
+]  # fmt: skip
+LAST_NAMES = [
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Gonzalez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin",
+    "Lee", "Nguyen", "Patel", "Kim", "Chen", "Okafor", "Tanaka", "Cohen", "Murphy", "Rossi",
+]  # fmt: skip
+SPECIALTIES = [
+    "Physical Therapy", "Occupational Therapy", "Orthopedic Surgery", "Cardiology", "Dermatology",
+    "Neurology", "Pediatrics", "Psychiatry", "Family Medicine", "Internal Medicine", "Podiatry",
+    "Speech-Language Pathology", "Chiropractic", "Pain Management", "Sports Medicine",
+]  # fmt: skip
+INSTITUTION_KINDS = ["Physical Therapy", "Orthopedics", "Medical Group", "Rehabilitation Center", "Family Clinic"]
+STREET_NAMES = ["Main", "Oak", "Maple", "Cedar", "Pine", "Elm", "Washington", "Lake", "Hill", "Park", "Sunset"]
+STREET_SUFFIXES = ["Street", "Avenue", "Boulevard", "Road", "Drive", "Lane", "Way"]
+# (city, state, ZIP) triples that exist, so the ZIP centroid trigger can place them
+LOCATIONS = [
+    ("Seattle", "WA", "98101"), ("Bellevue", "WA", "98004"), ("Tacoma", "WA", "98402"),
+    ("Portland", "OR", "97205"), ("San Francisco", "CA", "94103"), ("Oakland", "CA", "94612"),
+    ("Los Angeles", "CA", "90012"), ("San Diego", "CA", "92101"), ("Denver", "CO", "80202"),
+    ("Austin", "TX", "78701"), ("Dallas", "TX", "75201"), ("Chicago", "IL", "60601"),
+    ("New York", "NY", "10001"), ("Boston", "MA", "02108"), ("Atlanta", "GA", "30303"),
+    ("Miami", "FL", "33130"),
+]  # fmt: skip
+# (plan name, member id prefix)
+INSURANCE_PLANS = [
+    ("Aetna Choice POS II", "W"), ("Blue Cross Blue Shield PPO", "XYZ"), ("Cigna Open Access Plus", "U"),
+    ("UnitedHealthcare Choice Plus", "UHC"), ("Kaiser Permanente HMO", "KP"), ("Humana Gold Plus HMO", "H"),
+    ("Premera Blue Cross", "PBC"), ("Regence BlueShield", "RBS"), ("Medicare Part B", "1EG"),
+    ("Washington Apple Health", "MCD"),
+]  # fmt: skip
+PRIMARY_INSURANCE_RATE = 0.85
+SECONDARY_INSURANCE_RATE = 0.2  # of the patients with a primary plan
+REFERRAL_STATUSES = [
+    (ReferralStatus.PENDING, 40),
+    (ReferralStatus.APPROVED, 25),
+    (ReferralStatus.COMPLETED, 25),
+    (ReferralStatus.REJECTED, 5),
+    (ReferralStatus.CANCELLED, 5),
+]
+
+# Distinct (house number, street, suffix, location) combinations. Address i uses
+# combination (i * ADDRESS_STRIDE + seed) mod ADDRESS_CAPACITY, which is one to
+# one over any ADDRESS_CAPACITY consecutive indexes since the stride is prime and
+# does not divide the capacity; each further run of indexes adds 10,000 to the
+# house number.
+HOUSE_NUMBERS = 9_999
+ADDRESS_CAPACITY = HOUSE_NUMBERS * len(STREET_NAMES) * len(STREET_SUFFIXES) * len(LOCATIONS)
+ADDRESS_STRIDE = 1_000_003
+# Likewise for the 8 digits after an individual NPI's leading 1
+NPI_CAPACITY = 10**8
+NPI_STRIDE = 48_271
+
+# COPY column order per table; columns with server defaults are left out
+ADDRESS_COLUMNS = (
+    "id", "street_address_1", "street_address_2", "city", "state", "zip_code", "country", "normalized_hash",
+)  # fmt: skip
+USER_COLUMNS = (
+    "id", "email", "hashed_password", "is_active", "is_superuser", "is_verified", "is_admin",
+    "first_name", "last_name", "phone_number", "npi",
+)  # fmt: skip
+INSTITUTION_COLUMNS = ("id", "name", "type", "phone", "email", "website", "address_id", "created_by_user_id")
+PROVIDER_COLUMNS = (
+    "id", "first_name", "last_name", "email", "phone", "fax", "npi", "specialty",
+    "address_id", "institution_id", "global_provider",
+)  # fmt: skip
+NETWORK_COLUMNS = ("id", "user_id", "provider_id", "provider_institution_id")
+PATIENT_COLUMNS = (
+    "id", "first_name", "last_name", "phone_home", "phone_mobile", "email", "date_of_birth", "sex",
+    "medical_record_number", "address_id",
+)  # fmt: skip
+INSURANCE_COLUMNS = (
+    "id", "patient_id", "plan_name", "policy_number", "group_number", "subscriber_name", "is_primary",
+)  # fmt: skip
+REFERRAL_COLUMNS = (
+    "id", "user_id", "patient_id", "provider_id", "provider_institution_id", "status", "referral_date", "notes",
+)  # fmt: skip
+
+# Row trigger that bumps users.network_version for every network row
+NETWORK_VERSION_TRIGGER = "user_provider_networks_bump_version"
+
+
+@dataclass
+class Scale:
+    """Row counts at --scale 1; every count is multiplied by the scale factor (per-user counts are not)."""
+
+    users: int = 20
+    providers: int = 5_000
+    institutions: int = 500
+    network_providers: int = 50
+    network_institutions: int = 10
+    patients: int = 2_000
+    referrals: int = 5_000
+
+    @classmethod
+    def scaled(cls, factor: float) -> "Scale":
+        per_user = {"network_providers", "network_institutions"}
+        base = cls()
+        return cls(
+            **{
+                field.name: getattr(base, field.name)
+                if field.name in per_user
+                else max(1, round(getattr(base, field.name) * factor))
+                for field in fields(cls)
+            }
+        )
+
+
+class TableBatch(NamedTuple):
+    table: str
+    columns: Tuple[str, ...]
+    rows: List[tuple]
+
+
+def user_email(index: int) -> str:
+    return f"user-{index}@{EMAIL_DOMAIN}"
+
+
+def entity_id(seed: int, kind: str, index: int) -> uuid.UUID:
+    """Id of the index-th row of a kind, so rows can reference each other without lookups."""
+    digest = hashlib.blake2b(f"{seed}:{kind}:{index}".encode(), digest_size=16).digest()
+    return uuid.UUID(bytes=digest, version=4)
+
+
+def npi_check_digit(base: str) -> str:
+    """Luhn check digit for a 9-digit NPI base, computed over the 80840 card issuer prefix."""
+    total = 24  # contribution of the 80840 prefix
+    for position, digit in enumerate(reversed(base)):
+        value = int(digit)
+        if position % 2 == 0:
+            value *= 2
+            if value > 9:
+                value -= 9
+        total += value
+    return str((10 - total % 10) % 10)
+
+
+def npi(index: int) -> str:
+    """A valid individual NPI, different for every index below NPI_CAPACITY."""
+    base = f"1{(index * NPI_STRIDE) % NPI_CAPACITY:08d}"
+    return base + npi_check_digit(base)
+
+
+def medical_record_number(index: int) -> str:
+    return f"MRN{index:09d}"
+
+
+def random_phone(rng: random.Random) -> str:
+    # 555-01xx numbers are reserved for fiction
+    return f"({rng.randint(201, 989)}) 555-01{rng.randint(0, 99):02d}"
+
+
+def address_row(seed: int, index: int) -> tuple:
+    """The index-th address in ADDRESS_COLUMNS order; no two indexes share a normalized address."""
+    overflow = index // ADDRESS_CAPACITY
+    combination = (index * ADDRESS_STRIDE + seed) % ADDRESS_CAPACITY
+    combination, number = divmod(combination, HOUSE_NUMBERS)
+    combination, street = divmod(combination, len(STREET_NAMES))
+    location, suffix = divmod(combination, len(STREET_SUFFIXES))
+    city, state, zip_code = LOCATIONS[location]
+    address = {
+        "street_address_1": f"{overflow * 10_000 + number + 1} {STREET_NAMES[street]} {STREET_SUFFIXES[suffix]}",
+        # Only ever added to a street line that is already unique
+        "street_address_2": f"Suite {100 + number % 900}" if number % 10 < 3 else None,
+        "city": city,
+        "state": state,
+        "zip_code": zip_code,
+        "country": "USA",
+    }
+    return (entity_id(seed, "address", index), *address.values(), normalized_address_hash(address))
+
+
+def address_rows(seed: int, start: int, stop: int) -> List[tuple]:
+    """Addresses start to stop - 1; module level so worker processes can run it."""
+    return [address_row(seed, index) for index in range(start, stop)]
+
+
+class DatasetGenerator:
+    """
+    COPY rows for every table, generated batch by batch.
+
+    Address indexes are laid out by owner: global institutions, then each
+    user's own institution, then providers, then patients.
+    """
+
+    def __init__(self, scale: Scale, seed: int = 0, password: str = DEFAULT_PASSWORD, batch_size: int = BATCH_SIZE):
+        self.scale = scale
+        self.seed = seed
+        self.password = password
+        self.batch_size = batch_size
+        self.now = datetime.now(timezone.utc)
+
+    def rng(self, table: str) -> random.Random:
+        return random.Random(f"{self.seed}:{table}")
+
+    def id(self, kind: str, index: int) -> uuid.UUID:
+        return entity_id(self.seed, kind, index)
+
+    @property
+    def address_count(self) -> int:
+        scale = self.scale
+        return scale.institutions + scale.users + scale.providers + scale.patients
+
+    def address_id(self, owner: str, index: int) -> uuid.UUID:
+        scale = self.scale
+        offset = {
+            "institution": 0,
+            "provider": scale.institutions + scale.users,
+            "patient": scale.institutions + scale.users + scale.providers,
+        }[owner]
+        return self.id("address", offset + index)
+
+    def address_ranges(self) -> List[Tuple[int, int]]:
+        return [
+            (start, min(start + self.batch_size, self.address_count))
+            for start in range(0, self.address_count, self.batch_size)
+        ]
+
+    def batches(self) -> Iterator[TableBatch]:
+        """Every table but addresses, in insertion order (parents before children)."""
+        yield TableBatch("users", USER_COLUMNS, list(self.users()))
+        yield from self.chunked("provider_institutions", INSTITUTION_COLUMNS, self.institutions())
+        yield from self.chunked("providers", PROVIDER_COLUMNS, self.providers())
+        yield from self.chunked("user_provider_networks", NETWORK_COLUMNS, self.networks())
+        yield from self.patients_with_insurance()
+        yield from self.chunked("referrals", REFERRAL_COLUMNS, self.referrals())
+
+    def chunked(self, table: str, columns: Tuple[str, ...], rows: Iterator[tuple]) -> Iterator[TableBatch]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                yield TableBatch(table, columns, batch)
+                batch = []
+        if batch:
+            yield TableBatch(table, columns, batch)
+
+    def users(self) -> Iterator[tuple]:
+        rng = self.rng("users")
+        hashed_password = password_helper.hash(self.password)
+        for index in range(self.scale.users):
+            yield (
+                self.id("user", index),
+                user_email(index),
+                hashed_password,
+                True,  # is_active
+                False,  # is_superuser
+                True,  # is_verified
+                False,  # is_admin
+                rng.choice(FIRST_NAMES),
+                rng.choice(LAST_NAMES),
+                random_phone(rng),
+                # Counted down from the top, away from the providers' NPIs
+                npi(NPI_CAPACITY - 1 - index),
+            )
+
+    def institutions(self) -> Iterator[tuple]:
+        """Global institutions, then the one each user created."""
+        rng = self.rng("provider_institutions")
+        scale = self.scale
+        for index in range(scale.institutions + scale.users):
+            kind = rng.choice(INSTITUTION_KINDS)
+            slug = f"institution-{index}"
+            yield (
+                self.id("institution", index),
+                f"{rng.choice(LAST_NAMES)} {kind} {index}",
+                kind,
+                random_phone(rng),
+                f"{slug}@{EMAIL_DOMAIN}",
+                f"https://{slug}.{EMAIL_DOMAIN}",
+                self.address_id("institution", index),
+                self.id("user", index - scale.institutions) if index >= scale.institutions else None,
+            )
+
+    def providers(self) -> Iterator[tuple]:
+        rng = self.rng("providers")
+        for index in range(self.scale.providers):
+            first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            in_institution = rng.random() < 0.5
+            yield (
+                self.id("provider", index),
+                first_name,
+                last_name,
+                f"{first_name}.{last_name}.{index}@{EMAIL_DOMAIN}".lower(),
+                random_phone(rng),
+                random_phone(rng),
+                npi(index),
+                rng.choice(SPECIALTIES),
+                self.address_id("provider", index),
+                self.id("institution", rng.randrange(self.scale.institutions)) if in_institution else None,
+                True,  # global_provider
+            )
+
+    @cached_property
+    def network_targets(self) -> List[List[Tuple[str, int]]]:
+        """Each user's network as (target type, provider or institution index), by user index."""
+        rng = self.rng("user_provider_networks")
+        scale = self.scale
+        targets = []
+        for _ in range(scale.users):
+            providers = rng.sample(range(scale.providers), min(scale.network_providers, scale.providers))
+            institutions = rng.sample(range(scale.institutions), min(scale.network_institutions, scale.institutions))
+            targets.append(
+                [("provider", index) for index in providers]
+                + [("provider_institution", index) for index in institutions]
+            )
+        return targets
+
+    def target_ids(self, target_type: str, index: int) -> Tuple[Optional[uuid.UUID], Optional[uuid.UUID]]:
+        """(provider_id, provider_institution_id) of a network target."""
+        if target_type == "provider":
+            return self.id("provider", index), None
+        return None, self.id("institution", index)
+
+    def networks(self) -> Iterator[tuple]:
+        row = 0
+        for user_index, targets in enumerate(self.network_targets):
+            for target_type, index in targets:
+                yield (self.id("network", row), self.id("user", user_index), *self.target_ids(target_type, index))
+                row += 1
+
+    def patients_with_insurance(self) -> Iterator[TableBatch]:
+        """Patient batches, each followed by the insurance rows of its patients."""
+        rng = self.rng("patients")
+        insurance_rng = self.rng("insurances")
+        today = self.now.date()
+        insurance_index = 0
+        for start in range(0, self.scale.patients, self.batch_size):
+            patients, insurances = [], []
+            for index in range(start, min(start + self.batch_size, self.scale.patients)):
+                patient_id = self.id("patient", index)
+                first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                patients.append(
+                    (
+                        patient_id,
+                        first_name,
+                        last_name,
+                        random_phone(rng),
+                        random_phone(rng) if rng.random() < 0.7 else None,
+                        f"patient-{index}@{EMAIL_DOMAIN}",
+                        today - timedelta(days=rng.randint(18 * 365, 90 * 365)),
+                        rng.choice(["female", "male"]),
+                        medical_record_number(index),
+                        self.address_id("patient", index),
+                    )
+                )
+
+                if insurance_rng.random() >= PRIMARY_INSURANCE_RATE:
+                    continue
+                primary, secondary = insurance_rng.sample(INSURANCE_PLANS, 2)
+                plans = [(primary, True)]
+                if insurance_rng.random() < SECONDARY_INSURANCE_RATE:
+                    plans.append((secondary, False))
+                for (plan_name, member_prefix), is_primary in plans:
+                    # Mostly the patient's own plan, sometimes a spouse's or parent's
+                    subscriber = first_name if insurance_rng.random() < 0.75 else insurance_rng.choice(FIRST_NAMES)
+                    insurances.append(
+                        (
+                            self.id("insurance", insurance_index),
+                            patient_id,
+                            plan_name,
+                            f"{member_prefix}{insurance_rng.randrange(10**9):09d}",
+                            f"GRP-{insurance_rng.randrange(10**6):06d}",
+                            f"{subscriber} {last_name}",
+                            is_primary,
+                        )
+                    )
+                    insurance_index += 1
+
+            yield TableBatch("patients", PATIENT_COLUMNS, patients)
+            if insurances:
+                yield TableBatch("insurances", INSURANCE_COLUMNS, insurances)
+
+    def referrals(self) -> Iterator[tuple]:
+        rng = self.rng("referrals")
+        statuses, weights = zip(*REFERRAL_STATUSES)
+        for index in range(self.scale.referrals):
+            user_index = rng.randrange(self.scale.users)
+            target_type, target_index = rng.choice(self.network_targets[user_index])
+            yield (
+                self.id("referral", index),
+                self.id("user", user_index),
+                self.id("patient", rng.randrange(self.scale.patients)),
+                *self.target_ids(target_type, target_index),
+                # The column holds enum names (native_enum=False)
+                rng.choices(statuses, weights)[0].name,
+                self.now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+                "Synthetic load test referral",
+            )
+
+
+async def already_seeded(session: AsyncSession) -> bool:
+    count = await session.execute(select(func.count()).select_from(User).filter(User.email == user_email(0)))
+    return count.scalar_one() > 0
+
+
+async def has_trigger(session: AsyncSession, table: str, trigger: str) -> bool:
+    result = await session.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_trigger WHERE tgrelid = CAST(:table AS regclass) AND tgname = :trigger)"),
+        {"table": table, "trigger": trigger},
+    )
+    return result.scalar_one()
+
+
+async def driver_connection(session: AsyncSession):
+    """The asyncpg connection of the session's current transaction (a commit releases it)."""
+    connection = await session.connection()
+    return (await connection.get_raw_connection()).driver_connection
+
+
+async def copy_addresses(connection, generator: DatasetGenerator, workers: int = 1):
+    """COPY every address; with workers > 1, later batches are built in processes while one is copied."""
+    ranges = generator.address_ranges()
+    columns = list(ADDRESS_COLUMNS)
+    if workers <= 1:
+        for start, stop in ranges:
+            rows = address_rows(generator.seed, start, stop)
+            await connection.copy_records_to_table("addresses", records=rows, columns=columns)
+        return
+
+    loop = asyncio.get_running_loop()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Two batches per worker in flight, consumed in order
+        queued = iter(ranges)
+        pending = deque()
+        for start, stop in itertools.islice(queued, 2 * workers):
+            pending.append(loop.run_in_executor(pool, address_rows, generator.seed, start, stop))
+        while pending:
+            rows = await pending.popleft()
+            for start, stop in itertools.islice(queued, 1):
+                pending.append(loop.run_in_executor(pool, address_rows, generator.seed, start, stop))
+            await connection.copy_records_to_table("addresses", records=rows, columns=columns)
+
+
+async def write_dataset(session: AsyncSession, generator: DatasetGenerator, workers: int = 1) -> Dict[str, int]:
+    """
+    COPY the whole dataset, committing after each table, then ANALYZE.
+
+    The network version trigger is disabled while networks are copied: the
+    users are new, and bumping their version once per row would turn each
+    COPY batch into thousands of user updates. Databases whose tables were
+    created without the migrations' triggers have nothing to disable.
+
+    Returns:
+        Rows written per table
+    """
+    counts = Counter()
+    network_trigger = await has_trigger(session, "user_provider_networks", NETWORK_VERSION_TRIGGER)
+    await copy_addresses(await driver_connection(session), generator, workers)
+    await session.commit()
+    counts["addresses"] = generator.address_count
+    logger.info(f"Copied {counts['addresses']:,} addresses")
+
+    table = None
+    for batch in generator.batches():
+        # Insurance batches are interleaved with the patient batches they belong to
+        if batch.table not in (table, "insurances"):
+            if table is not None:
+                await finish_table(session, table, counts, network_trigger)
+            table = batch.table
+            if table == "user_provider_networks" and network_trigger:
+                await session.execute(
+                    text(f"ALTER TABLE user_provider_networks DISABLE TRIGGER {NETWORK_VERSION_TRIGGER}")
+                )
+        connection = await driver_connection(session)
+        await connection.copy_records_to_table(batch.table, records=batch.rows, columns=list(batch.columns))
+        counts[batch.table] += len(batch.rows)
+    await finish_table(session, table, counts, network_trigger)
+
+    # Fresh planner statistics, so the first queries see the real row counts
+    await session.execute(text("ANALYZE"))
+    await session.commit()
+    return dict(counts)
+
+
+async def finish_table(session: AsyncSession, table: str, counts: Counter, network_trigger: bool):
+    if table == "user_provider_networks" and network_trigger:
+        await session.execute(text(f"ALTER TABLE user_provider_networks ENABLE TRIGGER {NETWORK_VERSION_TRIGGER}"))
+    await session.commit()
+    logger.info(f"Copied {counts[table]:,} {table}")
+    if table == "patients":
+        logger.info(f"Copied {counts['insurances']:,} insurances")
+
+
+def summarize(counts: Dict[str, int]) -> str:
+    return ", ".join(f"{table}: {count:,}" for table, count in counts.items())
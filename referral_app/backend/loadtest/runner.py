@@ -0,0 +1,214 @@
+"""
+Asyncio load generator and JSON report.
+
+Virtual users log in as the seeded users (round robin), fetch their network
+once, then loop: pick a scenario by weight, send it, record the latency. The
+first --warmup seconds are not recorded. The report holds, per scenario,
+request and error counts, throughput and latency percentiles, plus enough run
+metadata (a label defaulting to the git commit, options) to compare two reports meaningfully.
+"""
+
+import asyncio
+import logging
+import platform
+import random
+import statistics
+import subprocess
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import httpx
+
+from loadtest.dataset import user_email
+from loadtest.scenarios import Scenario, ScenarioConfig, VirtualUser
+
+logger = logging.getLogger(__name__)
+
+REPORT_VERSION = 1
+PERCENTILES = (50, 95, 99)
+
+
+@dataclass
+class RunOptions:
+    base_url: str
+    users: int
+    seeded_users: int
+    password: str
+    duration: float
+    warmup: float
+    seed: int
+    scenarios: List[Scenario]
+    config: ScenarioConfig
+    label: Optional[str] = None
+
+
+@dataclass
+class ScenarioStats:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    error_samples: Counter = field(default_factory=Counter)
+
+    def record(self, latency_ms: float, error: Optional[str]):
+        self.latencies_ms.append(latency_ms)
+        if error is not None:
+            self.errors += 1
+            self.error_samples[error[:200]] += 1
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize_stats(stats: ScenarioStats, seconds: float) -> dict:
+    latencies = sorted(stats.latencies_ms)
+    summary = {
+        "requests": len(latencies),
+        "errors": stats.errors,
+        "error_rate": round(stats.errors / len(latencies), 4) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / seconds, 2) if seconds else 0.0,
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = round(percentile(latencies, pct), 2)
+    if stats.error_samples:
+        summary["top_errors"] = dict(stats.error_samples.most_common(5))
+    return summary
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def start_user(index: int, options: RunOptions) -> VirtualUser:
+    client = httpx.AsyncClient(base_url=options.base_url, timeout=60)
+    email = user_email(index % options.seeded_users)
+    response = await client.post("/api/auth/jwt/login", data={"username": email, "password": options.password})
+    response.raise_for_status()
+    client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+    network = (await client.get("/api/network")).json()
+    targets = [
+        (entry["target_type"], entry.get("provider_id") or entry.get("provider_institution_id")) for entry in network
+    ]
+    return VirtualUser(client=client, rng=random.Random(options.seed + index), email=email, network_targets=targets)
+
+
+async def user_loop(
+    user: VirtualUser, options: RunOptions, stats: Dict[str, ScenarioStats], record_after: float, stop_at: float
+):
+    scenarios = options.scenarios
+    weights = [scenario.weight for scenario in scenarios]
+    while time.perf_counter() < stop_at:
+        scenario = user.rng.choices(scenarios, weights)[0]
+        started = time.perf_counter()
+        error = None
+        try:
+            response = await scenario.run(user, options.config)
+            if response.status_code >= 400:
+                error = f"HTTP {response.status_code}: {response.text}"
+            elif scenario.check is not None:
+                error = scenario.check(response)
+        except httpx.HTTPError as e:
+            error = f"{type(e).__name__}: {e}"
+        latency_ms = (time.perf_counter() - started) * 1000
+        if started >= record_after:
+            stats[scenario.name].record(latency_ms, error)
+
+
+async def run_load_test(options: RunOptions) -> dict:
+    logger.info(f"Logging in {options.users} virtual users against {options.base_url}")
+    users = await asyncio.gather(*(start_user(index, options) for index in range(options.users)))
+    stats = {scenario.name: ScenarioStats() for scenario in options.scenarios}
+
+    started_at = datetime.now(timezone.utc)
+    start = time.perf_counter()
+    record_after = start + options.warmup
+    stop_at = record_after + options.duration
+    logger.info(f"Running for {options.warmup:g}s warmup + {options.duration:g}s")
+    try:
+        await asyncio.gather(*(user_loop(user, options, stats, record_after, stop_at) for user in users))
+    finally:
+        await asyncio.gather(*(user.client.aclose() for user in users))
+    measured = time.perf_counter() - record_after
+
+    all_stats = ScenarioStats()
+    for scenario_stats in stats.values():
+        all_stats.latencies_ms.extend(scenario_stats.latencies_ms)
+        all_stats.errors += scenario_stats.errors
+        all_stats.error_samples.update(scenario_stats.error_samples)
+
+    return {
+        "version": REPORT_VERSION,
+        "meta": {
+            "started_at": started_at.isoformat(),
+            "label": options.label or git_commit(),
+            "base_url": options.base_url,
+            "virtual_users": options.users,
+            "duration_s": options.duration,
+            "warmup_s": options.warmup,
+            "seed": options.seed,
+            "weights": {scenario.name: scenario.weight for scenario in options.scenarios},
+            "python": platform.python_version(),
+            "host": platform.node(),
+        },
+        "scenarios": {name: summarize_stats(scenario_stats, measured) for name, scenario_stats in stats.items()},
+        "total": summarize_stats(all_stats, measured),
+    }
+
+
+def format_report(report: dict) -> str:
+    header = f"{'scenario':<18} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    lines = [header]
+    for name, summary in [*report["scenarios"].items(), ("total", report["total"])]:
+        lines.append(
+            f"{name:<18} {summary['requests']:>9,} {summary['errors']:>7,} {summary['throughput_rps']:>8.1f} "
+            f"{summary['p50_ms']:>8.1f} {summary['p95_ms']:>8.1f} {summary['p99_ms']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+def compare_reports(baseline: dict, candidate: dict) -> str:
+    """Side-by-side change in throughput and latency percentiles, per scenario."""
+
+    def change(old: float, new: float) -> str:
+        if not old:
+            return "    n/a"
+        return f"{(new - old) / old * 100:>+6.1f}%"
+
+    base_meta, candidate_meta = baseline["meta"], candidate["meta"]
+    lines = [
+        f"baseline:  {base_meta.get('label')} ({base_meta['started_at']})",
+        f"candidate: {candidate_meta.get('label')} ({candidate_meta['started_at']})",
+    ]
+    if (
+        base_meta["virtual_users"] != candidate_meta["virtual_users"]
+        or base_meta["weights"] != candidate_meta["weights"]
+    ):
+        lines.append("warning: the runs used different virtual users or scenario weights")
+    lines.append(f"{'scenario':<18} {'rps':>16} {'p50 ms':>16} {'p95 ms':>16} {'p99 ms':>16} {'errors':>13}")
+
+    names = list(dict.fromkeys([*baseline["scenarios"], *candidate["scenarios"]])) + ["total"]
+    for name in names:
+        old = baseline["total"] if name == "total" else baseline["scenarios"].get(name)
+        new = candidate["total"] if name == "total" else candidate["scenarios"].get(name)
+        if old is None or new is None:
+            lines.append(f"{name:<18} only in {'candidate' if old is None else 'baseline'}")
+            continue
+        cells = [
+            f"{new[key]:>8.1f} {change(old[key], new[key])}" for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+        ]
+        lines.append(f"{name:<18} {' '.join(cells)} {old['errors']:>6,}->{new['errors']:<6,}")
+    return "\n".join(lines)
@@ -0,0 +1,121 @@
+"""
+Load test scenarios.
+
+Each scenario is one request a virtual user makes. Virtual users pick
+scenarios by weight, so the mix approximates real traffic: mostly reads
+(browse search, network list), some referral creation, and Documo webhooks.
+"""
+
+import base64
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from loadtest.dataset import EMAIL_DOMAIN, FIRST_NAMES, LAST_NAMES, SPECIALTIES, random_phone
+
+SEARCH_TERMS = [name.lower() for name in LAST_NAMES[:10]] + [specialty.split()[0].lower() for specialty in SPECIALTIES]
+
+
+@dataclass
+class VirtualUser:
+    """A logged-in client and what it needs to build requests."""
+
+    client: httpx.AsyncClient
+    rng: random.Random
+    email: str
+    network_targets: List[tuple] = field(default_factory=list)  # (target_type, target_id)
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    weight: int
+    run: Callable[[VirtualUser, "ScenarioConfig"], Awaitable[httpx.Response]]
+    # Error message for a response that succeeded at the HTTP level but not in substance, else None
+    check: Optional[Callable[[httpx.Response], Optional[str]]] = None
+
+
+@dataclass(frozen=True)
+class ScenarioConfig:
+    webhook_username: Optional[str] = None
+    webhook_password: Optional[str] = None
+
+
+async def browse_search(user: VirtualUser, config: ScenarioConfig) -> httpx.Response:
+    return await user.client.get("/api/browse/providers", params={"search": user.rng.choice(SEARCH_TERMS)})
+
+
+async def network_list(user: VirtualUser, config: ScenarioConfig) -> httpx.Response:
+    return await user.client.get("/api/network")
+
+
+async def referral_create(user: VirtualUser, config: ScenarioConfig) -> httpx.Response:
+    rng = user.rng
+    body = {
+        "patient_data": {
+            "first_name": rng.choice(FIRST_NAMES),
+            "last_name": rng.choice(LAST_NAMES),
+            "phone_home": random_phone(rng),
+            "email": f"patient-{uuid.uuid4().hex[:12]}@{EMAIL_DOMAIN}",
+            "date_of_birth": (date.today() - timedelta(days=rng.randint(18 * 365, 90 * 365))).isoformat(),
+            "sex": rng.choice(["female", "male"]),
+        },
+        "notes": "Load test referral",
+    }
+    if user.network_targets:
+        target_type, target_id = rng.choice(user.network_targets)
+        body["referral_target_type"] = target_type
+        body["provider_id" if target_type == "provider" else "provider_institution_id"] = target_id
+    else:
+        body["referral_target_type"] = "open"
+    return await user.client.post("/api/referrals", json=body)
+
+
+async def documo_webhook(user: VirtualUser, config: ScenarioConfig) -> httpx.Response:
+    credentials = base64.b64encode(f"{config.webhook_username}:{config.webhook_password}".encode()).decode()
+    now = datetime.now(timezone.utc).isoformat()
+    payload = {
+        "messageId": str(uuid.uuid4()),
+        "direction": "inbound",
+        "status": "success",
+        "pagesCount": user.rng.randint(1, 12),
+        "faxNumber": "+12065550100",
+        "faxCallerId": "2065550199",
+        "channelType": "web",
+        "country": "US",
+        "createdAt": now,
+        "resolvedDate": now,
+    }
+    return await user.client.post(
+        "/api/webhooks/documo/fax",
+        json=payload,
+        headers={"Authorization": f"Basic {credentials}", "x-webhook-event": "fax.v1.inbound.complete"},
+    )
+
+
+def webhook_error(response: httpx.Response) -> Optional[str]:
+    # The webhook answers 200 even when the download or upload failed, so Documo does not retry
+    body = response.json()
+    return f"webhook {body.get('status')}: {body.get('error')}" if body.get("status") != "success" else None
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("browse_search", 50, browse_search),
+        Scenario("network_list", 30, network_list),
+        Scenario("referral_create", 15, referral_create),
+        Scenario("documo_webhook", 5, documo_webhook, check=webhook_error),
+    )
+}
+
+
+def select_scenarios(names: Optional[List[str]], weights: Optional[Dict[str, int]] = None) -> List[Scenario]:
+    """Scenarios to run, optionally restricted by name and re-weighted."""
+    selected = [SCENARIOS[name] for name in names] if names else list(SCENARIOS.values())
+    weights = weights or {}
+    return [Scenario(s.name, weights.get(s.name, s.weight), s.run, s.check) for s in selected]
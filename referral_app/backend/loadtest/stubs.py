@@ -0,0 +1,61 @@
+"""
+Stand-ins for the external services the Documo webhook calls.
+
+The webhook downloads the fax PDF from Documo and uploads it to Cloud Storage.
+Load tests must not hit either for real, so this serves both from one local
+process, with a configurable delay to model their latency:
+
+- GET  /v1/fax/{message_id}/download       Documo fax download (returns a small PDF)
+- POST /upload/storage/v1/b/{bucket}/o     Cloud Storage media/multipart upload
+
+Point the API at it with:
+    DOCUMO_API_BASE_URL=http://localhost:8089/v1
+    STORAGE_EMULATOR_HOST=http://localhost:8089
+"""
+
+import asyncio
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+DEFAULT_PORT = 8089
+
+# Smallest well-formed single page PDF
+FAX_PDF = (
+    b"%PDF-1.4\n1 0 obj<</Type/Catalog/Pages 2 0 R>>endobj\n"
+    b"2 0 obj<</Type/Pages/Kids[3 0 R]/Count 1>>endobj\n"
+    b"3 0 obj<</Type/Page/Parent 2 0 R/MediaBox[0 0 612 792]>>endobj\n"
+    b"trailer<</Root 1 0 R>>\n%%EOF\n"
+)
+
+
+def create_stub_app(latency_ms: float = 0.0) -> Starlette:
+    async def delay():
+        if latency_ms > 0:
+            await asyncio.sleep(latency_ms / 1000)
+
+    async def documo_download(request: Request) -> Response:
+        await delay()
+        return Response(FAX_PDF, media_type="application/pdf")
+
+    async def storage_upload(request: Request) -> Response:
+        await request.body()
+        await delay()
+        bucket = request.path_params["bucket"]
+        name = request.query_params.get("name", "upload")
+        return JSONResponse({"kind": "storage#object", "bucket": bucket, "name": name, "size": "0"})
+
+    return Starlette(
+        routes=[
+            Route("/v1/fax/{message_id}/download", documo_download),
+            Route("/upload/storage/v1/b/{bucket}/o", storage_upload, methods=["POST"]),
+        ]
+    )
+
+
+def serve_stubs(port: int = DEFAULT_PORT, latency_ms: float = 0.0):
+    import uvicorn
+
+    uvicorn.run(create_stub_app(latency_ms), host="0.0.0.0", port=port, log_level="warning")
@@ -0,0 +1,24 @@
+-- Create "referral_documents" table
+CREATE TABLE "referral_documents" (
+  "referral_id" uuid NOT NULL,
+  "raw_text_compressed" bytea NULL,
+  "raw_text_codec" character varying(20) NOT NULL,
+  "raw_text_length" integer NULL,
+  "id" uuid NOT NULL,
+  "datetime_created" timestamptz NOT NULL DEFAULT now(),
+  "datetime_updated" timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY ("id"),
+  CONSTRAINT "referral_documents_referral_id_fkey" FOREIGN KEY ("referral_id") REFERENCES "referrals" ("id") ON UPDATE NO ACTION ON DELETE CASCADE
+);
+-- Create index "ix_referral_documents_id" to table: "referral_documents"
+CREATE UNIQUE INDEX "ix_referral_documents_id" ON "referral_documents" ("id");
+-- Create index "ix_referral_documents_referral_id" to table: "referral_documents"
+CREATE UNIQUE INDEX "ix_referral_documents_referral_id" ON "referral_documents" ("referral_id");
+-- Payload is compressed by the application; skip TOAST compression
+ALTER TABLE "referral_documents" ALTER COLUMN "raw_text_compressed" SET STORAGE EXTERNAL;
+-- Move existing OCR text out of "referrals" (stored uncompressed; rewritten as zlib on next save)
+INSERT INTO "referral_documents" ("referral_id", "raw_text_compressed", "raw_text_codec", "raw_text_length", "id")
+SELECT "id", convert_to("raw_text", 'UTF8'), 'none', char_length("raw_text"), gen_random_uuid()
+FROM "referrals" WHERE "raw_text" IS NOT NULL;
+-- Modify "referrals" table
+ALTER TABLE "referrals" DROP COLUMN "raw_text";
@@ -0,0 +1,2 @@
+-- Create index "ix_referrals_user_id_referral_date" to table: "referrals"
+CREATE INDEX "ix_referrals_user_id_referral_date" ON "referrals" ("user_id", "referral_date");
@@ -0,0 +1,2 @@
+-- Modify "provider_institutions" table
+ALTER TABLE "provider_institutions" ADD COLUMN "source_hash" character varying(64) NULL, ADD COLUMN "deleted_at" timestamptz NULL;
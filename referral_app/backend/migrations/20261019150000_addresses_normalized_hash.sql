@@ -0,0 +1,4 @@
+-- Modify "addresses" table
+ALTER TABLE "addresses" ADD COLUMN "normalized_hash" character varying(64) NULL;
+-- Create index "ix_addresses_normalized_hash" to table: "addresses"
+CREATE UNIQUE INDEX "ix_addresses_normalized_hash" ON "addresses" ("normalized_hash");
@@ -0,0 +1,31 @@
+-- Create "zip_centroids" table
+CREATE TABLE "zip_centroids" (
+  "zip_code" character varying(5) NOT NULL,
+  "latitude" double precision NOT NULL,
+  "longitude" double precision NOT NULL,
+  "id" uuid NOT NULL,
+  "datetime_created" timestamptz NOT NULL DEFAULT now(),
+  "datetime_updated" timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY ("id")
+);
+-- Create index "ix_zip_centroids_id" to table: "zip_centroids"
+CREATE UNIQUE INDEX "ix_zip_centroids_id" ON "zip_centroids" ("id");
+-- Create index "ix_zip_centroids_zip_code" to table: "zip_centroids"
+CREATE UNIQUE INDEX "ix_zip_centroids_zip_code" ON "zip_centroids" ("zip_code");
+-- Modify "addresses" table
+ALTER TABLE "addresses" ADD COLUMN "latitude" double precision NULL, ADD COLUMN "longitude" double precision NULL;
+-- Create index "ix_addresses_latitude_longitude" to table: "addresses"
+CREATE INDEX "ix_addresses_latitude_longitude" ON "addresses" ("latitude", "longitude");
+-- Create "addresses_set_coordinates" function (fills latitude/longitude from the ZIP centroid)
+CREATE FUNCTION "addresses_set_coordinates"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' OR NEW.zip_code IS DISTINCT FROM OLD.zip_code THEN
+    SELECT z.latitude, z.longitude INTO NEW.latitude, NEW.longitude
+    FROM zip_centroids z
+    WHERE z.zip_code = left(NEW.zip_code, 5);
+  END IF;
+  RETURN NEW;
+END;
+$$;
+-- Create trigger "addresses_set_coordinates" on table: "addresses"
+CREATE TRIGGER "addresses_set_coordinates" BEFORE INSERT OR UPDATE OF "zip_code" ON "addresses" FOR EACH ROW EXECUTE FUNCTION "addresses_set_coordinates"();
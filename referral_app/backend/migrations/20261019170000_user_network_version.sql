@@ -0,0 +1,16 @@
+-- Modify "users" table
+ALTER TABLE "users" ADD COLUMN "network_version" integer NOT NULL DEFAULT 0;
+-- Create "users_bump_network_version" function (invalidates cached network membership)
+CREATE FUNCTION "users_bump_network_version"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    UPDATE users SET network_version = network_version + 1 WHERE id = OLD.user_id;
+  END IF;
+  IF TG_OP = 'INSERT' OR (TG_OP = 'UPDATE' AND NEW.user_id IS DISTINCT FROM OLD.user_id) THEN
+    UPDATE users SET network_version = network_version + 1 WHERE id = NEW.user_id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+-- Create trigger "user_provider_networks_bump_version" on table: "user_provider_networks"
+CREATE TRIGGER "user_provider_networks_bump_version" AFTER INSERT OR UPDATE OR DELETE ON "user_provider_networks" FOR EACH ROW EXECUTE FUNCTION "users_bump_network_version"();
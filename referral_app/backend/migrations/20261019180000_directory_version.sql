@@ -0,0 +1,24 @@
+-- Create "directory_version" table
+CREATE TABLE "directory_version" (
+  "id" integer NOT NULL,
+  "version" bigint NOT NULL,
+  PRIMARY KEY ("id"),
+  CONSTRAINT "directory_version_singleton" CHECK (id = 1)
+);
+-- Seed the single "directory_version" row
+INSERT INTO "directory_version" ("id", "version") VALUES (1, 0);
+-- Create "directory_version_bump" function (versions ETags of directory listings)
+CREATE FUNCTION "directory_version_bump"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  UPDATE directory_version SET version = version + 1 WHERE id = 1;
+  RETURN NULL;
+END;
+$$;
+-- Create trigger "providers_bump_directory_version" on table: "providers"
+CREATE TRIGGER "providers_bump_directory_version" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "providers" FOR EACH STATEMENT EXECUTE FUNCTION "directory_version_bump"();
+-- Create trigger "provider_institutions_bump_directory_version" on table: "provider_institutions"
+CREATE TRIGGER "provider_institutions_bump_directory_version" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "provider_institutions" FOR EACH STATEMENT EXECUTE FUNCTION "directory_version_bump"();
+-- Create trigger "addresses_bump_directory_version" on table: "addresses"
+CREATE TRIGGER "addresses_bump_directory_version" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "addresses" FOR EACH STATEMENT EXECUTE FUNCTION "directory_version_bump"();
+-- Create trigger "zip_centroids_bump_directory_version" on table: "zip_centroids"
+CREATE TRIGGER "zip_centroids_bump_directory_version" AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON "zip_centroids" FOR EACH STATEMENT EXECUTE FUNCTION "directory_version_bump"();
@@ -0,0 +1,21 @@
+-- Create "refresh_token_revocations" table
+CREATE TABLE "refresh_token_revocations" (
+  "jti" uuid NULL,
+  "family_id" uuid NOT NULL,
+  "user_id" uuid NOT NULL,
+  "expires_at" timestamptz NOT NULL,
+  "id" uuid NOT NULL,
+  "datetime_created" timestamptz NOT NULL DEFAULT now(),
+  "datetime_updated" timestamptz NOT NULL DEFAULT now(),
+  PRIMARY KEY ("id"),
+  CONSTRAINT "refresh_token_revocations_jti_key" UNIQUE ("jti"),
+  CONSTRAINT "refresh_token_revocations_user_id_fkey" FOREIGN KEY ("user_id") REFERENCES "users" ("id") ON UPDATE NO ACTION ON DELETE CASCADE
+);
+-- Create index "ix_refresh_token_revocations_expires_at" to table: "refresh_token_revocations"
+CREATE INDEX "ix_refresh_token_revocations_expires_at" ON "refresh_token_revocations" ("expires_at");
+-- Create index "ix_refresh_token_revocations_family" to table: "refresh_token_revocations"
+CREATE UNIQUE INDEX "ix_refresh_token_revocations_family" ON "refresh_token_revocations" ("family_id") WHERE (jti IS NULL);
+-- Create index "ix_refresh_token_revocations_id" to table: "refresh_token_revocations"
+CREATE UNIQUE INDEX "ix_refresh_token_revocations_id" ON "refresh_token_revocations" ("id");
+-- Create index "ix_refresh_token_revocations_user_id" to table: "refresh_token_revocations"
+CREATE INDEX "ix_refresh_token_revocations_user_id" ON "refresh_token_revocations" ("user_id");
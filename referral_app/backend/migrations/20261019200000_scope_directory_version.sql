@@ -0,0 +1,69 @@
+-- Create "bump_directory_version" function (skipped while an import defers the bump, see app/models/directory_version.py)
+CREATE FUNCTION "bump_directory_version"() RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+  IF current_setting('app.defer_directory_version', true) IS DISTINCT FROM 'on' THEN
+    UPDATE directory_version SET version = version + 1 WHERE id = 1;
+  END IF;
+END;
+$$;
+-- Modify "directory_version_bump" function
+CREATE OR REPLACE FUNCTION "directory_version_bump"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  PERFORM bump_directory_version();
+  RETURN NULL;
+END;
+$$;
+-- Create "providers_bump_versions" function (global providers version the directory, custom ones the networks listing them)
+CREATE FUNCTION "providers_bump_versions"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  IF TG_OP = 'INSERT' THEN
+    -- New custom providers aren't in any network yet
+    IF EXISTS (SELECT 1 FROM new_providers WHERE global_provider) THEN
+      PERFORM bump_directory_version();
+    END IF;
+  ELSIF TG_OP = 'DELETE' THEN
+    -- Network entries of deleted providers cascade, which bumps their users
+    IF EXISTS (SELECT 1 FROM old_providers WHERE global_provider) THEN
+      PERFORM bump_directory_version();
+    END IF;
+  ELSE
+    IF EXISTS (SELECT 1 FROM old_providers o JOIN new_providers n USING (id) WHERE o.global_provider OR n.global_provider) THEN
+      PERFORM bump_directory_version();
+    END IF;
+    UPDATE users SET network_version = network_version + 1
+    WHERE id IN (
+      SELECT n.user_id FROM user_provider_networks n JOIN new_providers p ON p.id = n.provider_id
+      WHERE NOT p.global_provider
+    );
+  END IF;
+  RETURN NULL;
+END;
+$$;
+-- Create "addresses_bump_directory_version" function (only edits show in listings: inserted rows aren't referenced yet)
+CREATE FUNCTION "addresses_bump_directory_version"() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+  -- get_or_create_address's ON CONFLICT DO UPDATE rewrites rows unchanged
+  IF EXISTS (
+    SELECT 1 FROM old_addresses o JOIN new_addresses n USING (id)
+    WHERE (o.street_address_1, o.street_address_2, o.city, o.state, o.zip_code, o.country, o.latitude, o.longitude)
+      IS DISTINCT FROM (n.street_address_1, n.street_address_2, n.city, n.state, n.zip_code, n.country, n.latitude, n.longitude)
+  ) THEN
+    PERFORM bump_directory_version();
+  END IF;
+  RETURN NULL;
+END;
+$$;
+-- Drop trigger "providers_bump_directory_version" from table: "providers"
+DROP TRIGGER "providers_bump_directory_version" ON "providers";
+-- Create trigger "providers_bump_directory_version" on table: "providers"
+CREATE TRIGGER "providers_bump_directory_version" AFTER TRUNCATE ON "providers" FOR EACH STATEMENT EXECUTE FUNCTION "directory_version_bump"();
+-- Create trigger "providers_insert_bump_versions" on table: "providers"
+CREATE TRIGGER "providers_insert_bump_versions" AFTER INSERT ON "providers" REFERENCING NEW TABLE AS new_providers FOR EACH STATEMENT EXECUTE FUNCTION "providers_bump_versions"();
+-- Create trigger "providers_update_bump_versions" on table: "providers"
+CREATE TRIGGER "providers_update_bump_versions" AFTER UPDATE ON "providers" REFERENCING OLD TABLE AS old_providers NEW TABLE AS new_providers FOR EACH STATEMENT EXECUTE FUNCTION "providers_bump_versions"();
+-- Create trigger "providers_delete_bump_versions" on table: "providers"
+CREATE TRIGGER "providers_delete_bump_versions" AFTER DELETE ON "providers" REFERENCING OLD TABLE AS old_providers FOR EACH STATEMENT EXECUTE FUNCTION "providers_bump_versions"();
+-- Drop trigger "addresses_bump_directory_version" from table: "addresses"
+DROP TRIGGER "addresses_bump_directory_version" ON "addresses";
+-- Create trigger "addresses_bump_directory_version" on table: "addresses"
+CREATE TRIGGER "addresses_bump_directory_version" AFTER UPDATE ON "addresses" REFERENCING OLD TABLE AS old_addresses NEW TABLE AS new_addresses FOR EACH STATEMENT EXECUTE FUNCTION "addresses_bump_directory_version"();
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark address parsing for institution imports.
+
+Writes a synthetic directory file (default 100k rows, with a share of repeated
+addresses as in real statewide listings), then, with an increasing number of
+worker processes:
+
+- times parse_addresses over the whole file, the ceiling for parsing alone;
+- runs the bulk import loop the importer uses (bulk_import_institutions:
+  batches, existing-ID lookups, parsing overlapped with inserts and commits)
+  against DATABASE_URL, and deletes the rows it inserted afterwards.
+
+The import runs write to the database; point DATABASE_URL at a development
+database, or pass --parse-only.
+
+Usage: python scripts/benchmark_address_parsing.py [--rows 100000] [--repeat-ratio 0.3]
+           [--batch-size 1000] [--parse-only]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+# Add the scripts and app directories to the path
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from directory_source import record_uuid
+from import_provider_institutions import DEFAULT_BATCH_SIZE, bulk_import_institutions, parse_address, parse_addresses
+from app.database import AsyncSessionLocal
+from sqlalchemy import text
+
+# Addresses of the deleted institutions that nothing else points at
+DELETE_UNUSED_ADDRESSES = text(
+    """
+    DELETE FROM addresses
+    WHERE id = ANY(:ids)
+      AND NOT EXISTS (SELECT 1 FROM provider_institutions WHERE address_id = addresses.id)
+      AND NOT EXISTS (SELECT 1 FROM providers WHERE address_id = addresses.id)
+      AND NOT EXISTS (SELECT 1 FROM patients WHERE address_id = addresses.id)
+    """
+)
+
+STREET_NAMES = ["Wisconsin", "Fernwood", "Rockville", "Georgia", "Connecticut", "Old Georgetown", "Democracy"]
+STREET_SUFFIXES = ["Ave", "Rd", "Pike", "Blvd", "St", "Dr", "Ln"]
+UNIT_FORMATS = ["", " #{n}", " Ste {n}", " Suite {n}", " Unit {n}"]
+CITIES = ["Bethesda", "Chevy Chase", "Rockville", "Silver Spring", "Gaithersburg", "Kensington", "Potomac"]
+
+
+def make_address(rng: random.Random) -> str:
+    unit = rng.choice(UNIT_FORMATS).format(n=rng.randint(1, 2000))
+    street = f"{rng.randint(1, 99999)} {rng.choice(STREET_NAMES)} {rng.choice(STREET_SUFFIXES)}{unit}"
+    return f"{street}, {rng.choice(CITIES)}, MD {rng.randint(20601, 21930)}"
+
+
+def write_synthetic_file(path: Path, rows: int, repeat_ratio: float, seed: int = 42):
+    """Write a directory-shaped JSON file where repeat_ratio of rows reuse an earlier address."""
+    rng = random.Random(seed)
+    addresses = []
+    records = []
+    for index in range(rows):
+        if addresses and rng.random() < repeat_ratio:
+            address = rng.choice(addresses)
+        else:
+            address = make_address(rng)
+            addresses.append(address)
+        records.append({"name": f"Institution {index}", "type": "Clinic", "address": address})
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(records, f)
+
+
+async def delete_imported(path: Path):
+    """Delete the institutions imported from the synthetic file, and addresses only they used."""
+    with open(path, encoding="utf-8") as f:
+        ids = [record_uuid(record) for record in json.load(f)]
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            text("DELETE FROM provider_institutions WHERE id = ANY(:ids) RETURNING address_id"), {"ids": ids}
+        )
+        address_ids = list({address_id for (address_id,) in result.all() if address_id is not None})
+        await session.execute(DELETE_UNUSED_ADDRESSES, {"ids": address_ids})
+        await session.commit()
+
+
+async def benchmark_imports(path: Path, rows: int, batch_size: int, worker_counts: List[int]):
+    print(f"\nBulk import loop, batches of {batch_size}")
+    serial = None
+    for workers in worker_counts:
+        await delete_imported(path)
+        start = time.perf_counter()
+        await bulk_import_institutions(path, batch_size, workers)
+        elapsed = time.perf_counter() - start
+        serial = serial or elapsed
+        label = f"{workers} worker(s)"
+        print(f"{label:<28} {elapsed:7.2f}s  {rows / elapsed:9,.0f} rows/s  {serial / elapsed:5.2f}x")
+    await delete_imported(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat-ratio", type=float, default=0.3)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--parse-only", action="store_true", help="Skip the import runs (no database needed)")
+    args = parser.parse_args()
+
+    cpu_count = os.cpu_count() or 1
+    worker_counts = sorted({1, *[n for n in (2, 4, 8, 16, 32) if n <= cpu_count], cpu_count})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic_directory.json"
+        write_synthetic_file(path, args.rows, args.repeat_ratio)
+        print(f"Synthetic file: {args.rows} rows, {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        with open(path, encoding="utf-8") as f:
+            address_strs = [record["address"] for record in json.load(f)]
+        print(f"Distinct addresses: {len(set(address_strs))}")
+
+        start = time.perf_counter()
+        for address_str in address_strs:
+            parse_address(address_str)
+        baseline = time.perf_counter() - start
+        print(f"\nParsing only\n{'serial, no memoization':<28} {baseline:7.2f}s  {args.rows / baseline:9,.0f} rows/s")
+
+        for workers in worker_counts:
+            start = time.perf_counter()
+            parse_addresses(address_strs, workers=workers)
+            elapsed = time.perf_counter() - start
+            label = f"memoized, {workers} worker(s)"
+            print(f"{label:<28} {elapsed:7.2f}s  {args.rows / elapsed:9,.0f} rows/s  {baseline / elapsed:5.2f}x")
+
+        if args.parse_only:
+            return
+
+        # The importer logs every batch; only the table below is wanted here
+        logging.getLogger("import_provider_institutions").setLevel(logging.WARNING)
+        asyncio.run(benchmark_imports(path, args.rows, args.batch_size, worker_counts))
+
+
+if __name__ == "__main__":
+    main()
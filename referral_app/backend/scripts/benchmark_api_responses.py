@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark response size and latency of the browse and network endpoints.
+
+Logs in against a running API, then requests each endpoint repeatedly with
+Accept-Encoding identity, gzip and br, and reports the bytes on the wire
+(compressed, as received) and p50/p99 time to the last byte. It also times
+rendering the captured payloads with the stdlib json encoder and with orjson.
+
+Usage: python scripts/benchmark_api_responses.py --email user@example.com --password secret
+           [--base-url http://localhost:8000] [--requests 50] [--search clinic]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import httpx
+import orjson
+
+ENDPOINTS = [
+    "/api/browse/providers",
+    "/api/browse/provider-institutions",
+    "/api/network",
+    "/api/providers",
+]
+
+ENCODINGS = ["identity", "gzip", "br"]
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/auth/jwt/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def measure(client: httpx.AsyncClient, path: str, params: dict, encoding: str, requests: int):
+    """(wire bytes, latencies in ms, content-encoding) for repeated requests of one endpoint."""
+    latencies = []
+    wire_bytes = 0
+    content_encoding = None
+    for _ in range(requests):
+        start = time.perf_counter()
+        # Read the raw stream so the size is what crossed the wire, not the decoded body
+        async with client.stream("GET", path, params=params, headers={"Accept-Encoding": encoding}) as response:
+            response.raise_for_status()
+            wire_bytes = sum([len(chunk) async for chunk in response.aiter_raw()])
+            content_encoding = response.headers.get("content-encoding", "identity")
+        latencies.append((time.perf_counter() - start) * 1000)
+    return wire_bytes, latencies, content_encoding
+
+
+def time_rendering(payload, runs: int = 20) -> tuple:
+    """Median ms to render the payload with json.dumps and with orjson.dumps."""
+    timings = {}
+    for name, dumps in (("json", lambda data: json.dumps(data).encode()), ("orjson", orjson.dumps)):
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            dumps(payload)
+            samples.append((time.perf_counter() - start) * 1000)
+        timings[name] = statistics.median(samples)
+    return timings["json"], timings["orjson"]
+
+
+async def benchmark(args):
+    params = {"search": args.search} if args.search else {}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        token = await login(client, args.email, args.password)
+        client.headers["Authorization"] = f"Bearer {token}"
+
+        print(f"{'endpoint':<36} {'encoding':<9} {'bytes':>10} {'ratio':>6} {'p50 ms':>8} {'p99 ms':>8}")
+        for path in ENDPOINTS:
+            identity_bytes = None
+            for encoding in ENCODINGS:
+                wire_bytes, latencies, content_encoding = await measure(client, path, params, encoding, args.requests)
+                if identity_bytes is None:
+                    identity_bytes = wire_bytes
+                label = content_encoding if content_encoding == encoding else f"{content_encoding}*"
+                ratio = identity_bytes / wire_bytes if wire_bytes else 0
+                print(
+                    f"{path:<36} {label:<9} {wire_bytes:>10,} {ratio:>5.1f}x "
+                    f"{statistics.median(latencies):>8.1f} {percentile(latencies, 0.99):>8.1f}"
+                )
+
+            payload = (await client.get(path, params=params)).json()
+            json_ms, orjson_ms = time_rendering(payload)
+            print(f"{'':<36} render: json {json_ms:.2f} ms, orjson {orjson_ms:.2f} ms")
+
+    print("\n* the server answered with a different encoding than requested (e.g. brotli unavailable)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--requests", type=int, default=50, help="Requests per endpoint and encoding")
+    parser.add_argument("--search", help="search parameter for the browse endpoints")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark login throughput and its effect on other requests.
+
+Against a running API, fires --logins password logins with --concurrency in
+flight while a probe requests /api/health in a loop, and reports logins per
+second, login latency, and probe latency. With hashing on the event loop the
+probe stalls behind every hash; with the password pool (app/passwords.py) it
+should stay near its idle latency.
+
+With --local no server is needed: it verifies a hash with the configured
+parameters (PASSWORD_* environment variables) inline on the event loop and
+then through the pool, and reports throughput and the worst event loop stall
+seen by a ticker task.
+
+Usage: python scripts/benchmark_login.py --email user@example.com --password secret
+           [--base-url http://localhost:8000] [--logins 200] [--concurrency 20]
+       python scripts/benchmark_login.py --local [--logins 200] [--concurrency 20]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import httpx
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def percentile(values: list, fraction: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def summarize(label: str, latencies: list) -> str:
+    if not latencies:
+        return f"{label}: no samples"
+    return (
+        f"{label}: n={len(latencies)} p50 {statistics.median(latencies):.1f} ms "
+        f"p99 {percentile(latencies, 0.99):.1f} ms max {max(latencies):.1f} ms"
+    )
+
+
+async def run_bounded(count: int, concurrency: int, operation) -> list:
+    """Run operation() count times with at most concurrency in flight; returns latencies in ms."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await operation()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(count)))
+    return latencies
+
+
+async def benchmark_server(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        (await client.get("/api/health")).raise_for_status()
+        failures = 0
+
+        async def login():
+            nonlocal failures
+            response = await client.post(
+                "/api/auth/jwt/login", data={"username": args.email, "password": args.password}
+            )
+            if response.status_code != 200:
+                failures += 1
+
+        probe_latencies = []
+        done = asyncio.Event()
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/api/health")
+                probe_latencies.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        idle = await run_bounded(50, 1, lambda: client.get("/api/health"))
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        login_latencies = await run_bounded(args.logins, args.concurrency, login)
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    print(f"{args.logins} logins, concurrency {args.concurrency}: {args.logins / elapsed:.1f} logins/s")
+    if failures:
+        print(f"  {failures} logins failed (wrong credentials or server errors)")
+    print("  " + summarize("login", login_latencies))
+    print("  " + summarize("/api/health idle", idle))
+    print("  " + summarize("/api/health during logins", probe_latencies))
+
+
+async def measure_loop(operation, count: int, concurrency: int) -> tuple:
+    """(throughput per second, worst event loop stall in ms) while running operation count times."""
+    stalls = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            stalls.append((time.perf_counter() - start) * 1000 - 1)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await run_bounded(count, concurrency, operation)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await ticker_task
+    return count / elapsed, max(stalls, default=0.0)
+
+
+async def benchmark_local(args):
+    from app.passwords import password_helper
+
+    hashed = password_helper.hash("benchmark-password")
+    # Drop the salt and digest, keep the scheme and parameters
+    print(f"hash: {hashed.rsplit('$', 2)[0]}, pool workers: {password_helper.max_workers}")
+
+    async def inline():
+        password_helper.verify_and_update("benchmark-password", hashed)
+
+    async def pooled():
+        await password_helper.verify_and_update_async("benchmark-password", hashed)
+
+    for label, operation in (("inline", inline), ("pool", pooled)):
+        throughput, worst_stall = await measure_loop(operation, args.logins, args.concurrency)
+        print(f"{label:<7} {throughput:>8.1f} verifications/s, worst event loop stall {worst_stall:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email")
+    parser.add_argument("--password")
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--local", action="store_true", help="Benchmark hashing in-process instead of a server")
+    args = parser.parse_args()
+
+    if args.local:
+        asyncio.run(benchmark_local(args))
+    elif not args.email or not args.password:
+        parser.error("--email and --password are required unless --local is given")
+    else:
+        asyncio.run(benchmark_server(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark proximity search against the configured database.
+
+Runs the same query the browse endpoints use for ?near_zip= (bounding box on
+ix_addresses_latitude_longitude, then haversine filter and sort) for a set of
+radii, and prints the median latency and row counts. With --explain, prints
+the EXPLAIN ANALYZE plan for each radius so the index usage can be checked.
+
+Usage: python scripts/benchmark_proximity_search.py 20814 [--radius 5 25 100] [--runs 20] [--explain]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.geo import distance_miles, get_zip_coordinates, within_bounding_box
+from app.models.provider import Provider
+from app.models.provider_institution import ProviderInstitution
+from sqlalchemy import select, text
+from sqlalchemy.dialects import postgresql
+
+
+def proximity_query(model, origin, radius: float):
+    distance = distance_miles(*origin)
+    return (
+        select(model.id, distance)
+        .join(model.address)
+        .filter(within_bounding_box(*origin, radius), distance <= radius)
+        .order_by(distance)
+    )
+
+
+async def benchmark(zip_code: str, radii: list, runs: int, explain: bool):
+    async with AsyncSessionLocal() as session:
+        origin = await get_zip_coordinates(session, zip_code)
+        if origin is None:
+            sys.exit(f"Unknown ZIP code {zip_code}; load centroids with scripts/load_zip_centroids.py first")
+
+        print(f"{'table':<24} {'radius':>8} {'rows':>8} {'median ms':>10} {'p95 ms':>8}")
+        for model in (Provider, ProviderInstitution):
+            for radius in radii:
+                query = proximity_query(model, origin, radius)
+                timings = []
+                rows = 0
+                for _ in range(runs):
+                    start = time.perf_counter()
+                    rows = len((await session.execute(query)).all())
+                    timings.append((time.perf_counter() - start) * 1000)
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(
+                    f"{model.__tablename__:<24} {radius:>8g} {rows:>8} {statistics.median(timings):>10.2f} {p95:>8.2f}"
+                )
+
+                if explain:
+                    compiled = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+                    plan = await session.execute(text(f"EXPLAIN ANALYZE {compiled}"))
+                    print("\n".join(f"    {line}" for (line,) in plan.all()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("zip_code", help="ZIP code at the centre of the search")
+    parser.add_argument("--radius", type=float, nargs="+", default=[5, 25, 100], help="Radii in miles")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--explain", action="store_true", help="Print EXPLAIN ANALYZE for each query")
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.zip_code, args.radius, args.runs, args.explain))
+
+
+if __name__ == "__main__":
+    main()
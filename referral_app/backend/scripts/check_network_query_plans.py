@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Check that the network list queries stay index-only on user_provider_networks.
+
+Runs EXPLAIN (FORMAT JSON) for the queries behind GET /api/providers and
+GET /api/provider-institutions (app/network_queries.py) and fails unless every
+scan of user_provider_networks is an Index Only Scan on the expected composite
+index. Exits non-zero on a regression, so it can run in CI against a migrated
+database.
+
+Sequential scans are disabled for the check by default: on a small development
+database the planner rightly prefers them, but the point is that an index-only
+plan exists. Index-only scans also depend on the visibility map, so run with
+--vacuum on a freshly loaded database and --analyze to see heap fetches.
+
+Usage: python scripts/check_network_query_plans.py [--user-id UUID] [--vacuum] [--analyze] [--allow-seqscan]
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal, engine
+from app.models.user_provider_network import UserProviderNetwork
+from app.network_queries import network_institutions_query, network_providers_query
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql
+
+NETWORK_TABLE = UserProviderNetwork.__tablename__
+
+# query name -> (query builder, index that must serve the user_provider_networks side)
+CHECKS = {
+    "providers": (network_providers_query, "unique_user_provider"),
+    "provider_institutions": (network_institutions_query, "unique_user_institution"),
+}
+
+LARGEST_NETWORK_QUERY = (
+    select(UserProviderNetwork.user_id).group_by(UserProviderNetwork.user_id).order_by(func.count().desc()).limit(1)
+)
+
+
+def iter_plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def check_plan(plan: dict, expected_index: str) -> list:
+    """Problems with the user_provider_networks scans in a plan (empty if it is index-only)."""
+    scans = [node for node in iter_plan_nodes(plan) if node.get("Relation Name") == NETWORK_TABLE]
+    if not scans:
+        return [f"no scan of {NETWORK_TABLE} in plan"]
+    problems = []
+    for node in scans:
+        if node["Node Type"] != "Index Only Scan" or node.get("Index Name") != expected_index:
+            scanned = node.get("Index Name", NETWORK_TABLE)
+            problems.append(f"{node['Node Type']} on {scanned}, expected Index Only Scan on {expected_index}")
+    return problems
+
+
+async def vacuum_network_table():
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"VACUUM ANALYZE {NETWORK_TABLE}"))
+
+
+async def check_query_plans(user_id, analyze: bool, allow_seqscan: bool) -> bool:
+    ok = True
+    async with AsyncSessionLocal() as session:
+        if user_id is None:
+            user_id = (await session.execute(LARGEST_NETWORK_QUERY)).scalar_one_or_none()
+            if user_id is None:
+                sys.exit(f"{NETWORK_TABLE} is empty; pass --user-id or load some network entries first")
+        print(f"Checking plans for user {user_id}")
+
+        if not allow_seqscan:
+            await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        options = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+        for name, (build_query, expected_index) in CHECKS.items():
+            compiled = build_query(user_id).compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            result = await session.execute(text(f"EXPLAIN ({options}) {compiled}"))
+            explain = result.scalar_one()
+            plan = (json.loads(explain) if isinstance(explain, str) else explain)[0]["Plan"]
+
+            problems = check_plan(plan, expected_index)
+            heap_fetches = [
+                node["Heap Fetches"]
+                for node in iter_plan_nodes(plan)
+                if node.get("Relation Name") == NETWORK_TABLE and "Heap Fetches" in node
+            ]
+            detail = f" (heap fetches: {sum(heap_fetches)})" if heap_fetches else ""
+            if problems:
+                ok = False
+                print(f"FAIL {name}: {'; '.join(problems)}")
+                print(json.dumps(plan, indent=2))
+            else:
+                print(f"ok   {name}: Index Only Scan on {expected_index}{detail}")
+
+        await session.rollback()
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Check network list queries use index-only scans.")
+    parser.add_argument("--user-id", help="User whose network to plan for (default: the largest network)")
+    parser.add_argument("--vacuum", action="store_true", help=f"VACUUM ANALYZE {NETWORK_TABLE} first")
+    parser.add_argument("--analyze", action="store_true", help="Use EXPLAIN ANALYZE and report heap fetches")
+    parser.add_argument("--allow-seqscan", action="store_true", help="Leave enable_seqscan on")
+    return parser.parse_args()
+
+
+async def main(args) -> bool:
+    if args.vacuum:
+        await vacuum_network_table()
+    return await check_query_plans(args.user_id, args.analyze, args.allow_seqscan)
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(main(parse_args())) else 1)
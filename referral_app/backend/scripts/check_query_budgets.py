@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Check the read endpoints against their database query budgets.
+
+Logs in against a running API started with QUERY_STATS_HEADERS on (the
+default when ENVIRONMENT=local), requests each endpoint in BUDGETS and fails
+when one issues more statements than its budget, as reported by the
+X-DB-Query-Count header (app/query_stats.py). Exits non-zero on a regression,
+so it can run in CI against a seeded database (python -m loadtest seed).
+
+Budgets count every statement of the request, including reading the
+network/directory versions for the ETag. They were measured against a
+database seeded with the defaults (--scale 1) and assume warm caches: the
+login fills the user cache, and with --repeat 2 the network cache is filled by
+the first request of each endpoint. Reseeding at another scale changes the
+unpaginated listings' counts (see BUDGETS).
+
+Usage: python scripts/check_query_budgets.py --email user-0@loadtest.example.com --password loadtest-password
+           [--base-url http://localhost:8000] [--repeat 2]
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+import httpx
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.query_stats import QUERY_COUNT_HEADER, QUERY_TIME_HEADER, QueryBudgetExceeded, assert_query_budget
+
+# (path, query params) -> most statements the request may issue, as measured against
+# `python -m loadtest seed` (scale 1, seed 0) with a warm user and network cache. Each
+# listing starts with the versions query for its ETag; selectinload issues one query per
+# relationship and per 500 parent rows, so unpaginated listings grow with the data.
+BUDGETS = {
+    # The user comes from the cache
+    ("/api/users/me", ()): 0,
+    # Versions, providers, then selectinload for addresses, institutions and their addresses
+    ("/api/providers", ()): 5,
+    # Versions, institutions with their address joined in
+    ("/api/provider-institutions", ()): 2,
+    # Versions, entries, then selectinload for providers, institutions and their addresses
+    ("/api/network", ()): 8,
+    # Versions, 5,000 providers, 10 address batches, institutions and their addresses
+    ("/api/browse/providers", ()): 14,
+    ("/api/browse/providers", (("search", "smith"),)): 5,
+    # Versions, 520 institutions, 2 address batches
+    ("/api/browse/provider-institutions", ()): 4,
+    ("/api/referrals", ()): 1,
+    # Institution, then its address
+    ("/api/my-institution", ()): 2,
+}
+
+
+async def check(args) -> int:
+    failures = 0
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        response = await client.post("/api/auth/jwt/login", data={"username": args.email, "password": args.password})
+        response.raise_for_status()
+        client.headers["Authorization"] = f"Bearer {response.json()['access_token']}"
+
+        print(f"{'endpoint':<48} {'queries':>7} {'budget':>6} {'db ms':>8}")
+        for (path, params), budget in BUDGETS.items():
+            for _ in range(args.repeat):
+                response = await client.get(path, params=dict(params))
+            label = path + ("?" + "&".join(f"{key}={value}" for key, value in params) if params else "")
+            try:
+                assert_query_budget(response, budget)
+                verdict = ""
+            except QueryBudgetExceeded as e:
+                failures += 1
+                verdict = f"  OVER BUDGET ({e})"
+            count = response.headers.get(QUERY_COUNT_HEADER, "?")
+            db_ms = response.headers.get(QUERY_TIME_HEADER, "?")
+            print(f"{label:<48} {count:>7} {budget:>6} {db_ms:>8}{verdict}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--repeat", type=int, default=2, help="Requests per endpoint; the last one is checked")
+    args = parser.parse_args()
+
+    failures = asyncio.run(check(args))
+    if failures:
+        print(f"\n{failures} endpoint(s) over their query budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Compress referral documents the referral_documents migration copied over as-is.
+
+Migration 20261019120000_referral_documents moves referrals.raw_text into
+referral_documents uncompressed (codec 'none': Postgres cannot zlib in SQL).
+They read fine, but take as much space as before. Run this once after the
+migration: it rewrites them through ReferralDocument.raw_text, which stores
+the text zlib-compressed. Safe to re-run; only 'none' rows are touched.
+
+Usage: python scripts/compress_referral_documents.py [--batch-size 500] [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.models.referral_document import CODEC_NONE, ReferralDocument
+from sqlalchemy import func, select
+from sqlalchemy.orm import undefer
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+async def compress_referral_documents(batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False):
+    start = time.perf_counter()
+    compressed = 0
+    before_bytes = 0
+    after_bytes = 0
+
+    async with AsyncSessionLocal() as session:
+        pending = (
+            await session.execute(
+                select(func.count()).select_from(ReferralDocument).where(ReferralDocument.raw_text_codec == CODEC_NONE)
+            )
+        ).scalar_one()
+        logger.info(f"{pending} uncompressed referral documents")
+
+        last_id = None
+        while True:
+            query = (
+                select(ReferralDocument)
+                .options(undefer(ReferralDocument.raw_text_compressed))
+                .where(ReferralDocument.raw_text_codec == CODEC_NONE)
+                .order_by(ReferralDocument.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                query = query.where(ReferralDocument.id > last_id)
+            documents = (await session.execute(query)).scalars().all()
+            if not documents:
+                break
+
+            for document in documents:
+                before_bytes += len(document.raw_text_compressed or b"")
+                # The setter re-encodes with zlib
+                document.raw_text = document.raw_text
+                after_bytes += len(document.raw_text_compressed or b"")
+            last_id = documents[-1].id
+            compressed += len(documents)
+
+            if dry_run:
+                await session.rollback()
+            else:
+                await session.commit()
+            logger.info(f"Compressed {compressed}/{pending} documents")
+
+    logger.info(
+        f"{'Would compress' if dry_run else 'Compressed'} {compressed} documents "
+        f"({before_bytes} -> {after_bytes} bytes) in {time.perf_counter() - start:.1f}s"
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Compress referral documents left uncompressed by the migration.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Documents per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Report the savings without writing")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(compress_referral_documents(args.batch_size, args.dry_run))
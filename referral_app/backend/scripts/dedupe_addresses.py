@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Backfill addresses.normalized_hash and merge duplicate addresses.
+
+Run once after applying migration 20261019150000_addresses_normalized_hash.
+Addresses without a hash are hashed oldest first. The first row for each
+normalized address is kept, and later duplicates are merged into it: providers,
+provider institutions and patients are repointed and the duplicate rows are
+deleted. With --prune-orphans, addresses nothing references any more (left
+behind by address edits) are removed as well.
+
+Usage: python scripts/dedupe_addresses.py [--batch-size 1000] [--dry-run] [--prune-orphans]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.address_normalization import normalized_address_hash
+from app.database import AsyncSessionLocal
+from app.models.address import Address
+from app.models.directory_version import deferred_directory_version
+from sqlalchemy import any_, bindparam, delete, func, select, text, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+
+UUID_ARRAY = ARRAY(UUID(as_uuid=True))
+
+# Tables with an address_id foreign key
+REFERENCING_TABLES = ("providers", "provider_institutions", "patients")
+
+HASHED_QUERY = select(Address.normalized_hash, Address.id).where(Address.normalized_hash.isnot(None))
+
+UNHASHED_QUERY = (
+    select(
+        Address.id,
+        Address.street_address_1,
+        Address.street_address_2,
+        Address.city,
+        Address.state,
+        Address.zip_code,
+        Address.country,
+    )
+    .where(Address.normalized_hash.is_(None))
+    .order_by(Address.datetime_created, Address.id)
+)
+
+DELETE_DUPLICATES = delete(Address).where(Address.id == any_(bindparam("ids", type_=UUID_ARRAY)))
+
+ORPHANS_SQL = text(
+    "DELETE FROM addresses a WHERE "
+    + " AND ".join(f"NOT EXISTS (SELECT 1 FROM {table} t WHERE t.address_id = a.id)" for table in REFERENCING_TABLES)
+)
+
+
+def repoint_sql(table: str):
+    """Move references from duplicate addresses to their canonical row."""
+    return text(
+        f"UPDATE {table} SET address_id = m.canonical_id "
+        "FROM unnest(:duplicate_ids, :canonical_ids) AS m(duplicate_id, canonical_id) "
+        f"WHERE {table}.address_id = m.duplicate_id"
+    ).bindparams(
+        bindparam("duplicate_ids", type_=UUID_ARRAY),
+        bindparam("canonical_ids", type_=UUID_ARRAY),
+    )
+
+
+async def count_addresses(session) -> int:
+    return (await session.execute(select(func.count()).select_from(Address))).scalar_one()
+
+
+async def dedupe_addresses(batch_size: int = DEFAULT_BATCH_SIZE, dry_run: bool = False, prune_orphans: bool = False):
+    """Hash unhashed addresses, merge duplicates in batches, and report the table shrinkage."""
+    start = time.perf_counter()
+
+    async with AsyncSessionLocal() as session, deferred_directory_version(session, bump=not dry_run):
+        before = await count_addresses(session)
+
+        canonical_ids = dict((await session.execute(HASHED_QUERY)).all())
+        rows = (await session.execute(UNHASHED_QUERY)).all()
+        logger.info(f"{before} addresses, {len(canonical_ids)} already hashed, {len(rows)} to process")
+
+        hash_updates = []
+        duplicates = []
+        for row in rows:
+            address_hash = normalized_address_hash(row._mapping)
+            canonical_id = canonical_ids.get(address_hash)
+            if canonical_id is None:
+                canonical_ids[address_hash] = row.id
+                hash_updates.append({"id": row.id, "normalized_hash": address_hash})
+            else:
+                duplicates.append((row.id, canonical_id))
+
+        logger.info(f"{len(hash_updates)} distinct addresses, {len(duplicates)} duplicates to merge")
+        if dry_run:
+            return
+
+        for offset in range(0, len(duplicates), batch_size):
+            batch = duplicates[offset : offset + batch_size]
+            params = {"duplicate_ids": [pair[0] for pair in batch], "canonical_ids": [pair[1] for pair in batch]}
+            for table in REFERENCING_TABLES:
+                await session.execute(repoint_sql(table), params)
+            await session.execute(DELETE_DUPLICATES, {"ids": params["duplicate_ids"]})
+            await session.commit()
+            logger.info(f"Merged {min(offset + batch_size, len(duplicates))}/{len(duplicates)} duplicates")
+
+        for offset in range(0, len(hash_updates), batch_size):
+            await session.execute(update(Address), hash_updates[offset : offset + batch_size])
+            await session.commit()
+        logger.info(f"Hashed {len(hash_updates)} addresses")
+
+        if prune_orphans:
+            result = await session.execute(ORPHANS_SQL)
+            await session.commit()
+            logger.info(f"Removed {result.rowcount} unreferenced addresses")
+
+        after = await count_addresses(session)
+
+    logger.info(f"Addresses: {before} -> {after} ({before - after} removed) in {time.perf_counter() - start:.1f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backfill normalized address hashes and merge duplicate addresses.")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Duplicates merged per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Report what would be merged without writing")
+    parser.add_argument("--prune-orphans", action="store_true", help="Also delete addresses nothing references")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    asyncio.run(dedupe_addresses(args.batch_size, args.dry_run, args.prune_orphans))
@@ -0,0 +1,159 @@
+"""
+Streaming readers for provider directory files.
+
+Reads records one at a time from either a JSON array file (like
+assets/mesfin.json) or an NDJSON file (one object per line, .ndjson/.jsonl),
+so memory use stays flat regardless of file size. Records without an "id" get
+a deterministic UUID (from their NPI, or else from name + address), which
+replaces the separate preprocessing pass.
+"""
+
+import hashlib
+import json
+import re
+import uuid
+from itertools import islice
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Optional
+
+# Namespace for deterministic institution IDs (uuid5 over the NPI, or name + address)
+DIRECTORY_NAMESPACE = uuid.UUID("6f3c1f0e-2b7d-5c39-9a51-4f6e1c8d2a70")
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+
+READ_SIZE = 64 * 1024
+
+WHITESPACE = " \t\r\n"
+
+# Source fields that end up in the database; changes to anything else are ignored
+HASHED_FIELDS = ("name", "type", "phone", "email", "website", "address")
+
+
+def record_uuid(record: dict) -> uuid.UUID:
+    """
+    Return the record's institution UUID.
+
+    Uses the record's "id" when present (e.g. assets/mesfin_preprocessed.json,
+    which earlier imports were loaded from), otherwise a uuid5 of its NPI, and
+    only for records with neither a uuid5 of name and address. The last one
+    changes when the name or address does; the sync then matches the record to
+    the row it used to have by phone or name (see normalized_phone).
+    """
+    if record.get("id"):
+        return uuid.UUID(record["id"])
+
+    if record.get("npi"):
+        return uuid.uuid5(DIRECTORY_NAMESPACE, f"npi:{str(record['npi']).strip()}")
+
+    if "name" not in record:
+        raise ValueError(f"Missing name for record: {record}")
+
+    key = f"{record['name'].strip().lower()}|{(record.get('address') or '').strip().lower()}"
+    return uuid.uuid5(DIRECTORY_NAMESPACE, key)
+
+
+def normalized_phone(phone: Optional[str]) -> Optional[str]:
+    """The last 10 digits of a US phone number ("(301) 841-8300" -> "3018418300"), or None."""
+    digits = re.sub(r"\D", "", phone or "")
+    return digits[-10:] if len(digits) >= 10 else None
+
+
+def record_hash(record: dict) -> str:
+    """Return a sha256 hex digest of the record's stored fields, for change detection."""
+    content = {field: record.get(field) for field in HASHED_FIELDS}
+    encoded = json.dumps(content, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def iter_json_array(file: IO[str], read_size: int = READ_SIZE) -> Iterator[dict]:
+    """
+    Yield the elements of a top-level JSON array without loading the whole file.
+
+    Args:
+        file: Text file object positioned at the start of the array
+        read_size: Characters read per refill
+
+    Raises:
+        ValueError: If the file is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def refill() -> bool:
+        """Drop consumed input and read more; returns False at end of file."""
+        nonlocal buffer, position, eof
+        if eof:
+            return False
+        chunk = file.read(read_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def next_token() -> str:
+        """Skip whitespace and return the next character without consuming it."""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position] in WHITESPACE:
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not refill():
+                raise ValueError("Unexpected end of JSON input")
+
+    if next_token() != "[":
+        raise ValueError("Expected a JSON array")
+    position += 1
+
+    if next_token() == "]":
+        return
+
+    while True:
+        next_token()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if refill():
+                    continue
+                raise
+            # A value ending exactly at the buffer edge may be truncated (e.g. a number)
+            if end == len(buffer) and refill():
+                continue
+            break
+        position = end
+        yield value
+
+        separator = next_token()
+        position += 1
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, got {separator!r}")
+
+
+def iter_ndjson(file: IO[str]) -> Iterator[dict]:
+    """Yield one record per non-blank line."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_records(path: Path) -> Iterator[dict]:
+    """Stream records from a JSON array or NDJSON directory file."""
+    with open(path, encoding="utf-8") as f:
+        if path.suffix in NDJSON_SUFFIXES:
+            yield from iter_ndjson(f)
+        else:
+            yield from iter_json_array(f)
+
+
+def iter_batches(records: Iterable[dict], batch_size: int) -> Iterator[List[dict]]:
+    """Group records into lists of at most batch_size."""
+    iterator = iter(records)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
@@ -0,0 +1,660 @@
+#!/usr/bin/env python3
+"""
+Import global providers from the NPPES NPI registry dissemination file.
+
+Streams the monthly NPPES CSV (npidata_pfile_*.csv, several GB), keeps active
+NPIs matching the requested taxonomy codes and practice states, and upserts
+them in batches:
+
+- Entity type 1 (individuals) become global Provider rows
+- Entity type 2 (organizations) become global ProviderInstitution rows
+- The business practice location becomes an Address row, shared with any
+  existing row for the same normalized address
+
+Each batch is COPY'd into temp staging tables and merged with
+INSERT ... SELECT ... ON CONFLICT (id) DO UPDATE, so re-running the same file
+updates rows in place. Provider and institution IDs are derived from the NPI
+(existing global providers with the same NPI keep their ID). After each
+committed batch the number of source rows consumed is written to a checkpoint
+file, and --resume continues from there. Only the first row of an NPI is
+imported, but the NPIs already seen are not part of the checkpoint: after a
+resume, a repeat of an NPI imported before the interruption updates its row
+instead of being counted as a duplicate (NPPES lists each NPI once).
+
+Usage:
+    python scripts/import_nppes_providers.py npidata_pfile.csv --state MD --state DC --taxonomy 2251
+    python scripts/import_nppes_providers.py npidata_pfile.csv --state MD --resume
+    python scripts/import_nppes_providers.py nppes_sample.csv --dry-run     # parse and filter only
+    python scripts/import_nppes_providers.py nppes_sample.csv --write-sample 1000
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import os
+import random
+import sys
+import time
+import uuid as uuid_lib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.address_normalization import normalized_address_hash
+from app.database import AsyncSessionLocal
+from app.models.directory_version import deferred_directory_version
+from app.models.provider import Provider
+from sqlalchemy import any_, bindparam, select, text
+from sqlalchemy.dialects.postgresql import ARRAY
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Namespace for NPI-derived row IDs
+NPPES_NAMESPACE = uuid_lib.UUID("3b0f6d2e-8c4a-5e71-b9d2-7a1c5f04e6b8")
+
+# NPPES dissemination file columns used by the importer
+COL_NPI = "NPI"
+COL_ENTITY_TYPE = "Entity Type Code"
+COL_ORGANIZATION_NAME = "Provider Organization Name (Legal Business Name)"
+COL_LAST_NAME = "Provider Last Name (Legal Name)"
+COL_FIRST_NAME = "Provider First Name"
+COL_ADDRESS_1 = "Provider First Line Business Practice Location Address"
+COL_ADDRESS_2 = "Provider Second Line Business Practice Location Address"
+COL_CITY = "Provider Business Practice Location Address City Name"
+COL_STATE = "Provider Business Practice Location Address State Name"
+COL_POSTAL_CODE = "Provider Business Practice Location Address Postal Code"
+COL_COUNTRY = "Provider Business Practice Location Address Country Code (If outside U.S.)"
+COL_PHONE = "Provider Business Practice Location Address Telephone Number"
+COL_FAX = "Provider Business Practice Location Address Fax Number"
+COL_DEACTIVATION_DATE = "NPI Deactivation Date"
+COL_REACTIVATION_DATE = "NPI Reactivation Date"
+TAXONOMY_SLOTS = range(1, 16)
+COL_TAXONOMY = "Healthcare Provider Taxonomy Code_{}"
+COL_PRIMARY_TAXONOMY = "Healthcare Provider Primary Taxonomy Switch_{}"
+
+ENTITY_INDIVIDUAL = "1"
+ENTITY_ORGANIZATION = "2"
+
+ADDRESS_COLUMNS = (
+    "id",
+    "street_address_1",
+    "street_address_2",
+    "city",
+    "state",
+    "zip_code",
+    "country",
+    "normalized_hash",
+)
+INSTITUTION_COLUMNS = ("id", "name", "type", "phone", "address_id")
+PROVIDER_COLUMNS = (
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone",
+    "fax",
+    "npi",
+    "specialty",
+    "address_id",
+    "global_provider",
+)
+
+# Columns left untouched when a row already exists (NPPES has no email, so keep one entered by hand)
+KEEP_ON_UPDATE = {"id", "email", "global_provider"}
+
+# Columns only overwritten with a value: a row without a usable practice address keeps the one it has
+KEEP_IF_NULL = {"address_id"}
+
+# Staging tables live for the session; rows are dropped at each commit
+STAGING_TABLES = {
+    "nppes_stage_addresses": "addresses",
+    "nppes_stage_institutions": "provider_institutions",
+    "nppes_stage_providers": "providers",
+}
+
+# Existing global providers with one of a set of NPIs (created before this importer ran)
+EXISTING_PROVIDERS_QUERY = select(Provider.npi, Provider.id).where(
+    Provider.npi == any_(bindparam("npis", type_=ARRAY(Provider.npi.type))),
+    Provider.created_by_user_id.is_(None),
+)
+
+
+@dataclass
+class NppesRecord:
+    """One filtered NPPES row, reduced to the columns we store."""
+
+    npi: str
+    entity_type: str
+    organization_name: str
+    first_name: str
+    last_name: str
+    taxonomy: Optional[str]
+    phone: Optional[str]
+    fax: Optional[str]
+    address: Optional[Dict[str, Optional[str]]]
+
+
+def format_phone(value: str) -> Optional[str]:
+    """Format a 10-digit NPPES phone/fax number as (XXX) XXX-XXXX; other lengths are dropped."""
+    digits = "".join(char for char in value if char.isdigit())
+    if len(digits) == 11 and digits.startswith("1"):
+        digits = digits[1:]
+    if len(digits) != 10:
+        return None
+    return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+
+
+def format_zip(value: str) -> str:
+    """NPPES stores ZIP+4 without a dash (e.g. 208151234)."""
+    value = value.strip()
+    if len(value) == 9 and value.isdigit():
+        return f"{value[:5]}-{value[5:]}"
+    return value[:10]
+
+
+def derived_id(kind: str, npi: str) -> uuid_lib.UUID:
+    """Stable row ID for an NPI, so re-imports update the same rows."""
+    return uuid_lib.uuid5(NPPES_NAMESPACE, f"{kind}:{npi}")
+
+
+class NppesReader:
+    """
+    Stream and filter an NPPES dissemination CSV.
+
+    Column positions are resolved once from the header so each row is only
+    indexed, never turned into a dict. Rows are filtered on the cheap columns
+    (entity type, state) before the taxonomy slots are scanned.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        states: Sequence[str] = (),
+        taxonomies: Sequence[str] = (),
+        entity_types: Sequence[str] = (ENTITY_INDIVIDUAL, ENTITY_ORGANIZATION),
+    ):
+        self.path = path
+        self.states = {state.upper() for state in states}
+        self.taxonomies = tuple(taxonomies)
+        self.entity_types = set(entity_types)
+
+    def _match_taxonomy(self, codes: List[str]) -> bool:
+        if not self.taxonomies:
+            return True
+        return any(code.startswith(self.taxonomies) for code in codes if code)
+
+    def records(self, skip_rows: int = 0) -> Iterator[Tuple[int, Optional[NppesRecord]]]:
+        """
+        Yield (row_number, record) for every source row after skip_rows.
+
+        record is None for rows that are filtered out, so callers can checkpoint
+        on source row numbers rather than on matches.
+        """
+        with open(self.path, newline="", encoding="utf-8", errors="replace") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            index = {name: position for position, name in enumerate(header)}
+            missing = [column for column in (COL_NPI, COL_ENTITY_TYPE, COL_STATE) if column not in index]
+            if missing:
+                raise ValueError(f"Not an NPPES dissemination file, missing columns: {missing}")
+
+            def column(row: List[str], name: str) -> str:
+                position = index.get(name)
+                return row[position].strip() if position is not None and position < len(row) else ""
+
+            taxonomy_columns = [
+                (index.get(COL_TAXONOMY.format(slot)), index.get(COL_PRIMARY_TAXONOMY.format(slot)))
+                for slot in TAXONOMY_SLOTS
+                if COL_TAXONOMY.format(slot) in index
+            ]
+
+            for row_number, row in enumerate(reader, start=1):
+                if row_number <= skip_rows:
+                    continue
+
+                entity_type = column(row, COL_ENTITY_TYPE)
+                state = column(row, COL_STATE).upper()
+                if entity_type not in self.entity_types or (self.states and state not in self.states):
+                    yield row_number, None
+                    continue
+
+                # Deactivated NPIs (without a later reactivation) are skipped
+                if column(row, COL_DEACTIVATION_DATE) and not column(row, COL_REACTIVATION_DATE):
+                    yield row_number, None
+                    continue
+
+                codes = []
+                primary = None
+                for code_position, switch_position in taxonomy_columns:
+                    code = row[code_position].strip() if code_position < len(row) else ""
+                    if not code:
+                        continue
+                    codes.append(code)
+                    if switch_position is not None and switch_position < len(row) and row[switch_position] == "Y":
+                        primary = code
+                if not self._match_taxonomy(codes):
+                    yield row_number, None
+                    continue
+
+                address = None
+                street = column(row, COL_ADDRESS_1)
+                city = column(row, COL_CITY)
+                if street and city and len(state) == 2 and column(row, COL_COUNTRY) in ("", "US"):
+                    address = {
+                        "street_address_1": street[:255],
+                        "street_address_2": column(row, COL_ADDRESS_2)[:255] or None,
+                        "city": city[:100],
+                        "state": state,
+                        "zip_code": format_zip(column(row, COL_POSTAL_CODE)),
+                        "country": "USA",
+                    }
+
+                yield (
+                    row_number,
+                    NppesRecord(
+                        npi=column(row, COL_NPI),
+                        entity_type=entity_type,
+                        organization_name=column(row, COL_ORGANIZATION_NAME),
+                        first_name=column(row, COL_FIRST_NAME),
+                        last_name=column(row, COL_LAST_NAME),
+                        taxonomy=primary or (codes[0] if codes else None),
+                        phone=format_phone(column(row, COL_PHONE)),
+                        fax=format_phone(column(row, COL_FAX)),
+                        address=address,
+                    ),
+                )
+
+
+class Checkpoint:
+    """
+    Progress of an import, persisted as JSON next to the source file.
+
+    Stores the number of source rows whose batch has been committed, along
+    with the file size and modification time so a checkpoint is never applied
+    to a different file.
+    """
+
+    def __init__(self, path: Path, source: Path):
+        self.path = path
+        stat = source.stat()
+        self.identity = {"source": str(source.resolve()), "size": stat.st_size, "mtime": int(stat.st_mtime)}
+        self.rows_done = 0
+        self.stats = {"providers": 0, "institutions": 0, "created": 0, "updated": 0, "skipped": 0, "duplicates": 0}
+
+    def load(self) -> bool:
+        """Restore progress; returns False when there is no usable checkpoint."""
+        if not self.path.exists():
+            return False
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("identity") != self.identity:
+            logger.warning(f"Checkpoint {self.path} belongs to a different source file, starting over")
+            return False
+        self.rows_done = data["rows_done"]
+        self.stats.update(data["stats"])
+        return True
+
+    def save(self, rows_done: int, complete: bool = False):
+        """Atomically write progress after a committed batch."""
+        self.rows_done = rows_done
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"identity": self.identity, "rows_done": rows_done, "complete": complete, "stats": self.stats}, f)
+        os.replace(tmp_path, self.path)
+
+
+def build_address_rows(records: List[NppesRecord]) -> Tuple[List[tuple], Dict[str, str]]:
+    """
+    Build COPY tuples for the batch's distinct addresses.
+
+    Returns:
+        Tuple of (address_rows in ADDRESS_COLUMNS order, normalized_hash by NPI)
+    """
+    address_rows = {}
+    hash_by_npi = {}
+    for record in records:
+        if not record.address:
+            continue
+        address_hash = normalized_address_hash(record.address)
+        hash_by_npi[record.npi] = address_hash
+        if address_hash not in address_rows:
+            address_rows[address_hash] = (
+                uuid_lib.uuid4(),
+                *(record.address[column] for column in ADDRESS_COLUMNS[1:-1]),
+                address_hash,
+            )
+    return list(address_rows.values()), hash_by_npi
+
+
+def build_rows(
+    records: List[NppesRecord],
+    existing_provider_ids: Dict[str, uuid_lib.UUID],
+    address_ids_by_npi: Dict[str, uuid_lib.UUID],
+) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Build COPY tuples for a batch of deduplicated records.
+
+    Returns:
+        Tuple of (institution_rows, provider_rows) in the column order of
+        INSTITUTION_COLUMNS and PROVIDER_COLUMNS
+    """
+    institution_rows = []
+    provider_rows = []
+
+    for record in records:
+        address_id = address_ids_by_npi.get(record.npi)
+
+        if record.entity_type == ENTITY_ORGANIZATION:
+            institution_rows.append(
+                (
+                    derived_id("institution", record.npi),
+                    record.organization_name[:255],
+                    record.taxonomy,
+                    record.phone,
+                    address_id,
+                )
+            )
+        else:
+            provider_id = existing_provider_ids.get(record.npi) or derived_id("provider", record.npi)
+            provider_rows.append(
+                (
+                    provider_id,
+                    record.first_name[:100],
+                    record.last_name[:100],
+                    "",  # NPPES has no email address
+                    record.phone,
+                    record.fax,
+                    record.npi,
+                    record.taxonomy,
+                    address_id,
+                    True,
+                )
+            )
+
+    return institution_rows, provider_rows
+
+
+def upsert_sql(staging: str, table: str, columns: Sequence[str]) -> str:
+    """INSERT ... SELECT from a staging table, updating rows that already exist."""
+    column_list = ", ".join(columns)
+    updates = ", ".join(
+        f"{column} = COALESCE(EXCLUDED.{column}, {table}.{column})"
+        if column in KEEP_IF_NULL
+        else f"{column} = EXCLUDED.{column}"
+        for column in columns
+        if column not in KEEP_ON_UPDATE
+    )
+    return (
+        f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging} "
+        f"ON CONFLICT (id) DO UPDATE SET {updates}, datetime_updated = now() "
+        "RETURNING (xmax = 0) AS inserted"
+    )
+
+
+# Addresses are shared: reuse the row with the same normalized address instead of updating by ID
+ADDRESS_UPSERT_SQL = (
+    f"INSERT INTO addresses ({', '.join(ADDRESS_COLUMNS)}) "
+    f"SELECT {', '.join(ADDRESS_COLUMNS)} FROM nppes_stage_addresses "
+    "ON CONFLICT (normalized_hash) DO UPDATE SET normalized_hash = EXCLUDED.normalized_hash "
+    "RETURNING normalized_hash, id"
+)
+
+
+async def copy_batch(
+    session, records: List[NppesRecord], existing_provider_ids: Dict[str, uuid_lib.UUID]
+) -> Tuple[int, int]:
+    """
+    COPY one batch into the staging tables and merge it into the real tables.
+
+    Addresses go first so institutions and providers can point at the shared
+    address rows they resolve to.
+
+    Returns:
+        Tuple of (created, updated) row counts across institutions and providers
+    """
+    for staging, table in STAGING_TABLES.items():
+        await session.execute(
+            text(f"CREATE TEMP TABLE IF NOT EXISTS {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DELETE ROWS")
+        )
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+
+    address_rows, hash_by_npi = build_address_rows(records)
+    address_ids_by_npi = {}
+    if address_rows:
+        await driver_connection.copy_records_to_table(
+            "nppes_stage_addresses", records=address_rows, columns=list(ADDRESS_COLUMNS)
+        )
+        result = await session.execute(text(ADDRESS_UPSERT_SQL))
+        address_ids = dict(result.all())
+        address_ids_by_npi = {npi: address_ids[address_hash] for npi, address_hash in hash_by_npi.items()}
+
+    institution_rows, provider_rows = build_rows(records, existing_provider_ids, address_ids_by_npi)
+
+    created = 0
+    updated = 0
+    for staging, table, columns, rows in (
+        ("nppes_stage_institutions", "provider_institutions", INSTITUTION_COLUMNS, institution_rows),
+        ("nppes_stage_providers", "providers", PROVIDER_COLUMNS, provider_rows),
+    ):
+        if not rows:
+            continue
+        await driver_connection.copy_records_to_table(staging, records=rows, columns=list(columns))
+        result = await session.execute(text(upsert_sql(staging, table, columns)))
+        inserted_flags = result.scalars().all()
+        created += sum(1 for inserted in inserted_flags if inserted)
+        updated += sum(1 for inserted in inserted_flags if not inserted)
+
+    return created, updated
+
+
+def log_summary(stats: Dict[str, int], rows_read: int, elapsed: float, dry_run: bool):
+    """Log the import summary."""
+    logger.info("\n" + "=" * 60)
+    logger.info("DRY RUN COMPLETE (nothing written)" if dry_run else "NPPES IMPORT COMPLETE")
+    logger.info("=" * 60)
+    logger.info(f"Source rows read:  {rows_read}")
+    logger.info(f"Providers:         {stats['providers']}")
+    logger.info(f"Institutions:      {stats['institutions']}")
+    logger.info(f"Created:           {stats['created']}")
+    logger.info(f"Updated:           {stats['updated']}")
+    logger.info(f"Skipped:           {stats['skipped']}")
+    logger.info(f"Duplicate NPIs:    {stats['duplicates']}")
+    logger.info(f"Elapsed:           {elapsed:.1f}s ({rows_read / elapsed if elapsed else 0:,.0f} source rows/s)")
+    logger.info("=" * 60)
+
+
+async def import_nppes(
+    reader: NppesReader,
+    checkpoint: Checkpoint,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    resume: bool = False,
+    dry_run: bool = False,
+):
+    """
+    Stream the NPPES file into the database in committed batches.
+
+    A batch is flushed once it holds batch_size matching records; the
+    checkpoint then records the last source row covered by that batch.
+    """
+    skip_rows = 0
+    if resume and checkpoint.load():
+        skip_rows = checkpoint.rows_done
+        logger.info(f"Resuming after source row {skip_rows}")
+    else:
+        checkpoint.stats = dict.fromkeys(checkpoint.stats, 0)
+
+    stats = checkpoint.stats
+    start = time.perf_counter()
+    # Not checkpointed (see the module docstring): duplicates are only caught within one run
+    seen_npis = set()
+    batch: Dict[str, NppesRecord] = {}
+    last_row = skip_rows
+
+    async def flush(session, rows_done: int):
+        if batch:
+            individual_npis = [npi for npi, record in batch.items() if record.entity_type == ENTITY_INDIVIDUAL]
+            stats["providers"] += len(individual_npis)
+            stats["institutions"] += len(batch) - len(individual_npis)
+
+            if not dry_run:
+                existing_provider_ids = {}
+                if individual_npis:
+                    result = await session.execute(EXISTING_PROVIDERS_QUERY, {"npis": individual_npis})
+                    existing_provider_ids = dict(result.all())
+
+                created, updated = await copy_batch(session, list(batch.values()), existing_provider_ids)
+                await session.commit()
+                stats["created"] += created
+                stats["updated"] += updated
+            batch.clear()
+
+        if not dry_run:
+            checkpoint.save(rows_done)
+        elapsed = time.perf_counter() - start
+        logger.info(f"Progress: {rows_done} source rows ({(rows_done - skip_rows) / elapsed:,.0f} rows/s)")
+
+    async with AsyncSessionLocal() as session, deferred_directory_version(session, bump=not dry_run):
+        for row_number, record in reader.records(skip_rows):
+            last_row = row_number
+            if record is None:
+                continue
+
+            if record.entity_type == ENTITY_INDIVIDUAL and not (record.first_name and record.last_name):
+                stats["skipped"] += 1
+                continue
+            if record.entity_type == ENTITY_ORGANIZATION and not record.organization_name:
+                stats["skipped"] += 1
+                continue
+
+            if record.npi in seen_npis:
+                stats["duplicates"] += 1
+                continue
+            seen_npis.add(record.npi)
+            batch[record.npi] = record
+
+            if len(batch) >= batch_size:
+                await flush(session, row_number)
+
+        await flush(session, last_row)
+
+    if not dry_run:
+        checkpoint.save(last_row, complete=True)
+    log_summary(stats, last_row, time.perf_counter() - start, dry_run)
+
+
+SAMPLE_TAXONOMIES = ["225100000X", "207X00000X", "208600000X", "261QP2000X", "363LF0000X"]
+SAMPLE_STATES = ["MD", "DC", "VA", "PA"]
+
+
+def write_sample_csv(path: Path, rows: int, seed: int = 42):
+    """
+    Write a small NPPES-shaped CSV for trying the importer locally.
+
+    Includes both entity types, deactivated NPIs, repeated NPIs and rows
+    outside the sample states so every filter path is exercised.
+    """
+    rng = random.Random(seed)
+    header = [
+        COL_NPI,
+        COL_ENTITY_TYPE,
+        COL_ORGANIZATION_NAME,
+        COL_LAST_NAME,
+        COL_FIRST_NAME,
+        COL_ADDRESS_1,
+        COL_ADDRESS_2,
+        COL_CITY,
+        COL_STATE,
+        COL_POSTAL_CODE,
+        COL_COUNTRY,
+        COL_PHONE,
+        COL_FAX,
+        COL_DEACTIVATION_DATE,
+        COL_REACTIVATION_DATE,
+    ]
+    for slot in TAXONOMY_SLOTS:
+        header += [COL_TAXONOMY.format(slot), COL_PRIMARY_TAXONOMY.format(slot)]
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(header)
+        npis = []
+        for _ in range(rows):
+            npi = rng.choice(npis) if npis and rng.random() < 0.02 else str(rng.randint(1_000_000_000, 1_999_999_999))
+            npis.append(npi)
+            organization = rng.random() < 0.3
+            taxonomies = rng.sample(SAMPLE_TAXONOMIES, rng.randint(1, 2))
+            row = [
+                npi,
+                ENTITY_ORGANIZATION if organization else ENTITY_INDIVIDUAL,
+                f"Sample Clinic {npi[-4:]} LLC" if organization else "",
+                "" if organization else f"LAST{npi[-4:]}",
+                "" if organization else rng.choice(["JANE", "JOHN", "ALEX", "SAM"]),
+                f"{rng.randint(1, 9999)} WISCONSIN AVE",
+                rng.choice(["", "SUITE 100", "STE 1700"]),
+                rng.choice(["BETHESDA", "WASHINGTON", "ARLINGTON", "PHILADELPHIA"]),
+                rng.choice(SAMPLE_STATES),
+                f"{rng.randint(20001, 29999)}{rng.randint(0, 9999):04d}",
+                "US",
+                f"301555{rng.randint(0, 9999):04d}",
+                rng.choice(["", f"301556{rng.randint(0, 9999):04d}"]),
+                "05/01/2020" if rng.random() < 0.05 else "",
+                "",
+            ]
+            for slot in TAXONOMY_SLOTS:
+                if slot <= len(taxonomies):
+                    row += [taxonomies[slot - 1], "Y" if slot == 1 else "N"]
+                else:
+                    row += ["", ""]
+            writer.writerow(row)
+
+    logger.info(f"Wrote {rows} sample rows to {path}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import global providers from the NPPES dissemination CSV.")
+    parser.add_argument("file", type=Path, help="NPPES npidata_pfile CSV")
+    parser.add_argument("--state", action="append", default=[], help="Practice state to keep (repeatable)")
+    parser.add_argument(
+        "--taxonomy", action="append", default=[], help="Taxonomy code or code prefix to keep (repeatable)"
+    )
+    parser.add_argument(
+        "--entity-type",
+        action="append",
+        choices=[ENTITY_INDIVIDUAL, ENTITY_ORGANIZATION],
+        help="1 = individuals (providers), 2 = organizations (institutions); default both",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Matching records per COPY batch")
+    parser.add_argument("--checkpoint", type=Path, help="Checkpoint file (default: <file>.checkpoint.json)")
+    parser.add_argument("--resume", action="store_true", help="Continue from the checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="Parse and filter without touching the database")
+    parser.add_argument("--write-sample", type=int, metavar="ROWS", help="Write a synthetic NPPES CSV to file and exit")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.write_sample:
+        write_sample_csv(args.file, args.write_sample)
+        sys.exit(0)
+
+    if not args.file.exists():
+        logger.error(f"NPPES file not found: {args.file}")
+        sys.exit(1)
+
+    nppes_reader = NppesReader(
+        args.file, args.state, args.taxonomy, args.entity_type or (ENTITY_INDIVIDUAL, ENTITY_ORGANIZATION)
+    )
+    import_checkpoint = Checkpoint(args.checkpoint or args.file.with_suffix(".checkpoint.json"), args.file)
+    asyncio.run(import_nppes(nppes_reader, import_checkpoint, args.batch_size, args.resume, args.dry_run))
@@ -2,35 +2,66 @@
 """
 Import provider institutions from JSON into the database.
 
-This script reads preprocessed JSON data (with UUIDs) and imports provider
-institutions into the database. It parses address strings, checks for duplicates
-by UUID, and creates both Address and ProviderInstitution records.
+This script streams directory records from a JSON array or NDJSON file and
+imports provider institutions into the database. Records without an "id" get a
+deterministic UUID from their NPI or name + address, so no preprocessing pass is needed. It
+parses address strings, checks for duplicates by UUID, and creates both Address
+and ProviderInstitution records.
+
+Usage:
+    python scripts/import_provider_institutions.py                  # one row at a time
+    python scripts/import_provider_institutions.py --bulk           # batched multi-row inserts
+    python scripts/import_provider_institutions.py --bulk --batch-size 5000  # records per transaction
+    python scripts/import_provider_institutions.py --bulk --workers 8   # address parsing processes
+    python scripts/import_provider_institutions.py --bulk --file assets/statewide.ndjson
+    python scripts/import_provider_institutions.py --sync           # apply inserts/updates/soft-deletes
+    python scripts/import_provider_institutions.py --sync --dry-run --summary-file diff.json
 """
 
+import argparse
 import asyncio
 import json
 import logging
+import math
+import os
 import re
 import sys
+import time
 import uuid as uuid_lib
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import usaddress
 
-# Add the app directory to the path
+# Add the scripts and app directories to the path
+sys.path.insert(0, str(Path(__file__).parent))
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from app.database import AsyncSessionLocal
-from app.models.address import Address
+from directory_source import iter_batches, iter_records, normalized_phone, record_hash, record_uuid
+from app.address_normalization import normalized_address_hash
+from app.database import AsyncSessionLocal, values_chunks
+from app.models.address import address_upsert_statement
+from app.models.directory_version import deferred_directory_version
 from app.models.provider_institution import ProviderInstitution
-from sqlalchemy import select
+from sqlalchemy import any_, bindparam, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+# Smallest chunk worth sending to a worker process
+MIN_PARSE_CHUNK_SIZE = 100
+
+# "ST 12345" when the city has its own comma-separated part
+STATE_ZIP_PATTERN = re.compile(r"^([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$")
+
+# "City Name ST 12345" when city, state and zip share the last part
+CITY_STATE_ZIP_PATTERN = re.compile(r"^(.+?)\s+([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$")
+
 
 def parse_address(address_str: str) -> Dict[str, str]:
     """
@@ -45,6 +76,14 @@ def parse_address(address_str: str) -> Dict[str, str]:
     Raises:
         ValueError: If address cannot be parsed
     """
+    return parse_labeled_address(address_str)[0]
+
+
+def parse_labeled_address(address_str: str) -> Tuple[Dict[str, str], Optional[List[Tuple[str, str]]]]:
+    """
+    parse_address, plus the usaddress (token, label) pairs of street_address_1
+    followed by street_address_2 (None when usaddress couldn't label the street).
+    """
     # Split on last comma to separate street from city/state/zip
     parts = address_str.rsplit(",", 1)
     if len(parts) != 2:
@@ -55,17 +94,28 @@ def parse_address(address_str: str) -> Dict[str, str]:
 
     # Parse city, state, zip from location part
     # Pattern: "City Name, ST 12345" or "City Name ST 12345"
-    match = re.match(r"^(.+?)\s+([A-Z]{2})\s+(\d{5}(?:-\d{4})?)$", location_part)
-    if not match:
-        raise ValueError(f"Could not parse city/state/zip: {location_part}")
-
-    city = match.group(1).strip()
-    state = match.group(2)
-    zip_code = match.group(3)
+    state_zip_match = STATE_ZIP_PATTERN.match(location_part)
+    if state_zip_match:
+        # City is in its own comma-separated part at the end of the street part
+        street_city = street_part.rsplit(",", 1)
+        if len(street_city) != 2:
+            raise ValueError(f"Could not parse city: {address_str}")
+        street_part = street_city[0].strip()
+        city = street_city[1].strip()
+        state, zip_code = state_zip_match.groups()
+    else:
+        match = CITY_STATE_ZIP_PATTERN.match(location_part)
+        if not match:
+            raise ValueError(f"Could not parse city/state/zip: {location_part}")
+
+        city = match.group(1).strip()
+        state = match.group(2)
+        zip_code = match.group(3)
 
     # Parse street address using usaddress
     street_address_1 = street_part
     street_address_2 = None
+    street_tokens = None
 
     try:
         parsed = usaddress.parse(street_part)
@@ -76,14 +126,15 @@ def parse_address(address_str: str) -> Dict[str, str]:
 
         for component, label in parsed:
             if label in ["OccupancyType", "OccupancyIdentifier", "SubaddressType", "SubaddressIdentifier"]:
-                secondary_parts.append(component)
+                secondary_parts.append((component, label))
             else:
-                main_parts.append(component)
+                main_parts.append((component, label))
 
         if main_parts:
-            street_address_1 = " ".join(main_parts)
+            street_address_1 = " ".join(component for component, _ in main_parts)
         if secondary_parts:
-            street_address_2 = " ".join(secondary_parts)
+            street_address_2 = " ".join(component for component, _ in secondary_parts)
+        street_tokens = main_parts + secondary_parts
 
     except usaddress.RepeatedLabelError as e:
         # If usaddress can't parse it cleanly, use the original
@@ -91,7 +142,7 @@ def parse_address(address_str: str) -> Dict[str, str]:
         street_address_1 = street_part
         street_address_2 = None
 
-    return {
+    address = {
         "street_address_1": street_address_1,
         "street_address_2": street_address_2,
         "city": city,
@@ -99,41 +150,564 @@ def parse_address(address_str: str) -> Dict[str, str]:
         "zip_code": zip_code,
         "country": "USA",
     }
+    return address, street_tokens
+
+
+def parse_normalized_address(address_str: str) -> Dict[str, str]:
+    """parse_address plus the normalized_hash used to share address rows (hashed from the same parse)."""
+    address, street_tokens = parse_labeled_address(address_str)
+    address["normalized_hash"] = normalized_address_hash(address, street_tokens)
+    return address
+
+
+def _parse_address_chunk(address_strs: List[str]) -> List[Dict[str, str]]:
+    """Parse a chunk of addresses (runs in a worker process)."""
+    return [parse_normalized_address(address_str) for address_str in address_strs]
+
+
+def parse_chunks(unique: List[str], workers: int) -> List[List[str]]:
+    """Split distinct address strings into one chunk per worker (fewer if that would make them tiny)."""
+    chunk_size = max(MIN_PARSE_CHUNK_SIZE, math.ceil(len(unique) / workers))
+    return [unique[offset : offset + chunk_size] for offset in range(0, len(unique), chunk_size)]
+
+
+def parse_addresses(
+    address_strs: List[str], workers: int = 1, executor: Optional[Executor] = None
+) -> Dict[str, Dict[str, str]]:
+    """
+    Parse many address strings, each distinct string only once.
+
+    Parsing (regex + usaddress CRF tagging) is CPU-bound, so with workers > 1
+    the distinct strings are split into one chunk per worker and parsed across
+    a process pool.
+
+    Args:
+        address_strs: Address strings, possibly with repeats
+        workers: Number of worker processes (1 parses in-process)
+        executor: Existing pool of `workers` processes to reuse across calls
+
+    Returns:
+        Dictionary mapping each distinct address string to its parsed components
+        and normalized_hash
+
+    Raises:
+        ValueError: If any address cannot be parsed
+    """
+    unique = list(dict.fromkeys(address_strs))
+    chunks = parse_chunks(unique, workers)
+
+    if workers <= 1 or len(chunks) <= 1:
+        return {address_str: parse_normalized_address(address_str) for address_str in unique}
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_address_chunk, chunks))
+    else:
+        results = executor.map(_parse_address_chunk, chunks)
+
+    parsed = {}
+    for chunk, chunk_results in zip(chunks, results):
+        parsed.update(zip(chunk, chunk_results))
+    return parsed
+
+
+async def parse_addresses_in_background(
+    address_strs: List[str], workers: int, executor: Optional[Executor]
+) -> Dict[str, Dict[str, str]]:
+    """
+    parse_addresses without blocking the event loop while the pool works.
+
+    Lets an import parse the next batch's addresses while the current batch
+    is written to the database.
+    """
+    unique = list(dict.fromkeys(address_strs))
+    chunks = parse_chunks(unique, workers)
+    if executor is None or len(chunks) <= 1:
+        return parse_addresses(unique)
+
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(loop.run_in_executor(executor, _parse_address_chunk, chunk) for chunk in chunks))
+
+    parsed = {}
+    for chunk, chunk_results in zip(chunks, results):
+        parsed.update(zip(chunk, chunk_results))
+    return parsed
+
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Parsed addresses kept between batches (repeats are common in statewide listings)
+ADDRESS_CACHE_SIZE = 50_000
+
+ASSETS_DIR = Path(__file__).parent.parent / "assets"
+
+# Query to find which of a set of institution IDs already exist (one round trip, one array parameter)
+EXISTING_IDS_QUERY = select(ProviderInstitution.id).where(
+    ProviderInstitution.id == any_(bindparam("ids", type_=ARRAY(UUID(as_uuid=True))))
+)
+
+# Current sync state of every global institution (user-owned institutions are never synced);
+# name and phone match records whose derived ID changed (UnmatchedRows)
+SYNC_STATE_QUERY = select(
+    ProviderInstitution.id,
+    ProviderInstitution.source_hash,
+    ProviderInstitution.deleted_at,
+    ProviderInstitution.name,
+    ProviderInstitution.phone,
+).where(ProviderInstitution.created_by_user_id.is_(None))
+
+
+def default_source_file() -> Path:
+    """
+    The bundled directory file.
+
+    Prefers mesfin_preprocessed.json when present so institutions keep the IDs
+    they were first imported with; otherwise IDs are derived from mesfin.json.
+    """
+    preprocessed = ASSETS_DIR / "mesfin_preprocessed.json"
+    return preprocessed if preprocessed.exists() else ASSETS_DIR / "mesfin.json"
+
+
+def open_records(source_file: Path) -> Optional[Iterator[dict]]:
+    """Stream records from the source file, or return None if it doesn't exist."""
+    if not source_file.exists():
+        logger.error(f"Source file not found: {source_file}")
+        return None
+
+    logger.info(f"Streaming records from {source_file}")
+    return iter_records(source_file)
+
+
+def validate_record(record: dict) -> uuid_lib.UUID:
+    """Check required fields and return the record's institution UUID."""
+    if "name" not in record:
+        raise ValueError(f"Missing name for record with ID: {record.get('id', 'Unknown')}")
+
+    return record_uuid(record)
+
+
+def log_summary(stats: Dict[str, int], total: int, elapsed: Optional[float] = None):
+    """Log the import summary."""
+    logger.info("\n" + "=" * 60)
+    logger.info("IMPORT COMPLETE")
+    logger.info("=" * 60)
+    logger.info(f"Created:  {stats['created']}")
+    logger.info(f"Skipped:  {stats['skipped']}")
+    logger.info(f"Errors:   {stats['errors']}")
+    logger.info(f"Total:    {total}")
+    if elapsed is not None:
+        logger.info(f"Elapsed:  {elapsed:.1f}s ({total / elapsed if elapsed else 0:,.0f} rows/s)")
+    logger.info("=" * 60)
+
+
+def institution_row(
+    record: dict, address_id: Optional[uuid_lib.UUID], institution_id: Optional[uuid_lib.UUID] = None
+) -> dict:
+    """Column values for a source record, including its content hash (institution_id defaults to record_uuid)."""
+    return {
+        "id": institution_id or record_uuid(record),
+        "name": record["name"],
+        "type": record.get("type"),
+        "phone": record.get("phone"),
+        "email": record.get("email"),
+        "website": record.get("website"),
+        "address_id": address_id,
+        "source_hash": record_hash(record),
+    }
+
+
+def start_batch_parse(
+    records: List[dict], address_cache: Dict[str, Dict[str, str]], workers: int, executor: Optional[Executor]
+) -> "asyncio.Task[Dict[str, Dict[str, str]]]":
+    """
+    Start parsing the addresses of a batch of records.
+
+    Addresses already in address_cache are taken from it now (it may be
+    trimmed before the task is awaited); the rest are parsed in the pool.
+    The task's result maps every address string of the records to its
+    parsed components, and the new ones are added to address_cache.
+    """
+    address_strs = [record["address"] for record in records if record.get("address")]
+    cached = {address_str: address_cache[address_str] for address_str in address_strs if address_str in address_cache}
+    missing = [address_str for address_str in address_strs if address_str not in cached]
+
+    async def parse() -> Dict[str, Dict[str, str]]:
+        parsed = await parse_addresses_in_background(missing, workers, executor)
+        address_cache.update(parsed)
+        return {**cached, **parsed}
+
+    return asyncio.ensure_future(parse())
+
 
+def trim_address_cache(address_cache: Dict[str, Dict[str, str]]):
+    """Evict the oldest parsed addresses once the cache is full."""
+    for address_str in list(address_cache)[: max(0, len(address_cache) - ADDRESS_CACHE_SIZE)]:
+        del address_cache[address_str]
 
-async def import_institutions():
-    """Import provider institutions from preprocessed JSON file."""
-    backend_dir = Path(__file__).parent.parent
-    json_file = backend_dir / "assets" / "mesfin_preprocessed.json"
 
-    # Check if file exists
-    if not json_file.exists():
-        logger.error(f"Preprocessed file not found: {json_file}")
-        logger.error("Please run preprocessing.py first to add UUIDs")
+async def upsert_addresses(session, addresses: Iterable[Dict[str, str]]) -> Dict[str, uuid_lib.UUID]:
+    """
+    Get or create address rows with multi-row upserts (one per statement's worth of bind parameters).
+
+    Addresses that normalize to an existing row reuse it instead of adding a
+    duplicate.
+
+    Args:
+        addresses: Parsed addresses (output of parse_addresses), possibly repeated
+
+    Returns:
+        Dictionary mapping normalized_hash to address ID
+    """
+    rows = {}
+    for address in addresses:
+        if address["normalized_hash"] not in rows:
+            rows[address["normalized_hash"]] = {"id": uuid_lib.uuid4(), **address}
+
+    if not rows:
+        return {}
+
+    address_ids = {}
+    for chunk in values_chunks(list(rows.values())):
+        result = await session.execute(address_upsert_statement(chunk))
+        address_ids.update(result.all())
+    return address_ids
+
+
+def record_address_id(
+    record: dict, parsed_addresses: Dict[str, Dict[str, str]], address_ids: Dict[str, uuid_lib.UUID]
+) -> Optional[uuid_lib.UUID]:
+    """Address ID for a record, from the output of upsert_addresses."""
+    if not record.get("address"):
+        return None
+    return address_ids[parsed_addresses[record["address"]]["normalized_hash"]]
+
+
+def record_addresses(records: List[dict], parsed_addresses: Dict[str, Dict[str, str]]) -> List[Dict[str, str]]:
+    """Parsed addresses of the records that have one."""
+    return [parsed_addresses[record["address"]] for record in records if record.get("address")]
+
+
+def build_rows(
+    records: List[dict], parsed_addresses: Dict[str, Dict[str, str]], address_ids: Dict[str, uuid_lib.UUID]
+) -> List[dict]:
+    """
+    Build institution insert rows for a batch of new records.
+
+    Args:
+        records: Source records
+        parsed_addresses: Output of parse_addresses for the records' address strings
+        address_ids: Output of upsert_addresses for those parsed addresses
+
+    Returns:
+        Institution rows
+    """
+    return [institution_row(record, record_address_id(record, parsed_addresses, address_ids)) for record in records]
+
+
+async def insert_rows(session, institution_rows: List[dict]) -> int:
+    """
+    Insert a batch of institutions with multi-row INSERTs, split to stay within the bind parameter limit.
+
+    Returns:
+        Number of institutions actually inserted (conflicting IDs are skipped)
+    """
+    if not institution_rows:
+        return 0
+
+    inserted = 0
+    for chunk in values_chunks(institution_rows):
+        result = await session.execute(
+            pg_insert(ProviderInstitution)
+            .values(chunk)
+            .on_conflict_do_nothing(index_elements=[ProviderInstitution.id])
+            .returning(ProviderInstitution.id)
+        )
+        inserted += len(result.all())
+    return inserted
+
+
+async def bulk_import_institutions(source_file: Path, batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1):
+    """
+    Import provider institutions with batched multi-row inserts.
+
+    Records are streamed from the source file in batches of batch_size, so
+    memory stays flat regardless of file size. For each batch, existing IDs are
+    fetched in one query, and the addresses of the new records are parsed
+    across `workers` processes (reusing recently parsed strings) while the
+    previous batch is inserted and committed in its own transaction with
+    INSERT ... ON CONFLICT DO NOTHING.
+    """
+    records = open_records(source_file)
+    if records is None:
         return
 
-    # Load JSON data
-    logger.info(f"Loading data from {json_file}")
-    with open(json_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    stats = {"created": 0, "skipped": 0, "errors": 0}
+    start = time.perf_counter()
+    parse_wait = 0.0
+    address_cache: Dict[str, Dict[str, str]] = {}
+    processed = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        async with AsyncSessionLocal() as session, deferred_directory_version(session):
+
+            async def write(batch: List[dict], new_records: List[dict], parsing: asyncio.Task):
+                nonlocal parse_wait, processed
+                wait_start = time.perf_counter()
+                parsed_addresses = await parsing
+                parse_wait += time.perf_counter() - wait_start
+
+                address_ids = await upsert_addresses(session, record_addresses(new_records, parsed_addresses))
+                inserted = await insert_rows(session, build_rows(new_records, parsed_addresses, address_ids))
+                await session.commit()
+
+                stats["created"] += inserted
+                stats["skipped"] += len(new_records) - inserted
+                processed += len(batch)
+                trim_address_cache(address_cache)
+
+                elapsed = time.perf_counter() - start
+                logger.info(f"Progress: {processed} rows ({processed / elapsed:,.0f} rows/s)")
+
+            pending = None
+            for batch in iter_batches(records, batch_size):
+                record_ids = [validate_record(record) for record in batch]
 
-    logger.info(f"Found {len(data)} entries to process")
+                result = await session.execute(EXISTING_IDS_QUERY, {"ids": record_ids})
+                existing_ids = set(result.scalars().all())
+
+                new_records = [record for record, record_id in zip(batch, record_ids) if record_id not in existing_ids]
+                stats["skipped"] += len(batch) - len(new_records)
+
+                # This batch parses in the pool while the previous one is written
+                parsing = start_batch_parse(new_records, address_cache, workers, executor)
+                if pending is not None:
+                    await write(*pending)
+                pending = (batch, new_records, parsing)
+
+            if pending is not None:
+                await write(*pending)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    logger.info(f"Waited {parse_wait:.1f}s for address parsing with {workers} worker(s)")
+    log_summary(stats, processed, time.perf_counter() - start)
+
+
+class UnmatchedRows:
+    """
+    Synced rows that no source record has the ID of.
+
+    A record without an "id" or NPI is keyed by name + address, so editing
+    either gives it a new ID. Instead of inserting it and soft-deleting its old
+    row, the sync lets it claim that row: the only unmatched row with the same
+    phone number, or else the only one with the same name. The row is updated
+    in place and keeps its ID, so network entries and referrals pointing at it
+    stay valid.
+    """
+
+    def __init__(self, rows):
+        self.by_phone = defaultdict(list)
+        self.by_name = defaultdict(list)
+        for row in rows:
+            if phone := normalized_phone(row.phone):
+                self.by_phone[phone].append(row)
+            self.by_name[row.name.strip().lower()].append(row)
+        self.claimed = set()
+
+    def claim(self, record: dict):
+        """The sync state of the row the record used to have, or None."""
+        for rows_by_key, key in (
+            (self.by_phone, normalized_phone(record.get("phone"))),
+            (self.by_name, record["name"].strip().lower()),
+        ):
+            candidates = [row for row in rows_by_key.get(key, ()) if row.id not in self.claimed]
+            if len(candidates) == 1:
+                self.claimed.add(candidates[0].id)
+                return candidates[0]
+        return None
+
+
+def log_diff(diff: Dict[str, list], unchanged: int, dry_run: bool):
+    """Log the sync diff summary."""
+    logger.info("\n" + "=" * 60)
+    logger.info("SYNC DRY RUN (no changes written)" if dry_run else "SYNC COMPLETE")
+    logger.info("=" * 60)
+    logger.info(f"Inserted:   {len(diff['inserted'])}")
+    logger.info(f"Updated:    {len(diff['updated'])}")
+    logger.info(f"Restored:   {len(diff['restored'])}")
+    logger.info(f"Deleted:    {len(diff['deleted'])}")
+    logger.info(f"Duplicates: {len(diff['duplicates'])}")
+    logger.info(f"Unchanged:  {unchanged}")
+    logger.info("=" * 60)
+
+
+async def sync_institutions(
+    source_file: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    workers: int = 1,
+    dry_run: bool = False,
+    summary_file: Optional[Path] = None,
+):
+    """
+    Bring global institutions in line with the source directory.
+
+    Each source record is hashed and compared with the source_hash stored on
+    its row: new records are inserted, records whose hash differs (or that were
+    soft-deleted and reappeared) are updated, and identical records are left
+    alone. Synced rows that are no longer in the source get deleted_at set.
+    Rows that never carried a hash (created in the admin UI) are not deleted.
+
+    A record whose derived ID changed (its name or address was edited and it
+    has no "id" or NPI) updates the row it used to have, see UnmatchedRows.
+    Records repeating an ID already seen in the file are counted as
+    duplicates and skipped.
+
+    Changed addresses are not edited in place (address rows are shared); the
+    institution is pointed at the matching row, created if needed.
+
+    Only the sync state (id, hash, deleted_at) of existing rows is held in
+    memory; source records are streamed in batches of batch_size, and each
+    batch is written in its own transaction while the next one's addresses
+    are parsed.
+    """
+    records = open_records(source_file)
+    if records is None:
+        return
+
+    # First pass: the IDs the source has, so rows still matched by ID are never claimed by another record
+    source_ids = {validate_record(record) for record in records}
+    records = open_records(source_file)
+
+    diff = {"inserted": [], "updated": [], "restored": [], "deleted": [], "duplicates": []}
+    unchanged = 0
+    start = time.perf_counter()
+    address_cache: Dict[str, Dict[str, str]] = {}
+    processed = 0
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        async with AsyncSessionLocal() as session, deferred_directory_version(session, bump=not dry_run):
+            result = await session.execute(SYNC_STATE_QUERY)
+            state_by_id = {row.id: row for row in result.all()}
+            logger.info(f"{len(state_by_id)} global institutions in the database")
+            unmatched = UnmatchedRows(
+                row for row in state_by_id.values() if row.source_hash is not None and row.id not in source_ids
+            )
+            seen_ids = set()
+
+            async def write(inserts: List[dict], updates: List[tuple], parsing: asyncio.Task):
+                parsed_addresses = await parsing
+                update_records = [record for _, record in updates]
+                address_ids = await upsert_addresses(
+                    session, record_addresses(inserts + update_records, parsed_addresses)
+                )
+                institution_updates = [
+                    {
+                        **institution_row(
+                            record, record_address_id(record, parsed_addresses, address_ids), institution_id
+                        ),
+                        "deleted_at": None,
+                    }
+                    for institution_id, record in updates
+                ]
+
+                await insert_rows(session, build_rows(inserts, parsed_addresses, address_ids))
+                if institution_updates:
+                    await session.execute(update(ProviderInstitution), institution_updates)
+                await session.commit()
+
+                trim_address_cache(address_cache)
+
+                elapsed = time.perf_counter() - start
+                logger.info(f"Progress: {processed} rows ({processed / elapsed:,.0f} rows/s)")
+
+            pending = None
+            for batch in iter_batches(records, batch_size):
+                inserts = []
+                updates = []
+                for record in batch:
+                    record_id = validate_record(record)
+                    if record_id in seen_ids:
+                        diff["duplicates"].append(str(record_id))
+                        continue
+                    seen_ids.add(record_id)
+
+                    state = state_by_id.pop(record_id, None)
+                    if state is None and (state := unmatched.claim(record)) is not None:
+                        del state_by_id[state.id]
+
+                    if state is None:
+                        inserts.append(record)
+                        diff["inserted"].append(str(record_id))
+                    elif state.source_hash != record_hash(record) or state.deleted_at is not None:
+                        updates.append((state.id, record))
+                        diff["restored" if state.deleted_at is not None else "updated"].append(str(state.id))
+                    else:
+                        unchanged += 1
+
+                processed += len(batch)
+                if dry_run:
+                    continue
+
+                # This batch parses in the pool while the previous one is written
+                parsing = start_batch_parse(
+                    inserts + [record for _, record in updates], address_cache, workers, executor
+                )
+                if pending is not None:
+                    await write(*pending)
+                pending = (inserts, updates, parsing)
+
+            if pending is not None:
+                await write(*pending)
+
+            # Whatever is left was synced before but is missing from the source now
+            stale_ids = [
+                row.id for row in state_by_id.values() if row.source_hash is not None and row.deleted_at is None
+            ]
+            diff["deleted"] = [str(stale_id) for stale_id in stale_ids]
+
+            if stale_ids and not dry_run:
+                for offset in range(0, len(stale_ids), batch_size):
+                    await session.execute(
+                        update(ProviderInstitution)
+                        .where(ProviderInstitution.id == any_(bindparam("ids", type_=ARRAY(UUID(as_uuid=True)))))
+                        .values(deleted_at=func.now()),
+                        {"ids": stale_ids[offset : offset + batch_size]},
+                    )
+                    await session.commit()
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    log_diff(diff, unchanged, dry_run)
+    logger.info(f"Processed {processed} source rows in {time.perf_counter() - start:.1f}s")
+
+    if summary_file is not None:
+        with open(summary_file, "w", encoding="utf-8") as f:
+            json.dump({"source": str(source_file), "dry_run": dry_run, "unchanged": unchanged, **diff}, f, indent=2)
+        logger.info(f"Diff summary written to {summary_file}")
+
+
+async def import_institutions(source_file: Path):
+    """Import provider institutions from a directory file, one row at a time."""
+    records = open_records(source_file)
+    if records is None:
+        return
 
     # Statistics
     stats = {"created": 0, "skipped": 0, "errors": 0}
 
     # Import data using async database session
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal() as session, deferred_directory_version(session):
         async with session.begin():
-            for record in data:
-                # Validate required fields
-                if "id" not in record:
-                    raise ValueError(f"Missing UUID for: {record.get('name', 'Unknown')}")
+            total = 0
+            for record in records:
+                total += 1
 
-                if "name" not in record:
-                    raise ValueError(f"Missing name for record with ID: {record['id']}")
-
-                institution_uuid = uuid_lib.UUID(record["id"])
+                # Validate required fields
+                institution_uuid = validate_record(record)
 
                 # Check if institution already exists
                 result = await session.execute(
@@ -149,11 +723,9 @@ async def import_institutions():
                 # Parse address
                 address_id = None
                 if record.get("address"):
-                    address_data = parse_address(record["address"])
-                    address = Address(**address_data)
-                    session.add(address)
-                    await session.flush()  # Get the address ID
-                    address_id = address.id
+                    address_data = parse_normalized_address(record["address"])
+                    address_ids = await upsert_addresses(session, [address_data])
+                    address_id = address_ids[address_data["normalized_hash"]]
 
                 # Create ProviderInstitution record
                 institution = ProviderInstitution(
@@ -164,6 +736,7 @@ async def import_institutions():
                     email=record.get("email"),
                     website=record.get("website"),
                     address_id=address_id,
+                    source_hash=record_hash(record),
                 )
                 session.add(institution)
                 stats["created"] += 1
@@ -173,15 +746,41 @@ async def import_institutions():
             logger.info("Committing transaction...")
 
     # Print summary
-    logger.info("\n" + "=" * 60)
-    logger.info("IMPORT COMPLETE")
-    logger.info("=" * 60)
-    logger.info(f"Created:  {stats['created']}")
-    logger.info(f"Skipped:  {stats['skipped']}")
-    logger.info(f"Errors:   {stats['errors']}")
-    logger.info(f"Total:    {len(data)}")
-    logger.info("=" * 60)
+    log_summary(stats, total)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Import provider institutions from a JSON or NDJSON directory file.")
+    parser.add_argument(
+        "--file",
+        type=Path,
+        default=default_source_file(),
+        help="JSON array or NDJSON (.ndjson/.jsonl) file to import",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--bulk", action="store_true", help="Use batched multi-row inserts instead of one row at a time")
+    mode.add_argument(
+        "--sync", action="store_true", help="Insert, update and soft-delete so the database matches the file"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT/transaction in bulk and sync mode"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used to parse addresses in bulk and sync mode",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Sync mode: compute the diff without writing")
+    parser.add_argument("--summary-file", type=Path, help="Sync mode: write the diff (row IDs per change) as JSON")
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    asyncio.run(import_institutions())
+    args = parse_args()
+    if args.sync:
+        asyncio.run(sync_institutions(args.file, args.batch_size, args.workers, args.dry_run, args.summary_file))
+    elif args.bulk:
+        asyncio.run(bulk_import_institutions(args.file, args.batch_size, args.workers))
+    else:
+        asyncio.run(import_institutions(args.file))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Load ZIP code centroids used for proximity search.
+
+Accepts either the Census ZCTA Gazetteer file (tab separated, with GEOID,
+INTPTLAT and INTPTLONG columns, e.g. 2023_Gaz_zcta_national.txt from
+https://www.census.gov/geographies/reference-files/time-series/geo/gazetteer-files.html,
+or the .zip it is published in) or a CSV with zip_code, latitude and longitude
+columns. Centroids are upserted, then existing addresses are backfilled; new and
+edited addresses get their coordinates from the addresses_set_coordinates trigger.
+
+With --download the 2023 Gazetteer zip is fetched from census.gov into assets/
+(once; delete it to fetch it again) and loaded from there.
+
+Usage:
+    python scripts/load_zip_centroids.py path/to/2023_Gaz_zcta_national.txt [--batch-size 5000]
+    python scripts/load_zip_centroids.py --download
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import logging
+import sys
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Iterator, TextIO
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from app.database import AsyncSessionLocal, values_chunks
+from app.models.directory_version import deferred_directory_version
+from app.models.zip_centroid import ZipCentroid
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+GAZETTEER_URL = "https://www2.census.gov/geo/docs/maps-data/data/gazetteer/2023_Gazetteer/2023_Gaz_zcta_national.zip"
+GAZETTEER_PATH = Path(__file__).parent.parent / "assets" / "2023_Gaz_zcta_national.zip"
+
+# Column names accepted for each field (Gazetteer first, then plain CSV)
+ZIP_COLUMNS = ("GEOID", "ZCTA5", "zip_code", "zip")
+LATITUDE_COLUMNS = ("INTPTLAT", "latitude", "lat")
+LONGITUDE_COLUMNS = ("INTPTLONG", "longitude", "lon", "lng")
+
+BACKFILL_SQL = text(
+    "UPDATE addresses a SET latitude = z.latitude, longitude = z.longitude "
+    "FROM zip_centroids z "
+    "WHERE z.zip_code = left(a.zip_code, 5) "
+    "AND (a.latitude IS DISTINCT FROM z.latitude OR a.longitude IS DISTINCT FROM z.longitude)"
+)
+
+
+def find_column(header: list, candidates: tuple) -> int:
+    for name in candidates:
+        if name in header:
+            return header.index(name)
+    raise ValueError(f"None of the columns {candidates} found in header {header}")
+
+
+def download_gazetteer(url: str = GAZETTEER_URL, path: Path = GAZETTEER_PATH) -> Path:
+    """Fetch the Gazetteer zip unless already present."""
+    if path.exists():
+        logger.info(f"Using {path} (delete it to download again)")
+    else:
+        logger.info(f"Downloading {url}")
+        partial_path = path.with_name(path.name + ".part")
+        with httpx.stream("GET", url, follow_redirects=True, timeout=60.0) as response:
+            response.raise_for_status()
+            with open(partial_path, "wb") as f:
+                for chunk in response.iter_bytes():
+                    f.write(chunk)
+        # Renamed once complete, so an interrupted download is not mistaken for the file
+        partial_path.rename(path)
+    return path
+
+
+def open_source(path: Path) -> TextIO:
+    """Open a centroid file, or the single .txt/.csv file in a .zip (as the Gazetteer is published)."""
+    if path.suffix != ".zip":
+        return open(path, newline="", encoding="utf-8")
+    archive = zipfile.ZipFile(path)
+    members = [name for name in archive.namelist() if name.endswith((".txt", ".csv"))]
+    if len(members) != 1:
+        raise ValueError(f"Expected one .txt or .csv file in {path}, found {members}")
+    return io.TextIOWrapper(archive.open(members[0]), newline="", encoding="utf-8")
+
+
+def iter_centroids(path: Path) -> Iterator[dict]:
+    """Yield zip_centroids rows from a Gazetteer (tab separated) or CSV file, or a zip of one."""
+    with open_source(path) as f:
+        # Read the header line directly: members of a zip cannot seek back
+        first_line = f.readline()
+        delimiter = "\t" if "\t" in first_line else ","
+        reader = csv.reader(f, delimiter=delimiter)
+        # Gazetteer headers carry trailing whitespace on the last column
+        header = [column.strip() for column in next(csv.reader([first_line], delimiter=delimiter))]
+        zip_index = find_column(header, ZIP_COLUMNS)
+        latitude_index = find_column(header, LATITUDE_COLUMNS)
+        longitude_index = find_column(header, LONGITUDE_COLUMNS)
+
+        for row in reader:
+            try:
+                zip_code = row[zip_index].strip().zfill(5)
+                latitude = float(row[latitude_index])
+                longitude = float(row[longitude_index])
+            except (IndexError, ValueError):
+                logger.warning(f"Skipping malformed row: {row}")
+                continue
+            yield {"id": uuid.uuid4(), "zip_code": zip_code, "latitude": latitude, "longitude": longitude}
+
+
+def upsert_statement(rows: list):
+    statement = pg_insert(ZipCentroid).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=[ZipCentroid.zip_code],
+        set_={"latitude": statement.excluded.latitude, "longitude": statement.excluded.longitude},
+    )
+
+
+async def upsert_centroids(session, rows: list) -> int:
+    for chunk in values_chunks(rows):
+        await session.execute(upsert_statement(chunk))
+    return len(rows)
+
+
+async def load_zip_centroids(path: Path, batch_size: int = DEFAULT_BATCH_SIZE):
+    start = time.perf_counter()
+    loaded = 0
+
+    async with AsyncSessionLocal() as session, deferred_directory_version(session):
+        batch = []
+        for row in iter_centroids(path):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                loaded += await upsert_centroids(session, batch)
+                batch = []
+        loaded += await upsert_centroids(session, batch)
+        await session.commit()
+        logger.info(f"Loaded {loaded} ZIP centroids in {time.perf_counter() - start:.1f}s")
+
+        result = await session.execute(BACKFILL_SQL)
+        await session.commit()
+        logger.info(f"Set coordinates on {result.rowcount} addresses")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load ZIP code centroids and backfill address coordinates.")
+    parser.add_argument(
+        "path", type=Path, nargs="?", help="Census ZCTA Gazetteer file (or its .zip) or zip_code,latitude,longitude CSV"
+    )
+    parser.add_argument(
+        "--download", action="store_true", help=f"Download the 2023 Gazetteer into {GAZETTEER_PATH.parent}"
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT statement")
+    args = parser.parse_args()
+    if (args.path is None) != args.download:
+        parser.error("pass either a path or --download")
+    return args
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    path = download_gazetteer() if args.download else args.path
+    asyncio.run(load_zip_centroids(path, args.batch_size))
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure referrals table size and scan time.
+
+Run before and after applying a storage migration to compare the heap/TOAST
+footprint of the referrals table and the time taken by a typical listing scan
+(which never needs the OCR text) and by a full-row scan.
+
+Usage: python scripts/measure_referral_storage.py [repeats]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from sqlalchemy import text
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+SIZE_QUERY = text(
+    """
+    SELECT
+        c.relname,
+        pg_relation_size(c.oid) AS heap_bytes,
+        COALESCE(pg_total_relation_size(c.reltoastrelid), 0) AS toast_bytes,
+        pg_indexes_size(c.oid) AS index_bytes,
+        pg_total_relation_size(c.oid) AS total_bytes
+    FROM pg_class c
+    WHERE c.relname = ANY(:tables) AND c.relkind = 'r'
+    ORDER BY c.relname
+    """
+)
+
+SCANS = {
+    "listing scan": "SELECT id, user_id, status, referral_date FROM referrals",
+    "full row scan": "SELECT * FROM referrals",
+}
+
+
+def format_bytes(value: int) -> str:
+    for unit in ["B", "KB", "MB", "GB"]:
+        if value < 1024:
+            return f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} TB"
+
+
+async def measure(repeats: int):
+    """Log table sizes and median scan times."""
+    async with AsyncSessionLocal() as session:
+        row_count = (await session.execute(text("SELECT count(*) FROM referrals"))).scalar_one()
+        logger.info(f"Referrals: {row_count} rows")
+
+        sizes = await session.execute(SIZE_QUERY, {"tables": ["referrals", "referral_documents"]})
+        for relname, heap_bytes, toast_bytes, index_bytes, total_bytes in sizes.all():
+            logger.info(
+                f"{relname:<20} heap={format_bytes(heap_bytes)} toast={format_bytes(toast_bytes)} "
+                f"indexes={format_bytes(index_bytes)} total={format_bytes(total_bytes)}"
+            )
+
+        for label, sql in SCANS.items():
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                await session.execute(text(sql))
+                timings.append(time.perf_counter() - start)
+            timings.sort()
+            logger.info(f"{label:<20} median={timings[len(timings) // 2] * 1000:.1f} ms over {repeats} runs")
+
+
+if __name__ == "__main__":
+    asyncio.run(measure(int(sys.argv[1]) if len(sys.argv) > 1 else 5))
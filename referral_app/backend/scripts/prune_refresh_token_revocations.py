@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Delete refresh token revocations whose tokens have expired.
+
+An expired refresh token is rejected by its signature check alone, so its
+revocation row (app/refresh_tokens.py) is no longer needed. Run periodically,
+e.g. daily from a scheduler.
+
+Usage: python scripts/prune_refresh_token_revocations.py [--dry-run]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add the app directory to the path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.models.refresh_token_revocation import RefreshTokenRevocation
+from sqlalchemy import delete, func, select
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+
+async def prune(dry_run: bool):
+    now = datetime.now(timezone.utc)
+    async with AsyncSessionLocal() as session:
+        if dry_run:
+            count = (
+                await session.execute(
+                    select(func.count())
+                    .select_from(RefreshTokenRevocation)
+                    .filter(RefreshTokenRevocation.expires_at < now)
+                )
+            ).scalar_one()
+            logger.info(f"Would delete {count} expired refresh token revocations")
+            return
+
+        result = await session.execute(delete(RefreshTokenRevocation).where(RefreshTokenRevocation.expires_at < now))
+        await session.commit()
+        logger.info(f"Deleted {result.rowcount} expired refresh token revocations")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Delete expired refresh token revocations.")
+    parser.add_argument("--dry-run", action="store_true", help="Only count the rows that would be deleted")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(prune(parse_args().dry_run))